@@ -1,15 +1,268 @@
 from django.contrib import admin
-from .models import CustomUser, Resume, Experience, Certification, Education, TechSkill, SoftSkill, Hobby, SliderGallery, Blog, BlogBlock
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .models import CustomUser, Resume, Experience, Certification, Project, Education, TechSkill, SoftSkill, Hobby, SliderGallery, Blog, BlogBlock, PageViewDaily, RelatedPost, BlogArchiveCount
+from .changes import BLOG, mark_changed
+from .related import blogs_listing, refresh_related, schedule, update_related
 # Register your models here.
 
-admin.site.register(CustomUser)
-admin.site.register(Resume)
-admin.site.register(Experience)
-admin.site.register(Certification)
-admin.site.register(Education)
-admin.site.register(TechSkill)
-admin.site.register(SoftSkill)
-admin.site.register(Hobby)
-admin.site.register(SliderGallery)
-admin.site.register(Blog)
-admin.site.register(BlogBlock)
\ No newline at end of file
+
+def estimated_rows(model, using):
+    """The database's own row estimate for ``model``'s table (no scan), or None."""
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Planner statistics; -1 until the table was first analyzed
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+        elif connection.vendor == "sqlite":
+            # Highest rowid: the row count unless rows were deleted
+            cursor.execute(f"SELECT MAX(_rowid_) FROM {table}")
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row and row[0] is not None and row[0] >= 0 else None
+
+
+def refresh_block_summaries(blog_ids):
+    """Recompute the block summary of ``blog_ids`` after their blocks were edited here."""
+    for blog in Blog.objects.filter(pk__in=blog_ids).prefetch_related("blocks"):
+        Blog.objects.filter(pk=blog.pk).update(**blog.apply_block_summary(blog.blocks.all()))
+        # Block deletes send no signal (see api/signals.py)
+        mark_changed(BLOG, blog.pk, child=True)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Unfiltered changelists of big tables show an estimated total instead of running COUNT(*)."""
+    EXACT_BELOW = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate >= self.EXACT_BELOW:
+                return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelists in constant queries: foreign keys shown in a row are joined
+    (``list_select_related``), no second COUNT for the "of N" total, an
+    estimated count when unfiltered. Searches are exact or prefix matches
+    (``startswith``) on columns with a pattern_ops index (PostgreSQL), and
+    foreign keys are edited by id instead of a dropdown of every row.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class CategoryFilter(admin.SimpleListFilter):
+    """Blog categories from the archive counts, not a ``SELECT DISTINCT`` over every blog."""
+    title = "category"
+    parameter_name = "category"
+
+    def lookups(self, request, model_admin):
+        values = (
+            BlogArchiveCount.objects.filter(dimension=BlogArchiveCount.CATEGORY)
+            .order_by("value").values_list("value", flat=True)
+        )
+        return [(value, value) for value in values]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.in_category(self.value())
+        return queryset
+
+
+class ResumeChildInline(admin.TabularInline):
+    extra = 0
+    show_change_link = True
+
+
+class ExperienceInline(ResumeChildInline):
+    model = Experience
+
+
+class CertificationInline(ResumeChildInline):
+    model = Certification
+
+
+class ProjectInline(ResumeChildInline):
+    model = Project
+
+
+class EducationInline(ResumeChildInline):
+    model = Education
+
+
+class TechSkillInline(ResumeChildInline):
+    model = TechSkill
+
+
+class SoftSkillInline(ResumeChildInline):
+    model = SoftSkill
+
+
+class HobbyInline(ResumeChildInline):
+    model = Hobby
+
+
+class SliderGalleryInline(ResumeChildInline):
+    model = SliderGallery
+    readonly_fields = ("image_width", "image_height")
+    exclude = ("image_placeholder",)
+
+    def get_queryset(self, request):
+        # __str__ (shown above each row) reads resume.name
+        return super().get_queryset(request).select_related("resume")
+
+
+@admin.register(CustomUser)
+class CustomUserAdmin(LargeTableAdmin):
+    list_display = ("email", "is_staff", "is_superuser", "is_active")
+    list_filter = ("is_staff", "is_active")
+    search_fields = ("email__startswith",)
+
+
+@admin.register(Resume)
+class ResumeAdmin(LargeTableAdmin):
+    list_display = ("name", "title", "user", "email", "updated_at")
+    list_select_related = ("user",)
+    search_fields = ("name__startswith", "user__email__startswith")
+    raw_id_fields = ("user",)
+    readonly_fields = ("profile_image_width", "profile_image_height", "updated_at")
+    exclude = ("profile_image_placeholder",)
+    inlines = [
+        ExperienceInline, CertificationInline, ProjectInline, EducationInline,
+        TechSkillInline, SoftSkillInline, HobbyInline, SliderGalleryInline,
+    ]
+
+
+class ResumeChildAdmin(LargeTableAdmin):
+    list_display = ("__str__", "resume")
+    list_select_related = ("resume",)
+    raw_id_fields = ("resume",)
+    search_fields = ("resume__name__startswith",)
+
+
+for child in (Experience, Certification, Project, Education, TechSkill, SoftSkill, Hobby, SliderGallery):
+    admin.site.register(child, ResumeChildAdmin)
+
+
+class BlogBlockInline(admin.StackedInline):
+    model = BlogBlock
+    extra = 0
+    fields = ("order", "type", "content", "media_file", "media_width", "media_height")
+    readonly_fields = ("media_width", "media_height")
+
+    def get_queryset(self, request):
+        # __str__ (shown above each block) reads blog.title
+        return super().get_queryset(request).select_related("blog")
+
+
+class RelatedPostInline(admin.TabularInline):
+    model = RelatedPost
+    fk_name = "blog"
+    extra = 0
+    max_num = 0
+    can_delete = False
+    # Recomputed from tags/category (api/related.py), never edited by hand
+    fields = readonly_fields = ("rank", "related", "score")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("related__user")
+
+
+@admin.register(Blog)
+class BlogAdmin(LargeTableAdmin):
+    list_display = ("title", "user", "category", "likes_count", "word_count", "created_at")
+    list_select_related = ("user",)
+    list_filter = (CategoryFilter,)
+    search_fields = ("title__startswith", "user__email__startswith")
+    raw_id_fields = ("user",)
+    readonly_fields = (
+        "cover_image_width", "cover_image_height", "word_count", "reading_time", "image_count", "video_count",
+        "created_at", "updated_at",
+    )
+    exclude = ("cover_image_placeholder",)
+    inlines = [BlogBlockInline, RelatedPostInline]
+
+    # What BlogSerializer does for API writes: the block summary and the
+    # related posts are derived data that no signal keeps up to date
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        blog = form.instance
+        refresh_block_summaries([blog.pk])
+        if not change or {"tags", "category"} & set(form.changed_data):
+            schedule(update_related, blog.pk)
+
+    def delete_model(self, request, obj):
+        # Lists that had this blog lose a slot to the cascade: refill them
+        listing = blogs_listing(obj.pk)
+        super().delete_model(request, obj)
+        schedule(refresh_related, listing)
+
+    def delete_queryset(self, request, queryset):
+        listing = list(
+            RelatedPost.objects.filter(related__in=queryset).exclude(blog__in=queryset)
+            .order_by().values_list("blog_id", flat=True).distinct()
+        )
+        super().delete_queryset(request, queryset)
+        schedule(refresh_related, listing)
+
+
+@admin.register(BlogBlock)
+class BlogBlockAdmin(LargeTableAdmin):
+    list_display = ("__str__", "blog", "type", "order")
+    list_select_related = ("blog__user",)
+    ordering = ("blog_id", "order")
+    list_filter = ("type",)
+    search_fields = ("blog__title__startswith",)
+    raw_id_fields = ("blog",)
+    readonly_fields = ("media_width", "media_height")
+    exclude = ("media_placeholder",)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        blog_ids = {obj.blog_id}
+        if change and "blog" in form.changed_data:
+            blog_ids.add(form.initial["blog"])
+        refresh_block_summaries(blog_ids)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        refresh_block_summaries([obj.blog_id])
+
+    def delete_queryset(self, request, queryset):
+        blog_ids = set(queryset.values_list("blog_id", flat=True))
+        super().delete_queryset(request, queryset)
+        refresh_block_summaries(blog_ids)
+
+
+@admin.register(PageViewDaily)
+class PageViewDailyAdmin(LargeTableAdmin):
+    list_display = ("kind", "object_id", "day", "views")
+    list_filter = ("kind",)
+    search_fields = ("=object_id",)
+    ordering = ("-day",)
+
+
+@admin.register(RelatedPost)
+class RelatedPostAdmin(LargeTableAdmin):
+    list_display = ("blog", "rank", "related", "score")
+    list_select_related = ("blog__user", "related__user")
+    raw_id_fields = ("blog", "related")
+    # The unique (blog, rank) index: no sort of the whole table
+    ordering = ("blog_id", "rank")
+
+
+@admin.register(BlogArchiveCount)
+class BlogArchiveCountAdmin(LargeTableAdmin):
+    list_display = ("dimension", "value", "count")
+    list_filter = ("dimension",)
+    search_fields = ("value__startswith",)
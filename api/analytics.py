@@ -0,0 +1,231 @@
+"""
+Page-view counters without a database write per request.
+
+Detail views call ``record_view(kind, object_id)``: one append of a tuple to
+an in-process ring buffer (``deque.append`` is thread-safe, no lock). A
+daemon thread per process drains the buffer every ``FLUSH_INTERVAL``
+seconds, sums the hits per (kind, object, UTC day) and adds them to
+PageViewDaily with one upsert per batch::
+
+    INSERT ... ON CONFLICT (kind, object_id, day) DO UPDATE SET views = views + excluded.views
+
+Counts that fail to flush are kept and retried. The buffer is flushed once
+more at interpreter exit, so a graceful worker shutdown loses no hits; only
+a buffer overflow (``MAX_BUFFER``, i.e. the database unreachable for a long
+time) drops the oldest ones. Counts show up at most one interval late.
+
+With ``BACKGROUND`` off (serverless: the process is frozen between requests,
+so a thread would not run) every view is flushed before the response.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, timedelta
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections, connections, router, transaction
+from django.db.models import Sum
+from django.dispatch import receiver
+
+from .models import PageViewDaily
+
+logger = logging.getLogger(__name__)
+
+PAGE_VIEW_DEFAULTS = {
+    "ENABLED": True,
+    "FLUSH_INTERVAL": 10.0,
+    # Wake the flusher early once this many hits are waiting
+    "FLUSH_AT": 10_000,
+    # Ring buffer size: beyond it the oldest unflushed hits are dropped
+    "MAX_BUFFER": 1_000_000,
+    "BATCH_SIZE": 500,
+    # Off: flush inline in the request instead of on a daemon thread
+    "BACKGROUND": True,
+}
+
+EPOCH = date(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+
+_paused = ContextVar("page_views_paused", default=False)
+
+
+@lru_cache(maxsize=None)
+def page_view_settings():
+    # Cached: record_view() reads it on every request
+    return {**PAGE_VIEW_DEFAULTS, **getattr(settings, "PAGE_VIEWS", {})}
+
+
+@receiver(setting_changed)
+def reset_page_view_settings(setting, **kwargs):
+    if setting == "PAGE_VIEWS":
+        page_view_settings.cache_clear()
+
+
+def increment_sql(connection, model, key_fields, count_field, row_count):
+    """
+    Upsert of ``row_count`` ``(*keys, amount)`` rows that adds each amount to
+    the row's counter (PostgreSQL, SQLite); ``key_fields`` need a unique constraint.
+    """
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    keys = ", ".join(quote(model._meta.get_field(name).column) for name in key_fields)
+    count = quote(model._meta.get_field(count_field).column)
+    placeholders = "(" + ", ".join(["%s"] * (len(key_fields) + 1)) + ")"
+    values = ", ".join([placeholders] * row_count)
+    return (
+        f"INSERT INTO {table} ({keys}, {count}) VALUES {values} "
+        f"ON CONFLICT ({keys}) DO UPDATE SET {count} = {table}.{count} + excluded.{count}"
+    )
+
+
+def add_counts(counts, batch_size=500):
+    """Add ``{(kind, object_id, day_number): views}`` to PageViewDaily (PostgreSQL, SQLite)."""
+    alias = router.db_for_write(PageViewDaily)
+    connection = connections[alias]
+    object_id_field = PageViewDaily._meta.get_field("object_id")
+    day_field = PageViewDaily._meta.get_field("day")
+    rows = [
+        (
+            kind,
+            object_id_field.get_db_prep_value(object_id_field.to_python(object_id), connection),
+            day_field.get_db_prep_value(EPOCH + timedelta(days=day), connection),
+            views,
+        )
+        for (kind, object_id, day), views in counts.items()
+    ]
+    with transaction.atomic(using=alias), connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            sql = increment_sql(connection, PageViewDaily, ("kind", "object_id", "day"), "views", len(batch))
+            cursor.execute(sql, [value for row in batch for value in row])
+
+
+class PageViewBuffer:
+    """The per-process ring buffer and its flusher thread."""
+
+    def __init__(self):
+        self.hits = deque(maxlen=PAGE_VIEW_DEFAULTS["MAX_BUFFER"])
+        self.pending = Counter()  # drained but not yet written
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopping = False
+        self.thread = None
+        self.pid = None
+
+    def record(self, kind, object_id, background=True):
+        hits = self.hits
+        hits.append((kind, object_id, int(time.time() // SECONDS_PER_DAY)))
+        if not background:
+            self.flush()
+        elif self.pid != os.getpid():
+            # First hit in this (possibly forked) process
+            self.start()
+        elif len(hits) >= self.flush_at:
+            self.wakeup.set()
+
+    def start(self):
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            options = page_view_settings()
+            self.interval = options["FLUSH_INTERVAL"]
+            self.flush_at = options["FLUSH_AT"]
+            self.batch_size = options["BATCH_SIZE"]
+            if self.hits.maxlen != options["MAX_BUFFER"]:
+                self.hits = deque(self.hits, maxlen=options["MAX_BUFFER"])
+            self.wakeup = threading.Event()
+            self.stopping = False
+            self.thread = threading.Thread(target=self.run, name="page-view-flusher", daemon=True)
+            self.thread.start()
+            self.pid = os.getpid()
+
+    def run(self):
+        while not self.stopping:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            self.flush()
+            # This thread's connection follows CONN_MAX_AGE like a request's
+            close_old_connections()
+
+    def drain(self):
+        counts = self.pending
+        self.pending = Counter()
+        hits = self.hits
+        # Bounded: hits appended meanwhile wait for the next flush
+        for _ in range(len(hits)):
+            kind, object_id, day = hits.popleft()
+            # UUID and str ids of one object must share a row: an upsert cannot touch a row twice
+            counts[(kind, str(object_id), day)] += 1
+        return counts
+
+    def flush(self):
+        """Write everything buffered so far; returns the number of hits written."""
+        with self.lock:
+            counts = self.drain()
+            if not counts:
+                return 0
+            try:
+                add_counts(counts, getattr(self, "batch_size", PAGE_VIEW_DEFAULTS["BATCH_SIZE"]))
+            except Exception:
+                logger.exception("Flushing %d page-view counters failed; keeping them for the next flush", len(counts))
+                self.pending.update(counts)
+                return 0
+            return sum(counts.values())
+
+    def stop(self, timeout=5.0):
+        """Stop the flusher and write what is left (atexit)."""
+        self.stopping = True
+        thread = self.thread
+        if thread is not None and thread.is_alive() and self.pid == os.getpid():
+            self.wakeup.set()
+            thread.join(timeout)
+        self.flush()
+
+
+page_views = PageViewBuffer()
+atexit.register(page_views.stop)
+
+
+def record_view(kind, object_id):
+    """Count one view of a resume or blog (cheap enough for every GET)."""
+    options = page_view_settings()
+    if options["ENABLED"] and not _paused.get():
+        page_views.record(kind, object_id, options["BACKGROUND"])
+
+
+async def arecord_view(kind, object_id):
+    """``record_view()`` for async views: an inline flush runs in a thread."""
+    if page_view_settings()["BACKGROUND"]:
+        record_view(kind, object_id)
+    else:
+        await sync_to_async(record_view)(kind, object_id)
+
+
+@contextmanager
+def not_counted():
+    """Renders that are not visits (publish_static) leave the counters alone."""
+    token = _paused.set(True)
+    try:
+        yield
+    finally:
+        _paused.reset(token)
+
+
+def top_objects(kind, days, limit):
+    """``[(object_id, views), ...]`` for the ``days`` most recent UTC days, most viewed first."""
+    since = EPOCH + timedelta(days=int(time.time() // SECONDS_PER_DAY) - days + 1)
+    return list(
+        PageViewDaily.objects.filter(kind=kind, day__gte=since)
+        .values("object_id")
+        .annotate(total=Sum("views"))
+        .order_by("-total", "object_id")
+        .values_list("object_id", "total")[:limit]
+    )
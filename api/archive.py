@@ -0,0 +1,129 @@
+"""
+Archive navigation: how many posts per month, per category and per tag.
+
+The counts live in BlogArchiveCount, one row per (dimension, value), and are
+maintained incrementally: saving, deleting or importing a blog adds/removes
+its own keys (``YYYY-MM`` of ``created_at``, category, each tag) with one
+upsert, the blog table is never aggregated again. ``get_archive()`` reads the
+small summary table in one query and caches the payload under the blog
+content version (api/cache.py).
+"""
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .analytics import increment_sql
+from .cache import content_versions
+from .changes import BLOG
+from .models import Blog, BlogArchiveCount
+
+ARCHIVE_FIELDS = ("created_at", "category", "tags")
+ARCHIVE_TTL = 3600
+VALUE_LENGTH = BlogArchiveCount._meta.get_field("value").max_length
+
+
+def month_of(created_at):
+    return timezone.localtime(created_at).strftime("%Y-%m")
+
+
+def archive_keys(created_at, category, tags):
+    """The (dimension, value) rows one blog counts towards."""
+    keys = set()
+    if created_at:
+        keys.add((BlogArchiveCount.MONTH, month_of(created_at)))
+    if category:
+        keys.add((BlogArchiveCount.CATEGORY, category[:VALUE_LENGTH]))
+    if isinstance(tags, list):
+        keys.update((BlogArchiveCount.TAG, str(tag)[:VALUE_LENGTH]) for tag in tags if str(tag).strip())
+    return keys
+
+
+def blog_keys(blog):
+    return archive_keys(blog.created_at, blog.category, blog.tags)
+
+
+def apply_counts(deltas, batch_size=500):
+    """Add ``{(dimension, value): delta}`` to the summary rows; rows that reach 0 are removed."""
+    rows = [(dimension, value, delta) for (dimension, value), delta in deltas.items() if delta]
+    if not rows:
+        return
+    alias = router.db_for_write(BlogArchiveCount)
+    connection = connections[alias]
+    with transaction.atomic(using=alias), connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            sql = increment_sql(connection, BlogArchiveCount, ("dimension", "value"), "count", len(batch))
+            cursor.execute(sql, [value for row in batch for value in row])
+        if any(delta < 0 for _, _, delta in rows):
+            BlogArchiveCount.objects.using(alias).filter(count__lte=0).delete()
+
+
+def remember_keys(blog, update_fields=None):
+    """pre_save: the keys the stored row counts towards (one query, only when they can change)."""
+    if blog._state.adding:
+        blog._archive_keys = set()
+    elif update_fields is None or set(update_fields) & set(ARCHIVE_FIELDS):
+        stored = Blog.objects.filter(pk=blog.pk).values_list(*ARCHIVE_FIELDS).first()
+        blog._archive_keys = archive_keys(*stored) if stored else set()
+
+
+def blog_saved(blog):
+    if not hasattr(blog, "_archive_keys"):
+        return
+    before, after = blog._archive_keys, blog_keys(blog)
+    del blog._archive_keys
+    apply_counts({**{key: 1 for key in after - before}, **{key: -1 for key in before - after}})
+
+
+def blog_deleted(blog):
+    apply_counts({key: -1 for key in blog_keys(blog)})
+
+
+def blogs_added(blogs):
+    """For inserts that send no post_save (``bulk_create``)."""
+    apply_counts(Counter(key for blog in blogs for key in blog_keys(blog)))
+
+
+def rebuild_archive():
+    """Recount everything from the blog table; returns the number of summary rows."""
+    counts = Counter(
+        key for row in Blog.objects.values_list(*ARCHIVE_FIELDS).iterator(chunk_size=2000) for key in archive_keys(*row)
+    )
+    with transaction.atomic():
+        BlogArchiveCount.objects.all().delete()
+        BlogArchiveCount.objects.bulk_create(
+            BlogArchiveCount(dimension=dimension, value=value, count=count) for (dimension, value), count in counts.items()
+        )
+    return len(counts)
+
+
+def build_archive():
+    months, categories, tags = [], [], []
+    for dimension, value, count in BlogArchiveCount.objects.values_list("dimension", "value", "count"):
+        if dimension == BlogArchiveCount.MONTH:
+            year, month = value.split("-")
+            months.append({"year": int(year), "month": int(month), "count": count})
+        elif dimension == BlogArchiveCount.CATEGORY:
+            categories.append({"category": value, "count": count})
+        else:
+            tags.append({"tag": value, "count": count})
+    months.sort(key=lambda item: (item["year"], item["month"]), reverse=True)
+    categories.sort(key=lambda item: (-item["count"], item["category"]))
+    tags.sort(key=lambda item: (-item["count"], item["tag"]))
+    return {
+        "total": sum(item["count"] for item in months),
+        "months": months,
+        "categories": categories,
+        "tags": tags,
+    }
+
+
+def get_archive():
+    key = f"blog-archive:{content_versions((BLOG, '*'))[0]}"
+    archive = cache.get(key)
+    if archive is None:
+        archive = build_archive()
+        cache.set(key, archive, ARCHIVE_TTL)
+    return archive
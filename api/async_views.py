@@ -0,0 +1,202 @@
+"""
+Async versions of the public read endpoints, for the ASGI deployment.
+
+With ``ASYNC_READS["ENABLED"]`` (gunicorn.conf.py then runs uvicorn workers)
+api/urls.py sends GET/HEAD of the resume detail, blog list/detail, blog posts
+and blogs-by-category URLs here; every other method still goes to the DRF
+views in api/views.py. Responses are byte-for-byte what the DRF views return.
+
+A request waiting on the database or on a slow client no longer holds a
+worker thread. A resume's child collections are independent, so with a
+connection pool (DB_POOL_MODE=pool) they are loaded in parallel, each on its
+own thread and pooled connection.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models import prefetch_related_objects
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+
+from . import mirror
+from .analytics import arecord_view
+from .changes import BLOG, RESUME
+from .fieldsets import select_fields
+from .models import Blog, Resume
+from .serializers import BlogPostSerializer, BlogSerializer, ResumeSerializer
+
+ASYNC_READ_DEFAULTS = {
+    "ENABLED": False,
+    "PARALLEL_QUERIES": 4,
+}
+
+
+def async_read_settings():
+    return {**ASYNC_READ_DEFAULTS, **getattr(settings, "ASYNC_READS", {})}
+
+
+def json_response(payload, status_code=status.HTTP_200_OK):
+    # Same renderer as the DRF views, so both paths produce identical bodies
+    return HttpResponse(JSONRenderer().render(payload), status=status_code, content_type="application/json")
+
+
+def api_response(data, status_code=status.HTTP_200_OK):
+    return json_response({"status": status_code, "data": data}, status_code)
+
+
+def not_found(model):
+    # What DRF renders for get_object_or_404()
+    return json_response(
+        {"detail": f"No {model._meta.object_name} matches the given query."}, status.HTTP_404_NOT_FOUND
+    )
+
+
+def has_pool(alias):
+    return bool(connections[alias].settings_dict.get("OPTIONS", {}).get("pool"))
+
+
+async def prefetch_parallel(instance, relations):
+    """
+    ``prefetch_related(*relations)`` for one instance, with the queries in parallel.
+
+    The async ORM runs every query on the request's single thread, so awaiting
+    them together would still run them one after another. Each parallel
+    query needs a connection of its own: without a pool that is a new
+    connection (TCP, TLS, auth) per relation, which costs more than it saves,
+    so the relations are then loaded one after another on the request's thread.
+    """
+    if not relations:
+        return
+    if not has_pool(instance._state.db):
+        await sync_to_async(prefetch_related_objects)([instance], *relations)
+        return
+
+    limit = asyncio.Semaphore(max(async_read_settings()["PARALLEL_QUERIES"], 1))
+    # Created up front: each prefetch would otherwise create it and the last one would win
+    instance._prefetched_objects_cache = {}
+
+    def load(relation):
+        try:
+            prefetch_related_objects([instance], relation)
+        finally:
+            # request_finished only cleans up the request's own thread; with
+            # a pool this returns the connection to it
+            close_old_connections()
+
+    async def run(relation):
+        async with limit:
+            await sync_to_async(load, thread_sensitive=False)(relation)
+
+    await asyncio.gather(*(run(relation) for relation in relations))
+
+
+class AsyncReadView(View):
+    """GET-only async view; subclasses implement ``read()``."""
+
+    http_method_names = ["get", "head", "options"]
+    serializer_class = None
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            selection = select_fields(self.serializer_class, request.GET)
+        except ValidationError as e:
+            return json_response(e.detail, status.HTTP_400_BAD_REQUEST)
+        return await self.read(request, selection, *args, **kwargs)
+
+    def serialize(self, request, instance, selection, many=False):
+        return self.serializer_class(
+            instance, many=many, context={"request": request}, fields=selection.fields
+        ).data
+
+    async def read(self, request, selection, *args, **kwargs):
+        raise NotImplementedError
+
+
+class AsyncResumeDetailView(AsyncReadView):
+    serializer_class = ResumeSerializer
+
+    async def read(self, request, selection, pk):
+        if mirror.read_from_mongo():
+            data = await sync_to_async(mirror.get_resume)(pk, request)
+            if data is not None:
+                await arecord_view(RESUME, pk)
+                return api_response(selection.prune(data))
+        resume = await Resume.objects.filter(user_id=pk).afirst()
+        if resume is None:
+            return not_found(Resume)
+        await prefetch_parallel(resume, selection.prefetch)
+        await arecord_view(RESUME, pk)
+        return api_response(self.serialize(request, resume, selection))
+
+
+class AsyncBlogDetailView(AsyncReadView):
+    serializer_class = BlogSerializer
+
+    async def read(self, request, selection, pk):
+        # The read model has no related posts
+        if mirror.read_from_mongo() and not selection.selects("related"):
+            data = await sync_to_async(mirror.get_blog)(pk, request)
+            if data is not None:
+                await arecord_view(BLOG, pk)
+                return api_response(selection.prune(data))
+        blog = await Blog.objects.filter(pk=pk).afirst()
+        if blog is None:
+            return not_found(Blog)
+        await prefetch_parallel(blog, selection.prefetch)
+        await arecord_view(BLOG, pk)
+        return api_response(self.serialize(request, blog, selection))
+
+
+class AsyncBlogListView(AsyncReadView):
+    serializer_class = BlogSerializer
+
+    def get_queryset(self, request):
+        return Blog.objects.all().order_by("-created_at")
+
+    async def read(self, request, selection):
+        queryset = self.get_queryset(request).prefetch_related(*selection.prefetch)
+        blogs = [blog async for blog in queryset]
+        return api_response(self.serialize(request, blogs, selection, many=True))
+
+
+class AsyncBlogPostListView(AsyncBlogListView):
+    serializer_class = BlogPostSerializer
+
+
+class AsyncBlogByCategoryView(AsyncBlogListView):
+    def get_queryset(self, request):
+        category = request.GET.get("category")
+        if category:
+            return Blog.objects.in_category(category)
+        return Blog.objects.none()
+
+
+def with_async_reads(read_view, view):
+    """
+    One URL, two views: GET/HEAD go to the async ``read_view``, every other
+    method to the DRF ``view`` in a thread (what Django does for sync views
+    under ASGI anyway).
+    """
+    view_in_thread = sync_to_async(view)
+
+    async def dispatch(request, *args, **kwargs):
+        if request.method in ("GET", "HEAD"):
+            return await read_view(request, *args, **kwargs)
+        return await view_in_thread(request, *args, **kwargs)
+
+    # DRF views are CSRF exempt and enforce CSRF in SessionAuthentication themselves
+    dispatch.csrf_exempt = getattr(view, "csrf_exempt", False)
+    return dispatch
+
+
+def public_read(view_class, async_view_class):
+    """URL view for a public read endpoint: the DRF view, or both when async reads are on."""
+    view = view_class.as_view()
+    if not async_read_settings()["ENABLED"]:
+        return view
+    return with_async_reads(async_view_class.as_view(), view)
@@ -0,0 +1,220 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.crypto import salted_hmac
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import is_shared
+
+User = get_user_model()
+
+TOKEN_VERSION_CLAIM = "ver"
+
+DEFAULTS = {
+    # "db": user lookup on every request
+    # "cache": in-process LRU keyed by (user id, token version), DB on miss
+    # "claims": build the user from signed claims; the DB is only asked for
+    #   the current token version when CACHES does not have it
+    "MODE": "cache",
+    "TTL": 60,
+    "MAX_SIZE": 1024,
+}
+
+
+def resolution_settings():
+    return {**DEFAULTS, **getattr(settings, "JWT_USER_RESOLUTION", {})}
+
+
+def token_version(user):
+    """
+    Fingerprint of everything that must invalidate issued tokens.
+
+    Changing the password, ``is_active`` or the staff flags changes the
+    version, so tokens carrying the old one stop resolving to a user.
+    """
+    value = f"{user.password}|{user.is_active}|{user.is_staff}|{user.is_superuser}"
+    return salted_hmac("api.authentication.token_version", value).hexdigest()[:16]
+
+
+def add_user_claims(token, user):
+    """Claims needed to resolve the user without a database round trip."""
+    token[TOKEN_VERSION_CLAIM] = token_version(user)
+    token["email"] = user.email
+    token["is_active"] = user.is_active
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    return token
+
+
+def current_version_key(user_id):
+    return f"token-version:{user_id}"
+
+
+def stored_version(user_id):
+    """The token version of the user row, or "deleted" when there is none."""
+    user = User._default_manager.filter(pk=user_id).only("password", "is_active", "is_staff", "is_superuser").first()
+    return "deleted" if user is None else token_version(user)
+
+
+def current_version_timeout():
+    # A refresh token carries its version into every access token it mints
+    lifetime = api_settings.REFRESH_TOKEN_LIFETIME + api_settings.ACCESS_TOKEN_LIFETIME
+    return int(lifetime.total_seconds())
+
+
+class UserCache:
+    """Thread-safe LRU of resolved users with a short TTL."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # user_id -> (version, user, expires_at)
+        # Current token version per user, from the shared Django cache (set
+        # on every save, by any worker) or, when it has none, the database;
+        # stale tokens are refused even in "claims" mode. Memoized here for
+        # the same TTL and size bound as the users.
+        self._current_versions = OrderedDict()  # user_id -> (version, expires_at)
+
+    def get(self, user_id, version):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            cached_version, user, expires_at = entry
+            if cached_version != version or expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # Each request gets its own instance so per-request state (related
+        # object caches like user.resume) never leaks between requests.
+        return copy.copy(user)
+
+    def set(self, user_id, version, user):
+        with self._lock:
+            self._remember(self._entries, user_id, (version, copy.copy(user)))
+
+    def _remember(self, entries, key, value):
+        # Caller holds the lock
+        options = resolution_settings()
+        entries[key] = (*value, time.monotonic() + options["TTL"])
+        entries.move_to_end(key)
+        while len(entries) > options["MAX_SIZE"]:
+            entries.popitem(last=False)
+
+    def current_version(self, user_id):
+        """The version tokens of ``user_id`` must carry."""
+        with self._lock:
+            entry = self._current_versions.get(user_id)
+            if entry is not None and entry[1] >= time.monotonic():
+                self._current_versions.move_to_end(user_id)
+                return entry[0]
+        # A per-process cache only holds the versions of saves made by this
+        # process: another worker's password change would go unnoticed
+        shared = is_shared()
+        version = cache.get(current_version_key(user_id)) if shared else None
+        if version is None:
+            # Evicted, expired, never saved since the cache started, or a
+            # per-process cache: one query, then memoized for TTL
+            version = stored_version(user_id)
+            if shared:
+                # add(): never overwrite a version set by a concurrent save
+                cache.add(current_version_key(user_id), version, timeout=current_version_timeout())
+        with self._lock:
+            self._remember(self._current_versions, user_id, (version,))
+        return version
+
+    def is_stale(self, user_id, version):
+        if version is None:
+            return False
+        return self.current_version(user_id) != version
+
+    def invalidate(self, user_id, current_version=None):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._current_versions.pop(user_id, None)
+        if current_version is None:
+            cache.delete(current_version_key(user_id))
+        else:
+            cache.set(current_version_key(user_id), current_version, timeout=current_version_timeout())
+            with self._lock:
+                self._remember(self._current_versions, user_id, (current_version,))
+
+    def clear(self):
+        """Forget this process's entries (the shared versions stay)."""
+        with self._lock:
+            self._entries.clear()
+            self._current_versions.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that skips the per-request ``CustomUser`` SELECT.
+
+    Depending on ``JWT_USER_RESOLUTION["MODE"]`` the user comes from the
+    in-process cache or straight from the signed token claims; the database
+    is only hit on a cache miss (or always, in "db" mode). In every mode a
+    token whose version no longer matches the user is refused.
+    """
+
+    def get_user(self, validated_token):
+        options = resolution_settings()
+        if options["MODE"] == "db":
+            user = super().get_user(validated_token)
+            self.check_version(user, validated_token.get(TOKEN_VERSION_CLAIM))
+            return user
+
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        version = validated_token.get(TOKEN_VERSION_CLAIM)
+
+        if user_cache.is_stale(user_id, version):
+            raise AuthenticationFailed(_("Token is no longer valid for this user."), code="token_version")
+
+        has_claims = version is not None and "is_staff" in validated_token and "is_active" in validated_token
+        if options["MODE"] == "claims" and has_claims:
+            return self.user_from_claims(user_id, validated_token)
+
+        user = user_cache.get(user_id, version)
+        if user is not None:
+            return user
+
+        user = super().get_user(validated_token)
+        self.check_version(user, version)
+        user_cache.set(user_id, version, user)
+        return user
+
+    def check_version(self, user, version):
+        if version is not None and version != token_version(user):
+            raise AuthenticationFailed(_("Token is no longer valid for this user."), code="token_version")
+
+    def user_from_claims(self, user_id, validated_token):
+        if not validated_token["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        user = User(
+            id=user_id,
+            email=validated_token.get("email", ""),
+            is_active=True,
+            is_staff=validated_token["is_staff"],
+            is_superuser=validated_token.get("is_superuser", False),
+        )
+        # Behave like a fetched row so FK assignment (blog.user) works
+        user._state.adding = False
+        user._state.db = "default"
+        return user
+
+
+def invalidate_user(user, deleted=False):
+    """Drop cached resolutions for ``user``; called from CustomUser signals."""
+    user_cache.invalidate(str(user.pk), "deleted" if deleted else token_version(user))
@@ -0,0 +1,180 @@
+"""
+Synthetic portfolio data and summary statistics for the benchmark commands.
+
+``generate_portfolio`` fills the current database with realistic-looking
+resumes and blogs at a given scale. Child rows are bulk inserted; images are
+tiny JPEGs written through the configured storage (use an in-memory storage
+when benchmarking), block media only get a file name.
+"""
+import io
+import random
+import statistics
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from .models import (
+    Resume, Experience, Certification, Education, TechSkill, SoftSkill, Hobby, SliderGallery, Blog, BlogBlock
+)
+
+WORDS = (
+    "django api cache query latency resume portfolio design python deploy cloud image "
+    "database index replica serializer render request response frontend mobile react "
+    "team project launch metric profile scale bundle static storage signal worker"
+).split()
+
+CATEGORIES = ("engineering", "design", "career", "devops", "python", "frontend", "data", "notes")
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples, digits=3):
+    """mean/p50/p95/p99/max of ``samples`` (ms), rounded."""
+    return {
+        'mean_ms': round(statistics.fmean(samples), digits),
+        'p50_ms': round(percentile(samples, 50), digits),
+        'p95_ms': round(percentile(samples, 95), digits),
+        'p99_ms': round(percentile(samples, 99), digits),
+        'max_ms': round(max(samples), digits),
+    }
+
+
+def sample_jpeg(width=64, height=48, color=(40, 90, 160)):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+class PortfolioGenerator:
+    def __init__(self, seed=0, batch_size=500):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.jpeg = sample_jpeg()
+
+    def words(self, count):
+        return " ".join(self.rng.choice(WORDS) for _ in range(count))
+
+    def sentence(self, low=6, high=18):
+        return self.words(self.rng.randint(low, high)).capitalize() + "."
+
+    def paragraph(self, sentences=4):
+        return " ".join(self.sentence() for _ in range(sentences))
+
+    def day(self, years_back=10):
+        return date.today() - timedelta(days=self.rng.randint(0, years_back * 365))
+
+    def create_resume(self, index, experiences, skills, gallery_images):
+        User = get_user_model()
+        user = User.objects.create_user(email=f"bench{index}@example.com", password=None, is_staff=True)
+        resume = Resume.objects.create(
+            user=user,
+            email=user.email,
+            name=f"Bench User {index}",
+            title=self.words(3).title(),
+            phone_number="+10000000000",
+            location="Remote",
+            bio=self.paragraph(3),
+            profile_image=ContentFile(self.jpeg, name=f"profile-{index}.jpg"),
+        )
+
+        Experience.objects.bulk_create([
+            Experience(
+                resume=resume, title=self.words(2).title(), company=self.words(1).title(),
+                start_date=self.day(), end_date=None if i == 0 else self.day(),
+                description=self.paragraph(2), achievements=[self.sentence() for _ in range(3)],
+            )
+            for i in range(experiences)
+        ])
+        Certification.objects.bulk_create([
+            Certification(resume=resume, title=self.words(3).title(), issuer=self.words(1).title(),
+                          date=self.day(), link="https://example.com/cert", skills=self.words(3).split())
+            for _ in range(max(1, experiences // 2))
+        ])
+        Education.objects.bulk_create([
+            Education(resume=resume, degree=self.words(2).title(), institution=self.words(2).title(),
+                      university=self.words(2).title(), year=str(2010 + i), grade="A",
+                      description=self.sentence())
+            for i in range(2)
+        ])
+        TechSkill.objects.bulk_create([
+            TechSkill(resume=resume, name=self.words(1), level=self.rng.randint(1, 10)) for _ in range(skills)
+        ])
+        SoftSkill.objects.bulk_create([
+            SoftSkill(resume=resume, name=self.words(1), icon="star") for _ in range(max(1, skills // 2))
+        ])
+        Hobby.objects.bulk_create([
+            Hobby(resume=resume, name=self.words(1), icon="heart", description=self.sentence()) for _ in range(3)
+        ])
+        # Uploaded one by one like the edit form does (storage write + metadata)
+        for i in range(gallery_images):
+            SliderGallery.objects.create(resume=resume, image=ContentFile(self.jpeg, name=f"gallery-{index}-{i}.jpg"))
+        return resume
+
+    def comment(self):
+        return {
+            "author": self.words(2).title(),
+            "text": self.sentence(),
+            "created_at": (timezone.now() - timedelta(minutes=self.rng.randint(0, 100000))).isoformat(),
+        }
+
+    def block(self, blog, order):
+        kind = self.rng.choices((BlogBlock.TEXT, BlogBlock.IMAGE, BlogBlock.VIDEO), weights=(6, 3, 1))[0]
+        if kind == BlogBlock.TEXT:
+            return BlogBlock(blog=blog, type=kind, content=self.paragraph(), order=order)
+        name = f"blog_media/{blog.pk.hex[:8]}-{order}.{'jpg' if kind == BlogBlock.IMAGE else 'mp4'}"
+        block = BlogBlock(blog=blog, type=kind, media_file=name, order=order)
+        if kind == BlogBlock.IMAGE:
+            block.media_width, block.media_height = 1600, 900
+        return block
+
+    def create_blogs(self, users, count, blocks, tags, comments, categories):
+        categories = CATEGORIES[:max(1, categories)]
+        for start in range(0, count, self.batch_size):
+            batch = [
+                Blog(
+                    user=self.rng.choice(users),
+                    title=self.words(6).title(),
+                    description=self.paragraph(2),
+                    category=self.rng.choice(categories),
+                    cover_image=f"blog_covers/cover-{start + i}.jpg",
+                    cover_image_width=1200,
+                    cover_image_height=630,
+                    tags=self.rng.sample(WORDS, min(tags, len(WORDS))),
+                    likes_count=self.rng.randint(0, 500),
+                    comments=[self.comment() for _ in range(comments)],
+                )
+                for i in range(min(self.batch_size, count - start))
+            ]
+            batch_blocks = []
+            for blog in batch:
+                blog_blocks = [self.block(blog, order) for order in range(blocks)]
+                blog.apply_block_summary(blog_blocks)
+                batch_blocks.extend(blog_blocks)
+            Blog.objects.bulk_create(batch)
+            BlogBlock.objects.bulk_create(batch_blocks, batch_size=self.batch_size)
+        return list(categories)
+
+
+def generate_portfolio(resumes=1, experiences=10, skills=20, gallery_images=6,
+                       blogs=2000, blocks=8, tags=5, comments=10, categories=8, seed=0):
+    """Create the synthetic dataset; returns the ids the benchmark requests need."""
+    generator = PortfolioGenerator(seed=seed)
+    created = [generator.create_resume(i, experiences, skills, gallery_images) for i in range(max(1, resumes))]
+    users = [resume.user for resume in created]
+    used_categories = generator.create_blogs(users, blogs, blocks, tags, comments, categories)
+    return {
+        'resume_ids': [resume.pk for resume in created],
+        'users': users,
+        'blog_id': Blog.objects.values_list('pk', flat=True).first(),
+        'categories': used_categories,
+    }
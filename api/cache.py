@@ -0,0 +1,58 @@
+"""
+Versioned keys for cached API payloads.
+
+Every resume and blog has a content version in the Django cache, plus one
+version per kind ("any blog changed"). ``content_changed`` bumps them, so a
+payload cached under the old versions is simply never looked up again and
+nothing has to know which keys to delete.
+"""
+import time
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+ALL = "*"
+
+
+def is_shared():
+    """Whether CACHES is seen by every worker; LocMemCache and DummyCache are per process."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def version_key(kind, object_id=ALL):
+    return f"content-version:{kind}:{object_id}"
+
+
+def fresh_version():
+    # Not 0: a version evicted from the cache must not reuse an old number
+    return time.time_ns()
+
+
+def content_versions(*pairs):
+    """Current versions for ``(kind, object_id)`` pairs, in one cache round trip."""
+    keys = [version_key(kind, object_id) for kind, object_id in pairs]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        if key not in found:
+            version = fresh_version()
+            # Another process may have created it first; theirs wins
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+            found[key] = version
+        versions.append(found[key])
+    return versions
+
+
+def bump_version(kind, object_id=ALL):
+    key = version_key(kind, object_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, fresh_version(), timeout=None)
+
+
+def content_changed_receiver(sender, object_id, deleted, **kwargs):
+    bump_version(sender, object_id)
+    bump_version(sender)
@@ -0,0 +1,104 @@
+import contextvars
+import logging
+from contextlib import asynccontextmanager, contextmanager
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+RESUME = "resume"
+BLOG = "blog"
+
+# Sent once per changed resume/blog after the writes are committed.
+# sender: RESUME or BLOG; kwargs: object_id (str), deleted (bool),
+# children_only (bool: only child rows were written, not the resume/blog row)
+content_changed = Signal()
+
+# Sent once per dispatched batch, after content_changed, for receivers that
+# prefer one call per request (e.g. a CDN purge). kwargs: changes, a dict
+# {(kind, object_id): deleted}
+changes_dispatched = Signal()
+
+_batch = contextvars.ContextVar("content_changes", default=None)
+
+
+class Changes(dict):
+    """``{(kind, object_id): deleted}``, plus the keys whose own row was written (``saved``)."""
+
+    def __init__(self):
+        super().__init__()
+        self.saved = set()
+
+    def add(self, key, deleted, child):
+        self[key] = self.get(key, False) or deleted
+        if not child:
+            self.saved.add(key)
+
+
+def mark_changed(kind, object_id, deleted=False, child=False):
+    """
+    Record that a resume or blog (or, with ``child=True``, only one of its
+    children) was written.
+
+    Inside ``collect_changes()`` (every request, see ContentChangeMiddleware)
+    the marks are coalesced, so a resume update that rewrites forty child
+    rows still produces a single ``content_changed`` for that resume.
+    """
+    key = (kind, str(object_id))
+    batch = _batch.get()
+    if batch is None:
+        changes = Changes()
+        changes.add(key, deleted, child)
+        transaction.on_commit(lambda: dispatch(changes))
+    else:
+        batch.add(key, deleted, child)
+
+
+@contextmanager
+def collect_changes():
+    batch = Changes()
+    token = _batch.set(batch)
+    try:
+        yield batch
+    finally:
+        _batch.reset(token)
+        dispatch_on_commit(batch)
+
+
+@asynccontextmanager
+async def acollect_changes():
+    """``collect_changes()`` for async middleware; receivers do blocking I/O, so they run in a thread."""
+    batch = Changes()
+    token = _batch.set(batch)
+    try:
+        yield batch
+    finally:
+        _batch.reset(token)
+        if batch:
+            await sync_to_async(dispatch_on_commit)(batch)
+
+
+def dispatch_on_commit(batch):
+    if batch:
+        transaction.on_commit(lambda: dispatch(batch))
+
+
+def dispatch(changes):
+    for (kind, object_id), deleted in changes.items():
+        children_only = isinstance(changes, Changes) and (kind, object_id) not in changes.saved
+        for receiver, result in content_changed.send_robust(
+            sender=kind, object_id=object_id, deleted=deleted, children_only=children_only
+        ):
+            if isinstance(result, Exception):
+                logger.error(
+                    "content_changed receiver %r failed for %s %s",
+                    receiver, kind, object_id, exc_info=(type(result), result, result.__traceback__),
+                )
+    for receiver, result in changes_dispatched.send_robust(sender=None, changes=changes):
+        if isinstance(result, Exception):
+            logger.error(
+                "changes_dispatched receiver %r failed for %d changes",
+                receiver, len(changes), exc_info=(type(result), result, result.__traceback__),
+            )
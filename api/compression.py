@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+DEFAULTS = {
+    # Bodies smaller than this are sent as-is (headers would eat the gain)
+    "MIN_SIZE": 512,
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 5,
+    # Upper bound for the in-process cache of compressed variants
+    "CACHE_BYTES": 8 * 1024 * 1024,
+}
+
+# API payloads only. HTML pages (admin, browsable API) carry CSRF tokens next
+# to reflected input, which compression leaks (BREACH).
+COMPRESSIBLE_TYPES = ("application/json",)
+
+
+def compression_settings():
+    return {**DEFAULTS, **getattr(settings, "COMPRESSION", {})}
+
+
+def available_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding):
+    """
+    Pick the encoding with the highest q-value the client accepts (q > 0);
+    brotli wins ties.
+    """
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(content, encoding):
+    options = compression_settings()
+    if encoding == "br":
+        return brotli.compress(content, quality=options["BROTLI_QUALITY"])
+    # mtime=0 keeps the output deterministic for identical bodies
+    return gzip.compress(content, compresslevel=options["GZIP_LEVEL"], mtime=0)
+
+
+class CompressedCache:
+    """
+    LRU of compressed bodies keyed by (content digest, encoding).
+
+    Cached and materialized endpoints return byte-identical bodies on every
+    hit; hashing is an order of magnitude cheaper than compressing, so the
+    second and later hits reuse the stored variant.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def get_or_compress(self, content, encoding):
+        key = (hashlib.blake2b(content, digest_size=16).digest(), encoding)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                return compressed
+
+        compressed = compress(content, encoding)
+        limit = compression_settings()["CACHE_BYTES"]
+        if len(compressed) > limit:
+            return compressed
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = compressed
+                self._size += len(compressed)
+            while self._size > limit:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return compressed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+compressed_cache = CompressedCache()
+
+
+def is_compressible(response):
+    # Like Django's GZipMiddleware: never a response that sets the CSRF token
+    if settings.CSRF_COOKIE_NAME in response.cookies:
+        return False
+    content_type = response.get("Content-Type", "").lower()
+    return any(content_type.startswith(prefix) for prefix in COMPRESSIBLE_TYPES)
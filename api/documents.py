@@ -0,0 +1,168 @@
+"""
+MongoDB read model: one document per resume and per blog, children embedded.
+
+Documents are written by api.mirror from the serializers' output, so a
+detail read is a single ``find_one`` that returns exactly what the ORM
+endpoints return. Dynamic documents keep fields added to the serializers
+later without a schema change here.
+"""
+from mongoengine import DynamicDocument, DynamicEmbeddedDocument, fields
+
+
+class ExperienceDocument(DynamicEmbeddedDocument):
+    id = fields.IntField()
+    title = fields.StringField()
+    company = fields.StringField()
+    start_date = fields.StringField()
+    end_date = fields.StringField(null=True)
+    description = fields.StringField()
+    achievements = fields.ListField()
+    order = fields.IntField()
+
+
+class CertificationDocument(DynamicEmbeddedDocument):
+    id = fields.IntField()
+    title = fields.StringField()
+    issuer = fields.StringField()
+    date = fields.StringField()
+    link = fields.StringField(null=True)
+    skills = fields.ListField()
+    order = fields.IntField()
+
+
+class EducationDocument(DynamicEmbeddedDocument):
+    id = fields.IntField()
+    degree = fields.StringField()
+    institution = fields.StringField()
+    university = fields.StringField()
+    year = fields.StringField()
+    grade = fields.StringField(null=True)
+    description = fields.StringField(null=True)
+    order = fields.IntField()
+
+
+class TechSkillDocument(DynamicEmbeddedDocument):
+    id = fields.IntField()
+    name = fields.StringField()
+    level = fields.IntField()
+    order = fields.IntField()
+
+
+class SoftSkillDocument(DynamicEmbeddedDocument):
+    id = fields.IntField()
+    name = fields.StringField()
+    icon = fields.StringField()
+    order = fields.IntField()
+
+
+class HobbyDocument(DynamicEmbeddedDocument):
+    id = fields.IntField()
+    name = fields.StringField()
+    icon = fields.StringField()
+    description = fields.StringField(null=True)
+    order = fields.IntField()
+
+
+class GalleryImageDocument(DynamicEmbeddedDocument):
+    image = fields.StringField(null=True)
+    width = fields.IntField(null=True)
+    height = fields.IntField(null=True)
+    placeholder = fields.StringField(null=True)
+
+
+class ResumeDocument(DynamicDocument):
+    resume_id = fields.StringField(primary_key=True)
+    name = fields.StringField()
+    title = fields.StringField()
+    email = fields.StringField()
+    phone_number = fields.StringField()
+    location = fields.StringField()
+    bio = fields.StringField()
+    profile_image = fields.StringField(null=True)
+    profile_image_width = fields.IntField(null=True)
+    profile_image_height = fields.IntField(null=True)
+    profile_image_placeholder = fields.StringField(null=True)
+    experiences = fields.EmbeddedDocumentListField(ExperienceDocument)
+    certifications = fields.EmbeddedDocumentListField(CertificationDocument)
+    education = fields.EmbeddedDocumentListField(EducationDocument)
+    tech_skills = fields.EmbeddedDocumentListField(TechSkillDocument)
+    soft_skills = fields.EmbeddedDocumentListField(SoftSkillDocument)
+    hobbies = fields.EmbeddedDocumentListField(HobbyDocument)
+    slider_gallery = fields.EmbeddedDocumentListField(GalleryImageDocument)
+    synced_at = fields.DateTimeField()
+
+    meta = {"collection": "resumes"}
+
+    COLLECTIONS = {
+        "experiences": ExperienceDocument,
+        "certifications": CertificationDocument,
+        "education": EducationDocument,
+        "tech_skills": TechSkillDocument,
+        "soft_skills": SoftSkillDocument,
+        "hobbies": HobbyDocument,
+        "slider_gallery": GalleryImageDocument,
+    }
+
+
+class BlogBlockDocument(DynamicEmbeddedDocument):
+    id = fields.StringField()
+    type = fields.StringField()
+    content = fields.StringField(null=True)
+    media_file = fields.StringField(null=True)
+    width = fields.IntField(null=True)
+    height = fields.IntField(null=True)
+    placeholder = fields.StringField(null=True)
+    order = fields.IntField()
+
+
+class BlogDocument(DynamicDocument):
+    id = fields.StringField(primary_key=True)
+    user = fields.StringField()
+    title = fields.StringField()
+    description = fields.StringField()
+    category = fields.StringField()
+    cover_image = fields.StringField(null=True)
+    cover_image_width = fields.IntField(null=True)
+    cover_image_height = fields.IntField(null=True)
+    cover_image_placeholder = fields.StringField(null=True)
+    tags = fields.ListField()
+    likes_count = fields.IntField()
+    resource_link = fields.StringField(null=True)
+    deployed_link = fields.StringField(null=True)
+    word_count = fields.IntField()
+    reading_time = fields.IntField()
+    image_count = fields.IntField()
+    video_count = fields.IntField()
+    thumbnail = fields.StringField(null=True)
+    thumbnail_width = fields.IntField(null=True)
+    thumbnail_height = fields.IntField(null=True)
+    thumbnail_placeholder = fields.StringField(null=True)
+    blocks = fields.EmbeddedDocumentListField(BlogBlockDocument)
+    created_at = fields.StringField()
+    synced_at = fields.DateTimeField()
+
+    meta = {"collection": "blogs"}
+
+    COLLECTIONS = {
+        "blocks": BlogBlockDocument,
+    }
+
+
+def build_document(document_class, object_id, data, synced_at):
+    """Instantiate ``document_class`` from serializer output (plain JSON types)."""
+    values = {key: value for key, value in data.items() if key != "id"}
+    for name, embedded_class in document_class.COLLECTIONS.items():
+        values[name] = [embedded_class(**item) for item in values.get(name) or []]
+    document = document_class(**values, synced_at=synced_at)
+    document.pk = object_id
+    return document
+
+
+def document_to_api(document):
+    """The stored serializer output, in the serializer's key order."""
+    data = document.to_mongo().to_dict()
+    object_id = data.pop("_id")
+    data.pop("synced_at", None)
+    if isinstance(document, BlogDocument):
+        return {"id": object_id, **data}
+    return data
@@ -0,0 +1,265 @@
+"""
+Edge (CDN) caching of the public read endpoints.
+
+EdgeCacheMiddleware gives every successful anonymous GET of a public
+endpoint a ``Cache-Control`` policy and a ``Surrogate-Key`` header naming
+the content it contains::
+
+    Cache-Control: public, max-age=0, s-maxage=86400, stale-while-revalidate=30, stale-if-error=86400
+    Surrogate-Key: resume:<id> blogs
+
+Each kind of endpoint has its own policy (``ENDPOINTS``): browsers
+revalidate single resumes and posts every time, and may keep lists, the
+archive and the portfolio bundle for a short while (a browser cache cannot
+be purged). The CDN keeps every response for ``s-maxage`` seconds.
+ConditionalGetMiddleware adds an ``ETag``, so a revalidation whose content
+did not change is a 304 without a body. Writes purge by key: every ``content_changed`` batch
+(saves and deletes of resumes, blogs and their child rows, see
+api/changes.py) is turned into keys and handed to the configured purge
+backend in one call. Without a backend nothing can be purged, so the edge
+TTL drops to ``UNPURGED_TTL`` and staleness stays bounded.
+
+Keys: ``resume:<id>`` and ``blog:<id>`` for one object, ``blogs`` for every
+response built from more than one blog (lists, categories, cards, archive,
+related posts). Changing a blog purges ``blog:<id>`` and ``blogs``.
+"""
+import json
+import urllib.request
+from collections import deque
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.cache import patch_cache_control
+from django.utils.module_loading import import_string
+
+from .changes import BLOG, RESUME
+from .fieldsets import parse_names
+
+BLOGS = "blogs"
+
+
+class CachePolicy(NamedTuple):
+    max_age: int = 0
+    # None: PURGED_TTL with a purge backend, UNPURGED_TTL without
+    s_maxage: Optional[int] = None
+    stale_while_revalidate: int = 30
+
+
+def resume_keys(request, pk, **kwargs):
+    return [f"{RESUME}:{pk}"]
+
+
+def blog_keys(request, pk, **kwargs):
+    keys = [f"{BLOG}:{pk}"]
+    requested = (parse_names(request.GET.get("fields")) or set()) | (parse_names(request.GET.get("include")) or set())
+    if "related" in requested:
+        # Related posts show other blogs' titles and covers
+        keys.append(BLOGS)
+    return keys
+
+
+def blogs_keys(request, **kwargs):
+    return [BLOGS]
+
+
+def portfolio_keys(request, pk, **kwargs):
+    return [f"{RESUME}:{pk}", BLOGS]
+
+
+# One object: what its author just saved shows up on the next load
+DETAIL = CachePolicy()
+# Many blogs: a new post may take half a minute to appear in a visitor's browser
+LIST = CachePolicy(max_age=30, stale_while_revalidate=60)
+# Counts per month/category/tag, only shifted by publishing or deleting
+ARCHIVE = CachePolicy(max_age=300, stale_while_revalidate=600)
+# The first-paint bundle: heaviest response, reloaded on every visit
+PORTFOLIO = CachePolicy(max_age=60, stale_while_revalidate=300)
+# View counts are not purged on change; a short TTL bounds their lag
+TOP_POSTS = CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=60)
+
+# URL name -> (policy, surrogate keys of a response)
+ENDPOINTS = {
+    "resume-detail": (DETAIL, resume_keys),
+    "resume-section": (DETAIL, resume_keys),
+    "resume-section-item": (DETAIL, resume_keys),
+    "blog-detail": (DETAIL, blog_keys),
+    "blog-list-create": (LIST, blogs_keys),
+    "blog-by-category": (LIST, blogs_keys),
+    "blog-posts": (LIST, blogs_keys),
+    "blog-archive": (ARCHIVE, blogs_keys),
+    "portfolio": (PORTFOLIO, portfolio_keys),
+    "top-posts": (TOP_POSTS, blogs_keys),
+}
+
+EDGE_CACHE_DEFAULTS = {
+    "ENABLED": True,
+    "KEY_HEADER": "Surrogate-Key",
+    # Dotted path of a PurgeBackend, e.g. "api.edge.FastlyPurger"; options are its kwargs
+    "PURGE_BACKEND": None,
+    "PURGE_OPTIONS": {},
+    "PURGED_TTL": 86400,
+    "UNPURGED_TTL": 60,
+    "STALE_IF_ERROR": 86400,
+    # URL name -> {"max_age": ..., "s_maxage": ..., "stale_while_revalidate": ...} overrides
+    "POLICIES": {},
+}
+
+
+@lru_cache(maxsize=None)
+def edge_cache_settings():
+    return {**EDGE_CACHE_DEFAULTS, **getattr(settings, "EDGE_CACHE", {})}
+
+
+@lru_cache(maxsize=None)
+def purger():
+    """The configured PurgeBackend instance, or None."""
+    options = edge_cache_settings()
+    if not options["PURGE_BACKEND"]:
+        return None
+    return import_string(options["PURGE_BACKEND"])(**options["PURGE_OPTIONS"])
+
+
+@receiver(setting_changed)
+def reset_edge_cache_settings(setting, **kwargs):
+    if setting == "EDGE_CACHE":
+        edge_cache_settings.cache_clear()
+        purger.cache_clear()
+
+
+def policy_for(url_name, options):
+    policy, _ = ENDPOINTS[url_name]
+    policy = policy._replace(**options["POLICIES"].get(url_name, {}))
+    if policy.s_maxage is None:
+        policy = policy._replace(s_maxage=options["PURGED_TTL"] if purger() else options["UNPURGED_TTL"])
+    return policy
+
+
+def has_credentials(request):
+    return "HTTP_AUTHORIZATION" in request.META or settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def apply_edge_headers(request, response):
+    options = edge_cache_settings()
+    match = request.resolver_match
+    if (
+        not options["ENABLED"]
+        or request.method not in ("GET", "HEAD")
+        or response.status_code != 200
+        or match is None
+        or match.url_name not in ENDPOINTS
+        or response.has_header("Cache-Control")
+    ):
+        return response
+    if has_credentials(request):
+        # Same content, but a shared cache must not answer credentialed requests
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    policy = policy_for(match.url_name, options)
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=policy.max_age,
+        s_maxage=policy.s_maxage,
+        stale_while_revalidate=policy.stale_while_revalidate,
+        stale_if_error=options["STALE_IF_ERROR"],
+    )
+    _, keys = ENDPOINTS[match.url_name]
+    response[options["KEY_HEADER"]] = " ".join(keys(request, **match.kwargs))
+    return response
+
+
+def keys_for_changes(changes):
+    keys = set()
+    for (kind, object_id), _deleted in changes.items():
+        keys.add(f"{kind}:{object_id}")
+        if kind == BLOG:
+            keys.add(BLOGS)
+    return sorted(keys)
+
+
+def purge_keys(keys):
+    backend = purger()
+    if backend is not None and keys:
+        backend.purge(list(keys))
+
+
+def purge_everything():
+    backend = purger()
+    if backend is not None:
+        backend.purge_all()
+
+
+def changes_dispatched_receiver(sender, changes, **kwargs):
+    purge_keys(keys_for_changes(changes))
+
+
+class PurgeBackend:
+    """Purges cached responses by surrogate key; subclasses implement ``purge()`` and ``purge_all()``."""
+
+    def purge(self, keys):
+        raise NotImplementedError
+
+    def purge_all(self):
+        raise NotImplementedError
+
+
+class RecordingPurger(PurgeBackend):
+    """Local stand-in for a CDN: remembers the purged keys (tests, development)."""
+
+    def __init__(self, limit=1000, **options):
+        self.calls = deque(maxlen=limit)
+
+    def purge(self, keys):
+        self.calls.append(tuple(keys))
+
+    def purge_all(self):
+        self.calls.append(("*",))
+
+    @property
+    def purged(self):
+        return {key for call in self.calls for key in call}
+
+    def clear(self):
+        self.calls.clear()
+
+
+class FastlyPurger(PurgeBackend):
+    """Fastly purge-by-surrogate-key API; soft purges keep stale copies for stale-while-revalidate."""
+
+    URL = "https://api.fastly.com/service/{service_id}/purge"
+    PURGE_ALL_URL = "https://api.fastly.com/service/{service_id}/purge_all"
+    MAX_KEYS = 256
+
+    def __init__(self, service_id, api_token, soft=True, timeout=5.0, **options):
+        self.url = self.URL.format(service_id=service_id)
+        self.purge_all_url = self.PURGE_ALL_URL.format(service_id=service_id)
+        self.api_token = api_token
+        self.soft = soft
+        self.timeout = timeout
+
+    def purge(self, keys):
+        for start in range(0, len(keys), self.MAX_KEYS):
+            batch = keys[start:start + self.MAX_KEYS]
+            headers = {"Fastly-Key": self.api_token, "Accept": "application/json"}
+            if self.soft:
+                headers["Fastly-Soft-Purge"] = "1"
+            request = urllib.request.Request(
+                self.url,
+                data=json.dumps({"surrogate_keys": batch}).encode(),
+                headers={**headers, "Content-Type": "application/json"},
+                method="POST",
+            )
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+
+    def purge_all(self):
+        # Always a hard purge: Fastly has no soft purge_all
+        request = urllib.request.Request(
+            self.purge_all_url, headers={"Fastly-Key": self.api_token, "Accept": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
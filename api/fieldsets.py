@@ -0,0 +1,74 @@
+"""
+``?fields=`` / ``?include=`` handling for the resume and blog read endpoints.
+
+- ``fields``: comma separated top-level fields to return (sparse fieldset).
+- ``include``: nested relations to return, e.g. ``include=tech_skills``.
+
+Without ``fields`` every plain field is returned; relations are returned when
+listed in either parameter. With neither parameter the response is unchanged.
+Optional relations (a serializer's ``OPTIONAL_RELATIONS``, e.g. a blog's
+``related``) are only returned when named explicitly.
+Relations that are not rendered are not prefetched, so they cost no query.
+"""
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from rest_framework.exceptions import ValidationError
+
+
+class FieldSelection(NamedTuple):
+    fields: Optional[tuple]
+    prefetch: tuple
+
+    @property
+    def cache_key(self):
+        return "*" if self.fields is None else ",".join(self.fields)
+
+    def selects(self, name):
+        """Whether ``name`` was asked for explicitly (optional relations only render then)."""
+        return self.fields is not None and name in self.fields
+
+    def prune(self, data):
+        """Apply the selection to an already rendered payload (e.g. a Mongo document)."""
+        if self.fields is None:
+            return data
+        return {name: value for name, value in data.items() if name in self.fields}
+
+
+@lru_cache(maxsize=None)
+def field_names(serializer_class):
+    # A serializer without ``fields=`` leaves out its optional relations
+    return tuple(serializer_class().fields) + tuple(serializer_class.OPTIONAL_RELATIONS)
+
+
+def parse_names(value):
+    if not value:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def select_fields(serializer_class, query_params):
+    """The FieldSelection requested in ``query_params``; ValidationError on unknown names."""
+    requested = parse_names(query_params.get("fields"))
+    include = parse_names(query_params.get("include"))
+    if requested is None and include is None:
+        return FieldSelection(None, tuple(serializer_class.RELATIONS.values()))
+
+    relations = {**serializer_class.RELATIONS, **serializer_class.OPTIONAL_RELATIONS}
+    names = field_names(serializer_class)
+    errors = {}
+    if requested and requested - set(names):
+        errors["fields"] = f"Unknown fields: {', '.join(sorted(requested - set(names)))}. Available: {', '.join(names)}"
+    if include and include - set(relations):
+        errors["include"] = f"Unknown relations: {', '.join(sorted(include - set(relations)))}. Available: {', '.join(relations)}"
+    if errors:
+        raise ValidationError(errors)
+
+    wanted_relations = (requested or set()) | (include or set())
+    selected = tuple(
+        name for name in names
+        if (name in relations and name in wanted_relations)
+        or (name not in relations and (requested is None or name in requested))
+    )
+    prefetch = tuple(relation for name, relation in relations.items() if name in wanted_relations)
+    return FieldSelection(selected, prefetch)
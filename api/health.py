@@ -0,0 +1,124 @@
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+HEALTH_PAYLOAD = {
+    "status": "healthy",
+    "message": "Server is up and running"
+}
+
+API_ROOT_PAYLOAD = {
+    "message": "Welcome to Portfolio Backend API",
+    "version": "1.0.0",
+    "status": "online",
+    "endpoints": {
+        "health": "/api/health/",
+        "resumes": "/api/resumes/",
+        "resume_detail": "/api/resumes/{id}/",
+        "blogs": "/api/blogs/",
+        "blog_detail": "/api/blog-post/{id}/",
+        "blog_posts": "/api/blog-posts/",
+        "auth": {
+            "register": "/api/user/register/",
+            "token": "/api/token/",
+            "refresh": "/api/token/refresh/"
+        },
+        "admin": "/admin/",
+        "setup": "/api/setup-admin/",
+        "clear_database": "/api/clear-database/"
+    },
+    "database": "Connected",
+    "media_storage": "Cloudinary"
+}
+
+DEFAULTS = {
+    # Serve the deep report for plain /api/health/ too (not only ?deep=1)
+    "DEEP": False,
+    # Seconds a probe result is reused before the next real probe
+    "TTL": 30,
+}
+
+
+def health_settings():
+    return {**DEFAULTS, **getattr(settings, "HEALTH_CHECK", {})}
+
+
+def probe_database():
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+
+
+def probe_storage():
+    from django.core.files.storage import default_storage
+
+    # Any answer (True or False) proves the backend is reachable
+    default_storage.exists("health-check")
+
+
+PROBES = {
+    "database": probe_database,
+    "storage": probe_storage,
+}
+
+
+class DeepHealth:
+    """
+    Probe results shared by all requests in the process for ``TTL`` seconds.
+
+    Only one thread refreshes at a time; concurrent callers get the previous
+    report instead of piling more probes onto a struggling dependency.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._report = None
+        self._expires_at = 0
+
+    def report(self):
+        if self._report is not None and time.monotonic() < self._expires_at:
+            return self._report
+        if not self._lock.acquire(blocking=self._report is None):
+            return self._report
+        try:
+            if self._report is None or time.monotonic() >= self._expires_at:
+                self._report = self._run()
+                self._expires_at = time.monotonic() + health_settings()["TTL"]
+            return self._report
+        finally:
+            self._lock.release()
+
+    def _run(self):
+        checks = {}
+        for name, probe in PROBES.items():
+            started = time.perf_counter()
+            try:
+                probe()
+                checks[name] = {"ok": True}
+            except Exception as e:
+                checks[name] = {"ok": False, "error": str(e)}
+            checks[name]["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        healthy = all(check["ok"] for check in checks.values())
+        return {
+            "status": "healthy" if healthy else "degraded",
+            "message": "Server is up and running" if healthy else "One or more dependencies are failing",
+            "checks": checks,
+            "checked_at": timezone.now().isoformat(),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._report = None
+            self._expires_at = 0
+
+
+deep_health = DeepHealth()
+
+
+def wants_deep(request):
+    return health_settings()["DEEP"] or request.GET.get("deep", "").lower() in ("1", "true", "yes")
@@ -0,0 +1,85 @@
+import base64
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Longest side (px) of the inline preview. 16px JPEGs encode to a few hundred
+# bytes, small enough to ship inside every list/detail payload.
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+EXIF_ORIENTATION = 0x0112
+# Names of PIL.Image.Transpose members; PIL itself is imported on first upload
+ORIENTATION_TRANSPOSE = {
+    2: "FLIP_LEFT_RIGHT",
+    3: "ROTATE_180",
+    4: "FLIP_TOP_BOTTOM",
+    5: "TRANSPOSE",
+    6: "ROTATE_270",
+    7: "TRANSVERSE",
+    8: "ROTATE_90",
+}
+
+EMPTY_METADATA = (None, None, "")
+
+
+def read_image_metadata(fileobj):
+    """
+    Decode an image once and return ``(width, height, placeholder)``.
+
+    ``placeholder`` is a tiny JPEG data URI (LQIP) the frontend can use as a
+    blurred background while the real image loads. The file position is
+    rewound afterwards so the same upload can still be handed to storage.
+    """
+    if fileobj is None:
+        return EMPTY_METADATA
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        fileobj.seek(0)
+        with Image.open(fileobj) as image:
+            orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+            width, height = image.size
+            if orientation in (5, 6, 7, 8):
+                width, height = height, width
+
+            # JPEG draft mode lets the decoder downscale while decoding
+            image.draft("RGB", (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+            preview = image.convert("RGB")
+            preview.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+            if orientation in ORIENTATION_TRANSPOSE:
+                preview = preview.transpose(Image.Transpose[ORIENTATION_TRANSPOSE[orientation]])
+
+            buffer = io.BytesIO()
+            preview.save(buffer, format="JPEG", quality=PLACEHOLDER_QUALITY, optimize=True)
+        encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+        return width, height, f"data:image/jpeg;base64,{encoded}"
+    except (UnidentifiedImageError, OSError, ValueError) as e:
+        logger.warning("Could not read image metadata: %s", e)
+        return EMPTY_METADATA
+    finally:
+        try:
+            fileobj.seek(0)
+        except (OSError, ValueError):
+            pass
+
+
+def field_file_metadata(field_file, force=False):
+    """
+    Metadata for a model ``FieldFile``.
+
+    Returns ``None`` when nothing needs to change: the file is already stored
+    and ``force`` is not set, so existing rows are never re-decoded on save.
+    """
+    if not field_file:
+        return EMPTY_METADATA
+    if getattr(field_file, "_committed", True) and not force:
+        return None
+    if getattr(field_file, "_committed", True):
+        field_file.open("rb")
+        try:
+            return read_image_metadata(field_file.file)
+        finally:
+            field_file.close()
+    return read_image_metadata(field_file.file)
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from api.cache import bump_version
+from api.changes import BLOG
+from api.edge import BLOGS, purge_keys
+from api.models import Blog, BlogBlock
+
+
+class Command(BaseCommand):
+    help = 'Compute word count, reading time, media counts and thumbnail of blogs from their blocks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Blogs loaded and updated per batch')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        blocks = Prefetch(
+            "blocks",
+            queryset=BlogBlock.objects.only(
+                "blog", "type", "content", "media_file", "media_width", "media_height", "media_placeholder", "order"
+            ),
+        )
+        ids = list(Blog.objects.order_by("pk").values_list("pk", flat=True))
+
+        updated = 0
+        for start in range(0, len(ids), batch_size):
+            blogs = Blog.objects.filter(pk__in=ids[start:start + batch_size]).only("pk", *Blog.BLOCK_SUMMARY_FIELDS)
+            changed = []
+            for blog in blogs.prefetch_related(blocks):
+                before = {name: getattr(blog, name) for name in Blog.BLOCK_SUMMARY_FIELDS}
+                after = blog.apply_block_summary(blog.blocks.all())
+                if any(before[name] != value for name, value in after.items()):
+                    # Cards and published files are keyed on updated_at
+                    blog.updated_at = timezone.now()
+                    changed.append(blog)
+            Blog.objects.bulk_update(changed, [*Blog.BLOCK_SUMMARY_FIELDS, "updated_at"])
+            updated += len(changed)
+
+        if updated:
+            bump_version(BLOG)
+            purge_keys([BLOGS])
+        self.stdout.write(self.style.SUCCESS(f'✅ Blog summaries: {updated} of {len(ids)} blogs updated'))
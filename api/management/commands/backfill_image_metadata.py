@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from api.images import field_file_metadata
+from api.models import Resume, SliderGallery, Blog, BlogBlock
+
+# (model, file field, metadata prefix, extra filter)
+IMAGE_FIELDS = [
+    (Resume, "profile_image", "profile_image", Q()),
+    (SliderGallery, "image", "image", Q()),
+    (Blog, "cover_image", "cover_image", Q()),
+    (BlogBlock, "media_file", "media", Q(type=BlogBlock.IMAGE)),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compute image dimensions and placeholders for rows uploaded before they were stored'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Recompute rows that already have metadata')
+        parser.add_argument('--batch-size', type=int, default=200, help='Rows fetched per query')
+
+    def handle(self, *args, **options):
+        force = options['force']
+        batch_size = options['batch_size']
+
+        for model, field_name, prefix, extra in IMAGE_FIELDS:
+            queryset = (
+                model.objects.filter(extra)
+                .exclude(Q(**{f"{field_name}__isnull": True}) | Q(**{field_name: ""}))
+                .only("pk", field_name)
+            )
+            if not force:
+                queryset = queryset.filter(**{f"{prefix}_width__isnull": True})
+
+            updated = failed = 0
+            for obj in queryset.iterator(chunk_size=batch_size):
+                try:
+                    width, height, placeholder = field_file_metadata(getattr(obj, field_name), force=True)
+                except Exception as e:
+                    self.stdout.write(self.style.WARNING(f'⚠️  {model.__name__} {obj.pk}: {e}'))
+                    failed += 1
+                    continue
+                if width is None:
+                    failed += 1
+                    continue
+                # update() instead of save() so model save hooks (old-file cleanup) never run
+                model.objects.filter(pk=obj.pk).update(**{
+                    f"{prefix}_width": width,
+                    f"{prefix}_height": height,
+                    f"{prefix}_placeholder": placeholder,
+                })
+                updated += 1
+
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ {model.__name__}.{field_name}: {updated} updated, {failed} skipped')
+            )
@@ -0,0 +1,113 @@
+import copy
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from api.benchmarks import percentile
+from api.models import Blog
+from backend.database import POOL_MODES, configure_pooling
+
+
+class Command(BaseCommand):
+    help = 'Compare request latency with and without database connection pooling under concurrent load'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', default=','.join(POOL_MODES),
+                            help=f'Comma separated pool modes to compare ({", ".join(POOL_MODES)})')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client threads')
+        parser.add_argument('--requests', type=int, default=400, help='Simulated requests per mode')
+        parser.add_argument('--pool-size', type=int, default=None,
+                            help='Pool max size for "pool" mode (default: concurrency)')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        unknown = set(modes) - set(POOL_MODES)
+        if unknown:
+            raise CommandError(f'Unknown modes: {", ".join(sorted(unknown))}')
+
+        concurrency = options['concurrency']
+        pool_size = options['pool_size'] or concurrency
+        base = copy.deepcopy(settings.DATABASES[DEFAULT_DB_ALIAS])
+        base.get('OPTIONS', {}).pop('pool', None)
+
+        results = []
+        for mode in modes:
+            alias = f'bench_{mode}'
+            database = configure_pooling(
+                copy.deepcopy(base), mode,
+                max_connections=pool_size, workers=1, threads=concurrency,
+                min_size=pool_size, max_age=600,
+            )
+            connections.settings[alias] = connections.configure_settings(
+                {DEFAULT_DB_ALIAS: copy.deepcopy(base), alias: database}
+            )[alias]
+            self.opened = set()
+            self.lock = threading.Lock()
+            try:
+                results.append(self.run_mode(mode, alias, concurrency, options['requests']))
+            finally:
+                self.close_all(alias)
+                del connections.settings[alias]
+
+        report = {
+            'engine': base.get('ENGINE'),
+            'concurrency': concurrency,
+            'requests': options['requests'],
+            'results': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+        self.stdout.write(output)
+
+    def simulate_request(self, alias):
+        """One request's worth of DB work, then the request_finished cleanup."""
+        with self.lock:
+            self.opened.add(connections[alias])
+        started = time.perf_counter()
+        list(Blog.objects.using(alias).only('id', 'title', 'created_at').order_by('-created_at')[:10])
+        # What django.db.close_old_connections does at the end of each request:
+        # closes (mode=off), keeps (persistent) or returns to the pool (pool)
+        connections[alias].close_if_unusable_or_obsolete()
+        return (time.perf_counter() - started) * 1000
+
+    def run_mode(self, mode, alias, concurrency, total):
+        # Warm-up: the first query per thread/pool includes one-time setup
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(lambda _: self.simulate_request(alias), range(concurrency)))
+            started = time.perf_counter()
+            latencies = list(executor.map(lambda _: self.simulate_request(alias), range(total)))
+            elapsed = time.perf_counter() - started
+
+        return {
+            'mode': mode,
+            'pooled': bool(connections.settings[alias]['OPTIONS'].get('pool')),
+            'conn_max_age': connections.settings[alias]['CONN_MAX_AGE'],
+            'throughput_rps': round(total / elapsed, 1),
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'max_ms': round(max(latencies), 3),
+        }
+
+    def close_all(self, alias):
+        # Wrappers are thread-local; allow closing the workers' ones from here
+        pool_owner = None
+        for connection in self.opened:
+            connection.inc_thread_sharing()
+            try:
+                connection.close()
+            finally:
+                connection.dec_thread_sharing()
+            pool_owner = connection
+        if pool_owner is not None and getattr(pool_owner, 'pool', None):
+            pool_owner.close_pool()
@@ -0,0 +1,237 @@
+import json
+import platform
+import time
+import tracemalloc
+from collections import Counter
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.client import MULTIPART_CONTENT, BOUNDARY, encode_multipart
+from django.utils import timezone
+
+from api.benchmarks import generate_portfolio, summarize
+from api.models import Blog, Resume
+from api.timing import instrument
+from backend.views import CustomTokenObtainPairSerializer
+
+# Isolated from the deployment: files stay in memory, every read hits the
+# test database directly and the Mongo mirror / Server-Timing sampling / page
+# view counting are off.
+BENCHMARK_SETTINGS = {
+    'STORAGES': {
+        'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    'DATABASE_ROUTERS': [],
+    'READ_BACKEND': 'orm',
+    'MONGODB_MIRROR': False,
+    'SERVER_TIMING': {'SAMPLE_RATE': 0.0},
+    'PAGE_VIEWS': {'ENABLED': False},
+}
+
+ENDPOINTS = (
+    'resume_detail', 'blog_list', 'blog_posts', 'blogs_by_category', 'blog_detail', 'portfolio',
+    'resume_update', 'blog_update',
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the API endpoints against a synthetic dataset in a throwaway test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resumes', type=int, default=1, help='Resumes (one staff user each)')
+        parser.add_argument('--experiences', type=int, default=10, help='Experiences per resume')
+        parser.add_argument('--skills', type=int, default=20, help='Tech skills per resume')
+        parser.add_argument('--gallery-images', type=int, default=6, help='Slider images per resume')
+        parser.add_argument('--blogs', type=int, default=2000, help='Blogs in total')
+        parser.add_argument('--blocks', type=int, default=8, help='Blocks per blog')
+        parser.add_argument('--tags', type=int, default=5, help='Tags per blog')
+        parser.add_argument('--comments', type=int, default=10, help='Comments per blog')
+        parser.add_argument('--categories', type=int, default=8, help='Distinct blog categories')
+        parser.add_argument('--iterations', type=int, default=20, help='Measured requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=2, help='Unmeasured requests per endpoint')
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                            help=f'Comma separated subset of: {", ".join(ENDPOINTS)}')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic data')
+        parser.add_argument('--label', default='', help='Free-form label stored in the report (e.g. a git sha)')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--compare', help='Previous JSON report; adds per-endpoint p95 deltas')
+
+    def handle(self, *args, **options):
+        endpoints = [name.strip() for name in options['endpoints'].split(',') if name.strip()]
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        scale = {key: options[key] for key in (
+            'resumes', 'experiences', 'skills', 'gallery_images', 'blogs', 'blocks', 'tags', 'comments', 'categories',
+        )}
+        with override_settings(**BENCHMARK_SETTINGS):
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                started = time.perf_counter()
+                dataset = generate_portfolio(seed=options['seed'], **scale)
+                self.stderr.write(f'Generated dataset in {time.perf_counter() - started:.1f}s')
+                results = [
+                    self.measure(name, dataset, options['iterations'], options['warmup'])
+                    for name in endpoints
+                ]
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {
+            'label': options['label'],
+            'created_at': timezone.now().isoformat(),
+            'engine': connection.settings_dict.get('ENGINE'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'scale': scale,
+            'iterations': options['iterations'],
+            'results': results,
+        }
+        if options['compare']:
+            report['compare'] = self.compare(options['compare'], results)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+        self.stdout.write(output)
+
+    def request_for(self, name, dataset):
+        """(method, path, kwargs, needs_auth) for one endpoint."""
+        resume_id = dataset['resume_ids'][0]
+        blog_id = dataset['blog_id']
+        if name == 'resume_detail':
+            return 'get', f'/api/resumes/{resume_id}/', {}, False
+        if name == 'blog_list':
+            return 'get', '/api/blogs/', {}, False
+        if name == 'blog_posts':
+            return 'get', '/api/blog-posts/', {}, False
+        if name == 'blogs_by_category':
+            return 'get', '/api/blogs/category/', {'data': {'category': dataset['categories'][0]}}, False
+        if name == 'blog_detail':
+            return 'get', f'/api/blog-post/{blog_id}/', {}, False
+        if name == 'portfolio':
+            return 'get', f'/api/portfolio/{resume_id}/', {}, False
+        if name == 'resume_update':
+            return 'put', f'/api/resumes/{resume_id}/', self.resume_payload(resume_id), True
+        return 'put', f'/api/blog-post/{blog_id}/', self.blog_payload(blog_id), True
+
+    def resume_payload(self, resume_id):
+        # What the edit form submits: every collection as JSON, gallery kept as-is
+        resume = Resume.objects.get(pk=resume_id)
+
+        def rows(manager, *fields):
+            return json.dumps([
+                {field: value.isoformat() if hasattr(value, 'isoformat') else value
+                 for field, value in zip(fields, row)}
+                for row in manager.values_list(*fields)
+            ])
+
+        data = {
+            'name': resume.name, 'title': resume.title, 'email': resume.email,
+            'phone_number': resume.phone_number, 'location': resume.location, 'bio': resume.bio,
+            'experiences': rows(resume.experiences, 'title', 'company', 'start_date', 'end_date',
+                                'description', 'achievements'),
+            'certifications': rows(resume.certifications, 'title', 'issuer', 'date', 'link', 'skills'),
+            'education': rows(resume.education, 'degree', 'institution', 'university', 'year', 'grade',
+                              'description'),
+            'tech_skills': rows(resume.tech_skills, 'name', 'level'),
+            'soft_skills': rows(resume.soft_skills, 'name', 'icon'),
+            'hobbies': rows(resume.hobbies, 'name', 'icon', 'description'),
+            'slider_gallery_urls': [gallery.image.url for gallery in resume.gallery.all()],
+        }
+        return {'data': encode_multipart(BOUNDARY, data), 'content_type': MULTIPART_CONTENT}
+
+    def blog_payload(self, blog_id):
+        blog = Blog.objects.get(pk=blog_id)
+        blocks = [
+            {'id': str(block.pk), 'type': block.type, 'content': block.content}
+            for block in blog.blocks.all()
+        ]
+        # Multipart like the editor: blocks and tags travel as JSON strings
+        data = {
+            'user': str(blog.user_id), 'title': blog.title, 'description': blog.description,
+            'category': blog.category, 'tags': json.dumps(blog.tags), 'blocks': json.dumps(blocks),
+        }
+        return {'data': encode_multipart(BOUNDARY, data), 'content_type': MULTIPART_CONTENT}
+
+    def client_for(self, needs_auth, dataset):
+        if not needs_auth:
+            return Client()
+        token = CustomTokenObtainPairSerializer.get_token(dataset['users'][0]).access_token
+        return Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def measure(self, name, dataset, iterations, warmup):
+        method, path, kwargs, needs_auth = self.request_for(name, dataset)
+        client = self.client_for(needs_auth, dataset)
+        send = getattr(client, method)
+
+        statuses = Counter()
+        for _ in range(warmup):
+            statuses[send(path, **kwargs).status_code] += 1
+
+        latencies, queries, repeated, db_ms = [], [], [], []
+        for _ in range(iterations):
+            with instrument() as timings:
+                started = time.perf_counter()
+                response = send(path, **kwargs)
+                latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] += 1
+            queries.append(timings.query_count)
+            repeated.append(timings.repeated_queries)
+            db_ms.append(timings.db_ms)
+
+        # Separate pass: tracing allocations slows requests down several times
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            statuses[send(path, **kwargs).status_code] += 1
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        failed = {code: count for code, count in statuses.items() if code >= 400}
+        if failed:
+            # stdout carries only the JSON report
+            self.stderr.write(self.style.WARNING(f'⚠️ {name}: error responses {failed}'))
+        else:
+            self.stderr.write(self.style.SUCCESS(f'✅ {name}: p95 {summarize(latencies)["p95_ms"]} ms'))
+
+        return {
+            'endpoint': name,
+            'method': method.upper(),
+            'path': path,
+            **summarize(latencies),
+            'queries': max(queries),
+            'repeated_queries': max(repeated),
+            'db_mean_ms': round(sum(db_ms) / len(db_ms), 3),
+            'peak_memory_kb': round(peak / 1024, 1),
+            'status_codes': {str(code): count for code, count in sorted(statuses.items())},
+        }
+
+    def compare(self, path, results):
+        try:
+            with open(path) as f:
+                previous = {row['endpoint']: row for row in json.load(f)['results']}
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'Cannot read --compare report {path}: {e}')
+
+        deltas = {}
+        for row in results:
+            before = previous.get(row['endpoint'])
+            if not before or not before.get('p95_ms'):
+                continue
+            deltas[row['endpoint']] = {
+                'p95_ms_before': before['p95_ms'],
+                'p95_ms_after': row['p95_ms'],
+                'p95_change_pct': round((row['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100, 1),
+                'queries_before': before.get('queries'),
+                'queries_after': row['queries'],
+            }
+        return deltas
@@ -0,0 +1,168 @@
+import re
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+
+from api.benchmarks import generate_portfolio
+from api.management.commands.benchmark_endpoints import BENCHMARK_SETTINGS
+from api.models import Blog, Resume
+
+# Caching off: every request runs the queries it would run on a cache miss
+EXPLAIN_SETTINGS = {
+    **BENCHMARK_SETTINGS,
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+}
+
+ENDPOINTS = (
+    'resume_detail', 'resume_section', 'blog_list', 'blog_posts', 'blogs_by_category', 'blog_detail',
+    'blog_archive', 'portfolio', 'top_posts',
+)
+
+# Plan lines that read a whole table (or walk a whole index) / sort rows
+SQLITE_SCAN = re.compile(r'^SCAN (\w+)\b')
+SQLITE_SORT = re.compile(r'USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY')
+POSTGRES_SCAN = re.compile(r'Seq Scan on (\w+)')
+POSTGRES_SORT = re.compile(r'->\s+Sort |^Sort ')
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN every query of the public read endpoints and report full table scans and sorts "
+        "that an index should have answered"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--existing', action='store_true',
+                            help='Use the configured database and its data instead of a throwaway test database')
+        parser.add_argument('--blogs', type=int, default=2000, help='Blogs in the synthetic dataset')
+        parser.add_argument('--blocks', type=int, default=8, help='Blocks per blog in the synthetic dataset')
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                            help=f'Comma separated subset of: {", ".join(ENDPOINTS)}')
+        parser.add_argument('--fail-on-scan', action='store_true', help='Exit with an error when a scan is found')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'EXPLAIN parsing is implemented for SQLite and PostgreSQL, not {connection.vendor}')
+        endpoints = [name.strip() for name in options['endpoints'].split(',') if name.strip()]
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+
+        with override_settings(**EXPLAIN_SETTINGS):
+            if options['existing']:
+                findings = self.explain_all(endpoints, self.existing_dataset())
+            else:
+                old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+                try:
+                    dataset = generate_portfolio(blogs=options['blogs'], blocks=options['blocks'])
+                    self.analyze()
+                    findings = self.explain_all(endpoints, dataset)
+                finally:
+                    connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if not findings:
+            self.stdout.write(self.style.SUCCESS(f'✅ No unindexed scans or sorts in {len(endpoints)} endpoints'))
+            return
+        summary = '\n'.join(f'  {endpoint}: {finding}' for endpoint, finding in findings)
+        if options['fail_on_scan']:
+            raise CommandError(f'{len(findings)} unindexed scans or sorts:\n{summary}')
+        self.stdout.write(self.style.WARNING(f'⚠️  {len(findings)} unindexed scans or sorts:\n{summary}'))
+
+    def existing_dataset(self):
+        resume_id = Resume.objects.values_list('pk', flat=True).first()
+        blog = Blog.objects.values_list('pk', 'category').first()
+        if resume_id is None or blog is None:
+            raise CommandError('--existing needs at least one resume and one blog')
+        return {'resume_ids': [resume_id], 'blog_id': blog[0], 'categories': [blog[1]]}
+
+    def analyze(self):
+        # Planner statistics, as a production database would have them. Not on
+        # SQLite: without statistics it takes any usable index, which is what
+        # enable_seqscan = off does on PostgreSQL (on a one-user dataset the
+        # statistics make every index on user_id/resume_id look useless).
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+    def path_for(self, name, dataset):
+        resume_id = dataset['resume_ids'][0]
+        blog_id = dataset['blog_id']
+        # Other case than stored: the lookup is case-insensitive
+        category = dataset['categories'][0].upper()
+        return {
+            'resume_detail': f'/api/resumes/{resume_id}/',
+            'resume_section': f'/api/resumes/{resume_id}/experiences/',
+            'blog_list': '/api/blogs/',
+            'blog_posts': '/api/blog-posts/',
+            'blogs_by_category': f'/api/blogs/category/?category={category}',
+            'blog_detail': f'/api/blog-post/{blog_id}/?include=related',
+            'blog_archive': '/api/blogs/archive/',
+            'portfolio': f'/api/portfolio/{resume_id}/',
+            'top_posts': '/api/analytics/top-posts/',
+        }[name]
+
+    def explain_all(self, endpoints, dataset):
+        client = Client()
+        findings = []
+        for name in endpoints:
+            path = self.path_for(name, dataset)
+            with self.recorded() as queries:
+                status = client.get(path).status_code
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{name}: GET {path} -> {status}, {len(queries)} queries'))
+            for sql, params in dict.fromkeys(queries):
+                plan = self.explain(sql, params)
+                self.stdout.write(f'  {sql[:200]}{"..." if len(sql) > 200 else ""}')
+                for line in plan:
+                    self.stdout.write(f'      {line}')
+                for finding in self.problems(sql, plan):
+                    findings.append((name, finding))
+                    self.stdout.write(self.style.WARNING(f'    ⚠️  {finding}'))
+        return findings
+
+    @contextmanager
+    def recorded(self):
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            if not many and sql.lstrip().upper().startswith('SELECT'):
+                queries.append((sql, tuple(params or ())))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            yield queries
+
+    def explain(self, sql, params):
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                depth = {0: -1}
+                lines = []
+                for node, parent, _, detail in cursor.fetchall():
+                    depth[node] = depth.get(parent, -1) + 1
+                    lines.append(f'{"  " * depth[node]}{detail}')
+                return lines
+            # Seq scans off: one still in the plan means no index could serve the query
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}', params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def problems(self, sql, plan):
+        """
+        Scans of a whole table by a query that selects rows (WHERE/LIMIT), and
+        sorts feeding a LIMIT. Full reads without either (every blog, every
+        archive row) are scans by design, and no index orders aggregates.
+        """
+        upper = sql.upper()
+        selective = ' WHERE ' in upper or ' LIMIT ' in upper
+        sorted_rows = ' LIMIT ' in upper and ' GROUP BY ' not in upper
+        scan, sort = (SQLITE_SCAN, SQLITE_SORT) if connection.vendor == 'sqlite' else (POSTGRES_SCAN, POSTGRES_SORT)
+        found = []
+        for line in plan:
+            match = scan.search(line.strip())
+            if match and selective:
+                found.append(f'full scan of {match.group(1)}')
+            elif sort.search(line.strip()) and sorted_rows:
+                found.append('sort without an index before LIMIT')
+        return found
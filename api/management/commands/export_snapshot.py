@@ -0,0 +1,29 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.snapshot import export_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Export public content into the read-only SQLite snapshot bundled with the deploy'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', type=str, help='Snapshot file (default: SNAPSHOT_DATABASE_PATH)')
+        parser.add_argument('--database', type=str, default='default', help='Database to export from')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        path = options['output'] or str(settings.SNAPSHOT_DATABASE_PATH)
+        started = time.perf_counter()
+        counts = export_snapshot(path, using=options['database'], batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+
+        for label, count in counts.items():
+            self.stdout.write(f'  {label}: {count}')
+        size_kb = os.path.getsize(path) / 1024
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Snapshot written to {path} ({size_kb:.0f} KB in {elapsed:.2f}s)')
+        )
@@ -0,0 +1,45 @@
+import gzip
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.portability import import_lines
+
+
+class Command(BaseCommand):
+    help = 'Import a JSON Lines export (export_portfolio) with batched bulk inserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Export file ("-" = stdin, *.gz = gzip)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Records per bulk insert / transaction')
+        parser.add_argument('--replace', action='store_true',
+                            help='Replace resumes/blogs that already exist (default: skip them)')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if path == '-':
+            stream = sys.stdin
+        elif path.endswith('.gz'):
+            stream = gzip.open(path, 'rt', encoding='utf-8')
+        else:
+            stream = open(path, encoding='utf-8')
+
+        started = time.perf_counter()
+        try:
+            counts = import_lines(stream, batch_size=options['batch_size'], replace=options['replace'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Imported {counts['users']} users, {counts['resumes']} resumes, {counts['blogs']} blogs "
+            f"({counts['skipped']} existing skipped) in {time.perf_counter() - started:.2f}s"
+        ))
+        if getattr(settings, 'MONGODB_MIRROR', False) and counts['blogs']:
+            self.stdout.write(self.style.WARNING(
+                '⚠️ Bulk inserts bypass the Mongo mirror; run `manage.py sync_mongo_mirror`'
+            ))
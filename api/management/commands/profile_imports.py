@@ -0,0 +1,118 @@
+import json
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a fresh serverless worker does before it can answer the first request:
+# configure Django, build the WSGI handler (loads middleware) and resolve URLs
+# (imports every view/serializer module).
+COLD_START_SNIPPET = """
+import time
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print("COLD_START_MS=%.1f" % ((time.perf_counter() - started) * 1000))
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr):
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us, depth) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        # One leading space is always printed; nesting adds two per level
+        depth = max(len(indent) - 1, 0) // 2
+        rows.append((module, int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Profile cold-start import time (python -X importtime) and check it against a budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help='Number of modules to report')
+        parser.add_argument('--budget-ms', type=float, default=None,
+                            help='Fail when total cold-start time exceeds this (default: IMPORT_TIME_BUDGET_MS)')
+        parser.add_argument('--module-budget-ms', type=float, default=None,
+                            help='Fail when any single top-level import exceeds this')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        budget_ms = options['budget_ms']
+        if budget_ms is None:
+            budget_ms = getattr(settings, 'IMPORT_TIME_BUDGET_MS', None)
+        module_budget_ms = options['module_budget_ms']
+
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE, PYTHONDONTWRITEBYTECODE='')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', COLD_START_SNIPPET],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'Cold-start subprocess failed:\n{result.stderr[-2000:]}')
+
+        cold_start_ms = None
+        for line in result.stdout.splitlines():
+            if line.startswith('COLD_START_MS='):
+                cold_start_ms = float(line.split('=', 1)[1])
+
+        rows = parse_importtime(result.stderr)
+        # Top-level entries are what the entry point imported directly; their
+        # cumulative time already includes everything they pulled in.
+        top_level = sorted((row for row in rows if row[3] == 0), key=lambda row: row[2], reverse=True)
+        packages = {}
+        for module, self_us, _, _ in rows:
+            root = module.split('.')[0]
+            packages[root] = packages.get(root, 0) + self_us
+        import_ms = sum(row[2] for row in top_level) / 1000
+
+        report = {
+            'cold_start_ms': cold_start_ms,
+            'import_ms': round(import_ms, 1),
+            'budget_ms': budget_ms,
+            'modules': [
+                {'module': module, 'cumulative_ms': round(cumulative_us / 1000, 1), 'self_ms': round(self_us / 1000, 1)}
+                for module, self_us, cumulative_us, _ in top_level[:options['top']]
+            ],
+            'packages': [
+                {'package': package, 'self_ms': round(self_us / 1000, 1)}
+                for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:options['top']]
+            ],
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.stdout.write(f'Cold start: {cold_start_ms} ms (imports: {report["import_ms"]} ms)')
+            self.stdout.write('\nSlowest top-level imports (cumulative ms):')
+            for entry in report['modules']:
+                self.stdout.write(f'  {entry["cumulative_ms"]:>9.1f}  {entry["module"]}')
+            self.stdout.write('\nSlowest packages (self ms, all submodules):')
+            for entry in report['packages']:
+                self.stdout.write(f'  {entry["self_ms"]:>9.1f}  {entry["package"]}')
+
+        failures = []
+        total_ms = cold_start_ms if cold_start_ms is not None else import_ms
+        if budget_ms and total_ms > budget_ms:
+            failures.append(f'cold start {total_ms:.1f} ms exceeds budget {budget_ms:.1f} ms')
+        if module_budget_ms:
+            for module, _, cumulative_us, _ in top_level:
+                if cumulative_us / 1000 > module_budget_ms:
+                    failures.append(f'{module} takes {cumulative_us / 1000:.1f} ms (budget {module_budget_ms:.1f} ms)')
+        if failures:
+            raise CommandError('Import-time budget exceeded: ' + '; '.join(failures))
+        self.stdout.write(self.style.SUCCESS('✅ Import-time budget OK'))
@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.publish import publish_static
+
+
+class Command(BaseCommand):
+    help = 'Render every public API response to content-hashed JSON files plus a manifest, for static hosting'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=str(settings.BASE_DIR / 'static-api'), help='Output directory')
+        parser.add_argument('--base-url', default='http://localhost',
+                            help='Public URL of the API (host of absolute media URLs)')
+        parser.add_argument('--incremental', action='store_true',
+                            help='Only re-render what changed since the last publish to --output')
+        parser.add_argument('--batch-size', type=int, default=200, help='Objects rendered per query batch')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = publish_static(
+            options['output'], options['base_url'], options['incremental'], options['batch_size']
+        )
+        elapsed = time.perf_counter() - started
+        if counts['failed']:
+            self.stdout.write(self.style.WARNING(f"⚠️  {counts['failed']} pages did not render (non-200)"))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Published to {options['output']} in {elapsed:.1f}s: {counts['rendered']} rendered, "
+            f"{counts['unchanged']} unchanged, {counts['removed']} files removed"
+        ))
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.purge import purge_content
+
+
+class Command(BaseCommand):
+    help = 'Delete users with their resumes, blogs and uploaded files, table by table (see api/purge.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='emails', metavar='EMAIL',
+                            help='Only purge this user (repeatable); default: everything')
+        parser.add_argument('--keep-media', action='store_true', help='Leave uploaded files in storage')
+        parser.add_argument('--batch-size', type=int, default=100, help='Files deleted per storage call')
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive',
+                            help='Do not ask for confirmation')
+
+    def handle(self, *args, **options):
+        users = None
+        if options['emails']:
+            users = get_user_model().objects.filter(email__in=options['emails'])
+            missing = set(options['emails']) - set(users.values_list('email', flat=True))
+            if missing:
+                raise CommandError(f"Unknown users: {', '.join(sorted(missing))}")
+
+        if options['interactive']:
+            target = ', '.join(options['emails']) if users is not None else 'ALL users, resumes and blogs'
+            answer = input(f'This permanently deletes {target}. Type "yes" to continue: ')
+            if answer != 'yes':
+                raise CommandError('Purge cancelled.')
+
+        report = purge_content(
+            users, delete_media=not options['keep_media'], wait=True, file_batch_size=options['batch_size']
+        )
+        for label, count in sorted(report['deleted'].items()):
+            self.stdout.write(f'  {label}: {count}')
+        if not options['keep_media']:
+            self.stdout.write(
+                f"  files: {report['files_deleted']} of {report['files']} deleted, "
+                f"{report['files_missing']} already gone"
+            )
+            if report['files_failed']:
+                self.stdout.write(self.style.WARNING(f"⚠️  {report['files_failed']} files could not be deleted"))
+        timings = ', '.join(f'{phase} {seconds:.2f}s' for phase, seconds in report['timings'].items())
+        self.stdout.write(self.style.SUCCESS(f'✅ Purged {sum(report["deleted"].values())} rows ({timings})'))
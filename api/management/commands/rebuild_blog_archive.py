@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api.archive import rebuild_archive
+from api.cache import bump_version
+from api.changes import BLOG
+from api.edge import BLOGS, purge_keys
+
+
+class Command(BaseCommand):
+    help = 'Recount the blog archive (posts per month, category and tag) from the blog table'
+
+    def handle(self, *args, **options):
+        rows = rebuild_archive()
+        bump_version(BLOG)
+        purge_keys([BLOGS])
+        self.stdout.write(self.style.SUCCESS(f'✅ Blog archive rebuilt: {rows} rows'))
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.edge import BLOGS, purge_keys
+from api.related import rebuild_related
+
+
+class Command(BaseCommand):
+    help = 'Recompute the precomputed related posts of every blog (see api/related.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        blogs, links = rebuild_related(batch_size=options['batch_size'])
+        purge_keys([BLOGS])
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {links} related posts for {blogs} blogs in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from api import mirror
+from api.models import Resume, Blog
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the MongoDB read model (embedded resumes and blogs) from the relational database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prune', action='store_true', help='Delete documents whose rows no longer exist')
+
+    def handle(self, *args, **options):
+        from api.documents import BlogDocument, ResumeDocument
+
+        resume_ids = [str(pk) for pk in Resume.objects.values_list('pk', flat=True)]
+        for resume_id in resume_ids:
+            mirror.sync_resume(resume_id)
+        self.stdout.write(self.style.SUCCESS(f'✅ Mirrored {len(resume_ids)} resumes'))
+
+        blog_ids = [str(pk) for pk in Blog.objects.values_list('pk', flat=True)]
+        for blog_id in blog_ids:
+            mirror.sync_blog(blog_id)
+        self.stdout.write(self.style.SUCCESS(f'✅ Mirrored {len(blog_ids)} blogs'))
+
+        if options['prune']:
+            stale_resumes = ResumeDocument.objects(pk__nin=resume_ids).delete()
+            stale_blogs = BlogDocument.objects(pk__nin=blog_ids).delete()
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  Pruned {stale_resumes} resume and {stale_blogs} blog documents'
+            ))
@@ -1,4 +1,7 @@
 from django.contrib.auth.models import  BaseUserManager
+from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Upper
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password, **extra_fields):
@@ -21,3 +24,9 @@ class CustomUserManager(BaseUserManager):
             raise ValueError('Superuser must have is_superuser=True.')
 
         return self.create_user(email, password, **extra_fields)
+
+
+class BlogQuerySet(models.QuerySet):
+    def in_category(self, category):
+        """Case-insensitive category match, written so the blog_category_key index serves it."""
+        return self.alias(category_key=Upper("category")).filter(category_key=Upper(Value(category)))
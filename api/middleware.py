@@ -0,0 +1,297 @@
+import json
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .changes import acollect_changes, collect_changes
+from .compression import compressed_cache, compression_settings, is_compressible, negotiate
+from .edge import apply_edge_headers
+from .health import API_ROOT_PAYLOAD, HEALTH_PAYLOAD, deep_health, wants_deep
+from .routers import primary_reads, remember_write, writer_cache_key, wrote_recently
+from .timing import format_log_fields, instrument, log_fields, server_timing_header, should_sample, timed, timing_settings
+
+timing_logger = logging.getLogger("api.timing")
+
+HEALTH_PATH = "/api/health/"
+API_ROOT_PATH = "/api/"
+
+
+def encode(payload):
+    # Same compact encoding DRF's JSONRenderer produces
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class HybridMiddleware:
+    """
+    Base for middleware that runs natively under both WSGI and ASGI.
+
+    Under ASGI Django would otherwise run a sync-only middleware (and so the
+    rest of the request) in a thread, which is exactly what the async read
+    views avoid. Subclasses implement ``__call__`` and an ``__acall__`` twin;
+    ``__call__`` must start with ``if self.async_mode: return self.__acall__(request)``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+
+class FastPathMiddleware(HybridMiddleware):
+    """
+    Answer ``GET/HEAD /api/health/`` and ``/api/`` before the rest of the stack.
+
+    Uptime monitors poll these constantly and the responses never change, so
+    they are encoded once at startup and served without sessions, CSRF, JWT
+    authentication or DRF content negotiation. Keep this first in MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.bodies = {
+            HEALTH_PATH: encode(HEALTH_PAYLOAD),
+            API_ROOT_PATH: encode(API_ROOT_PAYLOAD),
+        }
+        self.cors = getattr(settings, "CORS_ALLOW_ALL_ORIGINS", False)
+
+    def handles(self, request):
+        return request.method in ("GET", "HEAD") and request.path_info in self.bodies
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.handles(request):
+            return self.get_response(request)
+        if request.path_info == HEALTH_PATH and wants_deep(request):
+            return self.respond(request, deep_health.report())
+        return self.respond(request)
+
+    async def __acall__(self, request):
+        if not self.handles(request):
+            return await self.get_response(request)
+        if request.path_info == HEALTH_PATH and wants_deep(request):
+            # The probes query the database, Mongo and the cache
+            return self.respond(request, await sync_to_async(deep_health.report)())
+        return self.respond(request)
+
+    def respond(self, request, report=None):
+        status = 200
+        if report is not None:
+            body = encode(report)
+            status = 200 if report["status"] == "healthy" else 503
+        else:
+            body = self.bodies[request.path_info]
+
+        response = HttpResponse(
+            b"" if request.method == "HEAD" else body,
+            status=status,
+            content_type="application/json",
+        )
+        response["Content-Length"] = str(len(body))
+        response["Cache-Control"] = "no-cache"
+        response["X-Content-Type-Options"] = "nosniff"
+        if self.cors:
+            response["Access-Control-Allow-Origin"] = "*"
+        return response
+
+
+class ReadOnlyMiddleware(HybridMiddleware):
+    """
+    503 for POST/PUT/PATCH/DELETE when the deploy only has the read-only
+    snapshot (``SNAPSHOT_READ_ONLY``). Removed from the stack otherwise.
+    """
+
+    BODY = encode({
+        "status": "error",
+        "message": "This deployment is read-only; writes and logins are unavailable.",
+    })
+
+    def __init__(self, get_response):
+        if not getattr(settings, "SNAPSHOT_READ_ONLY", False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if request.method in PrimaryReadMiddleware.SAFE_METHODS:
+            return self.get_response(request)
+        return self.refuse()
+
+    async def __acall__(self, request):
+        if request.method in PrimaryReadMiddleware.SAFE_METHODS:
+            return await self.get_response(request)
+        return self.refuse()
+
+    def refuse(self):
+        response = HttpResponse(self.BODY, status=503, content_type="application/json")
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+class ServerTimingMiddleware(HybridMiddleware):
+    """
+    Report query count, DB time and timed phases of sampled requests.
+
+    Sampled requests (``SERVER_TIMING["SAMPLE_RATE"]``, or any request sending
+    ``X-Server-Timing: <TOKEN>``) get a ``Server-Timing`` header and one
+    logfmt line on the ``api.timing`` logger. Unsampled requests pay a single
+    random() call.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        options = timing_settings()
+        if not should_sample(request, options):
+            return self.get_response(request)
+
+        with instrument() as timings:
+            response = self.get_response(request)
+        return self.report(request, response, timings, options)
+
+    async def __acall__(self, request):
+        options = timing_settings()
+        if not should_sample(request, options):
+            return await self.get_response(request)
+
+        with instrument() as timings:
+            response = await self.get_response(request)
+        return self.report(request, response, timings, options)
+
+    def report(self, request, response, timings, options):
+        if options["HEADER"]:
+            response["Server-Timing"] = server_timing_header(timings)
+        if options["LOG"]:
+            timing_logger.info(format_log_fields(log_fields(request, response, timings)))
+        return response
+
+
+class CompressionMiddleware(HybridMiddleware):
+    """
+    gzip/brotli response compression with a cache of compressed variants.
+
+    Only JSON bodies of at least ``COMPRESSION["MIN_SIZE"]`` bytes are
+    considered. Every such response gets ``Vary: Accept-Encoding`` because
+    its representation depends on that header, even when the client did not
+    accept any encoding.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or not is_compressible(response)
+            or len(response.content) < compression_settings()["MIN_SIZE"]
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        with timed("compress"):
+            compressed = compressed_cache.get_or_compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        # The bytes differ per encoding, so a strong ETag would be wrong
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
+
+
+class EdgeCacheMiddleware(HybridMiddleware):
+    """
+    ``Cache-Control`` and ``Surrogate-Key`` on successful anonymous GETs of
+    the public read endpoints, so a CDN can cache them until a write purges
+    their keys (api/edge.py).
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return apply_edge_headers(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return apply_edge_headers(request, await self.get_response(request))
+
+
+class PrimaryReadMiddleware(HybridMiddleware):
+    """
+    Pin every read of an unsafe request (POST/PUT/PATCH/DELETE) to the primary.
+
+    Routers only offload reads of GET/HEAD/OPTIONS requests, so an update
+    never loads the row it is about to overwrite from a snapshot or replica.
+    After a successful write the editor's own GETs stay on the primary for
+    a few seconds too, so they read their write back despite replica lag.
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if request.method in self.SAFE_METHODS and not wrote_recently(request):
+            return self.get_response(request)
+        with primary_reads():
+            response = self.get_response(request)
+        if request.method not in self.SAFE_METHODS and response.status_code < 400:
+            remember_write(request)
+        return response
+
+    async def __acall__(self, request):
+        # Anonymous reads carry no credential and never touch the cache
+        if request.method in self.SAFE_METHODS and not (
+            writer_cache_key(request) and await sync_to_async(wrote_recently)(request)
+        ):
+            return await self.get_response(request)
+        with primary_reads():
+            response = await self.get_response(request)
+        if request.method not in self.SAFE_METHODS and response.status_code < 400:
+            await sync_to_async(remember_write)(request)
+        return response
+
+
+class ContentChangeMiddleware(HybridMiddleware):
+    """
+    Coalesce ``mark_changed()`` calls made while handling a request.
+
+    Subscribers of ``content_changed`` (read model, caches) then run once per
+    touched resume/blog after the request's writes, instead of once per row.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if request.method in PrimaryReadMiddleware.SAFE_METHODS:
+            return self.get_response(request)
+        with collect_changes():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.method in PrimaryReadMiddleware.SAFE_METHODS:
+            return await self.get_response(request)
+        async with acollect_changes():
+            return await self.get_response(request)
@@ -0,0 +1,67 @@
+# Generated by Django 5.2 on 2026-10-19 11:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='certification',
+            options={'ordering': ['order', 'id']},
+        ),
+        migrations.AlterModelOptions(
+            name='education',
+            options={'ordering': ['order', 'id']},
+        ),
+        migrations.AlterModelOptions(
+            name='experience',
+            options={'ordering': ['order', 'id']},
+        ),
+        migrations.AlterModelOptions(
+            name='hobby',
+            options={'ordering': ['order', 'id']},
+        ),
+        migrations.AlterModelOptions(
+            name='softskill',
+            options={'ordering': ['order', 'id']},
+        ),
+        migrations.AlterModelOptions(
+            name='techskill',
+            options={'ordering': ['order', 'id']},
+        ),
+        migrations.AddField(
+            model_name='certification',
+            name='order',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='education',
+            name='order',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='order',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='hobby',
+            name='order',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='softskill',
+            name='order',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='techskill',
+            name='order',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
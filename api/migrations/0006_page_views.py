@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_section_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageViewDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=10)),
+                ('object_id', models.UUIDField()),
+                ('day', models.DateField()),
+                ('views', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'day'], name='page_view_kind_day')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id', 'day'), name='unique_page_view_day')],
+            },
+        ),
+    ]
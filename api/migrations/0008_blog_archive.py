@@ -0,0 +1,48 @@
+# Generated by Django 5.2 on 2026-10-19 12:11
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def count_existing_blogs(apps, schema_editor):
+    # Same keys as api.archive.archive_keys() at the time of writing
+    Blog = apps.get_model('api', 'Blog')
+    BlogArchiveCount = apps.get_model('api', 'BlogArchiveCount')
+    db_alias = schema_editor.connection.alias
+    counts = Counter()
+    for created_at, category, tags in Blog.objects.using(db_alias).values_list('created_at', 'category', 'tags').iterator():
+        keys = {('month', timezone.localtime(created_at).strftime('%Y-%m'))} if created_at else set()
+        if category:
+            keys.add(('category', category[:255]))
+        if isinstance(tags, list):
+            keys.update(('tag', str(tag)[:255]) for tag in tags if str(tag).strip())
+        counts.update(keys)
+    BlogArchiveCount.objects.using(db_alias).bulk_create(
+        [BlogArchiveCount(dimension=dimension, value=value, count=count) for (dimension, value), count in counts.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_related_posts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogArchiveCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('month', 'Month'), ('category', 'Category'), ('tag', 'Tag')], max_length=10)),
+                ('value', models.CharField(max_length=255)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'value'), name='unique_blog_archive_value')],
+            },
+        ),
+        migrations.RunPython(count_existing_blogs, migrations.RunPython.noop),
+    ]
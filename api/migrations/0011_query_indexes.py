@@ -0,0 +1,98 @@
+# Generated by Django 5.2 on 2026-10-19 12:41
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_blog_block_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['created_at', 'id'], name='blog_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(django.db.models.functions.text.Upper('category'), models.F('created_at'), name='blog_category_key'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['user', 'created_at'], name='blog_user_created'),
+        ),
+        migrations.AddIndex(
+            model_name='blogblock',
+            index=models.Index(fields=['blog', 'order'], name='blog_block_order'),
+        ),
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['resume', 'order', 'id'], name='certification_resume_order'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['resume', 'order', 'id'], name='education_resume_order'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['resume', 'order', 'id'], name='experience_resume_order'),
+        ),
+        migrations.AddIndex(
+            model_name='hobby',
+            index=models.Index(fields=['resume', 'order', 'id'], name='hobby_resume_order'),
+        ),
+        migrations.AddIndex(
+            model_name='softskill',
+            index=models.Index(fields=['resume', 'order', 'id'], name='softskill_resume_order'),
+        ),
+        migrations.AddIndex(
+            model_name='techskill',
+            index=models.Index(fields=['resume', 'order', 'id'], name='techskill_resume_order'),
+        ),
+        # After the composite indexes exist: they lead with the foreign key
+        migrations.AlterField(
+            model_name='blog',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='blogs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='blogblock',
+            name='blog',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='blocks', to='api.blog'),
+        ),
+        migrations.AlterField(
+            model_name='certification',
+            name='resume',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='certifications', to='api.resume'),
+        ),
+        migrations.AlterField(
+            model_name='education',
+            name='resume',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='education', to='api.resume'),
+        ),
+        migrations.AlterField(
+            model_name='experience',
+            name='resume',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='experiences', to='api.resume'),
+        ),
+        migrations.AlterField(
+            model_name='hobby',
+            name='resume',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='hobbies', to='api.resume'),
+        ),
+        migrations.AlterField(
+            model_name='softskill',
+            name='resume',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='soft_skills', to='api.resume'),
+        ),
+        migrations.AlterField(
+            model_name='techskill',
+            name='resume',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tech_skills', to='api.resume'),
+        ),
+    ]
@@ -0,0 +1,143 @@
+"""
+Keeps the MongoDB read model (api/documents.py) in sync with ORM writes.
+
+Receives ``content_changed`` (api/changes.py) after each committed write and
+re-renders the affected resume or blog with its serializer. mongoengine is
+only imported once mirroring or Mongo reads are actually used.
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from .changes import BLOG, RESUME
+from .routers import primary_reads
+
+logger = logging.getLogger(__name__)
+
+
+def mirror_enabled():
+    return getattr(settings, "MONGODB_MIRROR", False)
+
+
+def read_from_mongo():
+    return getattr(settings, "READ_BACKEND", "orm") == "mongo"
+
+
+def plain(data):
+    # UUIDs, datetimes and Decimals exactly as the API renders them
+    return json.loads(JSONRenderer().render(data))
+
+
+def sync_resume(resume_id):
+    from .documents import ResumeDocument, build_document
+    from .models import Resume
+    from .mongo import get_connection
+    from .serializers import RESUME_PREFETCH, ResumeSerializer
+
+    get_connection()
+    with primary_reads():
+        resume = Resume.objects.prefetch_related(*RESUME_PREFETCH).filter(pk=resume_id).first()
+        if resume is None:
+            ResumeDocument.objects(pk=str(resume_id)).delete()
+            return
+        data = plain(ResumeSerializer(resume).data)
+    build_document(ResumeDocument, str(resume_id), data, timezone.now()).save()
+
+
+def sync_blog(blog_id):
+    from .documents import BlogDocument, build_document
+    from .models import Blog
+    from .mongo import get_connection
+    from .serializers import BLOG_PREFETCH, BlogSerializer
+
+    get_connection()
+    with primary_reads():
+        blog = Blog.objects.prefetch_related(*BLOG_PREFETCH).filter(pk=blog_id).first()
+        if blog is None:
+            BlogDocument.objects(pk=str(blog_id)).delete()
+            return
+        data = plain(BlogSerializer(blog).data)
+    build_document(BlogDocument, str(blog_id), data, timezone.now()).save()
+
+
+def delete_document(kind, object_id):
+    from .documents import BlogDocument, ResumeDocument
+    from .mongo import get_connection
+
+    get_connection()
+    document_class = ResumeDocument if kind == RESUME else BlogDocument
+    document_class.objects(pk=str(object_id)).delete()
+
+
+def delete_documents(kind, object_ids=None):
+    """Remove the documents of ``object_ids`` (all of ``kind`` when None) in one call."""
+    from .documents import BlogDocument, ResumeDocument
+    from .mongo import get_connection
+
+    get_connection()
+    document_class = ResumeDocument if kind == RESUME else BlogDocument
+    documents = document_class.objects if object_ids is None else document_class.objects(pk__in=[str(pk) for pk in object_ids])
+    return documents.delete()
+
+
+def content_changed_receiver(sender, object_id, deleted, **kwargs):
+    if not mirror_enabled():
+        return
+    if deleted:
+        delete_document(sender, object_id)
+    elif sender == RESUME:
+        sync_resume(object_id)
+    elif sender == BLOG:
+        sync_blog(object_id)
+
+
+def absolute(request, url):
+    return request.build_absolute_uri(url) if request and url else url
+
+
+def get_resume(resume_id, request=None):
+    """Embedded resume as the detail endpoint returns it, or None (missing or Mongo down)."""
+    from .documents import ResumeDocument, document_to_api
+    from .mongo import get_connection
+
+    try:
+        get_connection()
+        document = ResumeDocument.objects(pk=str(resume_id)).first()
+    except Exception as e:
+        logger.warning("Mongo resume read failed, falling back to the ORM: %s", e)
+        return None
+    if document is None:
+        return None
+
+    data = document_to_api(document)
+    data["profile_image"] = absolute(request, data.get("profile_image"))
+    for image in data.get("slider_gallery", []):
+        image["image"] = absolute(request, image.get("image"))
+    return data
+
+
+def get_blog(blog_id, request=None):
+    """Blog with ordered blocks as the detail endpoint returns it, or None."""
+    from .documents import BlogDocument, document_to_api
+    from .mongo import get_connection
+
+    try:
+        get_connection()
+        document = BlogDocument.objects(pk=str(blog_id)).first()
+    except Exception as e:
+        logger.warning("Mongo blog read failed, falling back to the ORM: %s", e)
+        return None
+    if document is None:
+        return None
+
+    data = document_to_api(document)
+    data["cover_image"] = absolute(request, data.get("cover_image"))
+    for block in data.get("blocks", []):
+        if block.get("media_file"):
+            block["media_file"] = absolute(request, block["media_file"])
+            if block.get("type") in ("image", "video"):
+                block["content"] = block["media_file"]
+    return data
@@ -1,11 +1,29 @@
+import logging
 import uuid
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
-from django.db import models
+from django.db import models, router
+from django.db.models.functions import Upper
 from django.utils import timezone
+from django.utils.html import strip_tags
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 from datetime import datetime
-from .managers import CustomUserManager
+from .managers import BlogQuerySet, CustomUserManager
+from .images import field_file_metadata
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_image_metadata(instance, field_name, prefix, force=False):
+    """Store width/height/placeholder for ``field_name`` on ``{prefix}_*`` fields."""
+    metadata = field_file_metadata(getattr(instance, field_name), force=force)
+    if metadata is None:
+        return False
+    width, height, placeholder = metadata
+    setattr(instance, f"{prefix}_width", width)
+    setattr(instance, f"{prefix}_height", height)
+    setattr(instance, f"{prefix}_placeholder", placeholder)
+    return True
 
 class CustomUser(AbstractBaseUser, PermissionsMixin):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -19,6 +37,11 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     objects = CustomUserManager()
 
+    class Meta:
+        # Admin search (email__startswith): the unique index can't serve LIKE 'x%'
+        # on PostgreSQL outside the C locale, a pattern_ops index can
+        indexes = [models.Index(fields=["email"], opclasses=["varchar_pattern_ops"], name="user_email_prefix")]
+
     # def __str__(self):
     #     return self.email
 
@@ -36,12 +59,23 @@ class Resume(models.Model):
     title = models.CharField(max_length=255)
     bio = models.TextField()
     profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True)
+    profile_image_width = models.PositiveIntegerField(blank=True, null=True)
+    profile_image_height = models.PositiveIntegerField(blank=True, null=True)
+    profile_image_placeholder = models.TextField(blank=True, default="")
+    # Also touched when a child row changes (api/signals.py)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Admin search (name__startswith, also from the section admins)
+        indexes = [models.Index(fields=["name"], opclasses=["varchar_pattern_ops"], name="resume_name_prefix")]
 
     def save(self, *args, **kwargs):
-        print(f"Storage backend: {self.profile_image.storage.__class__.__name__}")
+        logger.debug("Storage backend: %s", self.profile_image.storage.__class__.__name__)
+        refresh_image_metadata(self, "profile_image", "profile_image")
         if self.pk:
             try:
-                old_resume = Resume.objects.get(pk=self.pk)
+                # Compare against the row being overwritten, never a replica/snapshot copy
+                old_resume = Resume.objects.db_manager(router.db_for_write(Resume, instance=self)).get(pk=self.pk)
                 if old_resume.profile_image and self.profile_image != old_resume.profile_image:
                     old_resume.profile_image.delete(save=False)
             except Resume.DoesNotExist:
@@ -54,7 +88,7 @@ class Resume(models.Model):
 
 class Experience(models.Model):
     resume = models.ForeignKey(
-        Resume, on_delete=models.CASCADE, related_name="experiences"
+        Resume, on_delete=models.CASCADE, related_name="experiences", db_index=False
     )
     title = models.CharField(max_length=255)
     company = models.CharField(max_length=255)
@@ -62,6 +96,12 @@ class Experience(models.Model):
     end_date = models.DateField(blank=True, null=True)  # Allow ongoing experiences
     description = models.TextField()
     achievements = models.JSONField(default=list)  # Store as a list of achievements
+    order = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["order", "id"]
+        # Sections are read per resume, in order; also serves the foreign key
+        indexes = [models.Index(fields=["resume", "order", "id"], name="experience_resume_order")]
 
     def __str__(self):
         return f"{self.title} at {self.company}"
@@ -69,13 +109,19 @@ class Experience(models.Model):
 
 class Certification(models.Model):
     resume = models.ForeignKey(
-        Resume, on_delete=models.CASCADE, related_name="certifications"
+        Resume, on_delete=models.CASCADE, related_name="certifications", db_index=False
     )
     title = models.CharField(max_length=255)
     issuer = models.CharField(max_length=255)
     date = models.DateField()
     link = models.URLField(blank=True, null=True)
     skills = models.JSONField(default=list)
+    order = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["order", "id"]
+        # Sections are read per resume, in order; also serves the foreign key
+        indexes = [models.Index(fields=["resume", "order", "id"], name="certification_resume_order")]
 
     def __str__(self):
         return self.title
@@ -96,7 +142,7 @@ class Project(models.Model):
 
 class Education(models.Model):
     resume = models.ForeignKey(
-        Resume, on_delete=models.CASCADE, related_name="education"
+        Resume, on_delete=models.CASCADE, related_name="education", db_index=False
     )
     degree = models.CharField(max_length=255)
     institution = models.CharField(max_length=255)
@@ -104,6 +150,12 @@ class Education(models.Model):
     year = models.CharField(max_length=4)  # e.g., "2025"
     grade = models.CharField(max_length=50, blank=True, null=True)
     description = models.TextField(blank=True, null=True)
+    order = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["order", "id"]
+        # Sections are read per resume, in order; also serves the foreign key
+        indexes = [models.Index(fields=["resume", "order", "id"], name="education_resume_order")]
 
     def __str__(self):
         return f"{self.degree} from {self.institution}"
@@ -111,10 +163,16 @@ class Education(models.Model):
 
 class TechSkill(models.Model):
     resume = models.ForeignKey(
-        Resume, on_delete=models.CASCADE, related_name="tech_skills"
+        Resume, on_delete=models.CASCADE, related_name="tech_skills", db_index=False
     )
     name = models.CharField(max_length=100)
     level = models.PositiveIntegerField()  # Assume 1-10 scale for skill level
+    order = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["order", "id"]
+        # Sections are read per resume, in order; also serves the foreign key
+        indexes = [models.Index(fields=["resume", "order", "id"], name="techskill_resume_order")]
 
     def __str__(self):
         return self.name
@@ -122,10 +180,16 @@ class TechSkill(models.Model):
 
 class SoftSkill(models.Model):
     resume = models.ForeignKey(
-        Resume, on_delete=models.CASCADE, related_name="soft_skills"
+        Resume, on_delete=models.CASCADE, related_name="soft_skills", db_index=False
     )
     name = models.CharField(max_length=100)
     icon = models.CharField(max_length=255)  # Store an icon name or URL
+    order = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["order", "id"]
+        # Sections are read per resume, in order; also serves the foreign key
+        indexes = [models.Index(fields=["resume", "order", "id"], name="softskill_resume_order")]
 
     def __str__(self):
         return self.name
@@ -133,11 +197,17 @@ class SoftSkill(models.Model):
 
 class Hobby(models.Model):
     resume = models.ForeignKey(
-        Resume, on_delete=models.CASCADE, related_name="hobbies"
+        Resume, on_delete=models.CASCADE, related_name="hobbies", db_index=False
     )
     name = models.CharField(max_length=100)
     icon = models.CharField(max_length=255)  # Store an icon name or URL
     description = models.TextField(blank=True, null=True)
+    order = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["order", "id"]
+        # Sections are read per resume, in order; also serves the foreign key
+        indexes = [models.Index(fields=["resume", "order", "id"], name="hobby_resume_order")]
 
     def __str__(self):
         return self.name
@@ -147,32 +217,93 @@ class SliderGallery(models.Model):
         Resume, on_delete=models.CASCADE, related_name="gallery"
     )
     image = models.ImageField(upload_to="resume_gallery/", max_length=500)
+    image_width = models.PositiveIntegerField(blank=True, null=True)
+    image_height = models.PositiveIntegerField(blank=True, null=True)
+    image_placeholder = models.TextField(blank=True, default="")
     # caption = models.CharField(max_length=255, blank=True, null=True)  # Optional caption
 
+    def save(self, *args, **kwargs):
+        refresh_image_metadata(self, "image", "image")
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Image for {self.resume.name}'s Resume"
 
 class Blog(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="blogs")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="blogs", db_index=False)
     title = models.CharField(max_length=255)
     description = models.TextField()
     category = models.CharField(max_length=100)
     cover_image = models.ImageField(upload_to="blog_covers/", blank=True, null=True)
+    cover_image_width = models.PositiveIntegerField(blank=True, null=True)
+    cover_image_height = models.PositiveIntegerField(blank=True, null=True)
+    cover_image_placeholder = models.TextField(blank=True, default="")
     tags = models.JSONField(default=list)
     resource_link = models.URLField(blank=True, null=True)
     deployed_link = models.URLField(blank=True, null=True)
     likes_count = models.PositiveIntegerField(default=0)
     comments = models.JSONField(default=list)
+    # Summary of the blocks, so cards never load them (apply_block_summary())
+    word_count = models.PositiveIntegerField(default=0)
+    reading_time = models.PositiveSmallIntegerField(default=0)  # minutes
+    image_count = models.PositiveSmallIntegerField(default=0)
+    video_count = models.PositiveSmallIntegerField(default=0)
+    thumbnail = models.FileField(blank=True, null=True, editable=False)  # first image block's file
+    thumbnail_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    thumbnail_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    thumbnail_placeholder = models.TextField(blank=True, default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BlogQuerySet.as_manager()
+
+    WORDS_PER_MINUTE = 200
+    BLOCK_SUMMARY_FIELDS = [
+        "word_count", "reading_time", "image_count", "video_count",
+        "thumbnail", "thumbnail_width", "thumbnail_height", "thumbnail_placeholder",
+    ]
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Every listing is newest first
+            models.Index(fields=["created_at", "id"], name="blog_created_id"),
+            # /api/blogs/category/ (BlogQuerySet.in_category), newest first
+            models.Index(Upper("category"), "created_at", name="blog_category_key"),
+            # An author's posts (portfolio cards and category counts), newest first
+            models.Index(fields=["user", "created_at"], name="blog_user_created"),
+            # Admin search (title__startswith, also from the block admin)
+            models.Index(fields=["title"], opclasses=["varchar_pattern_ops"], name="blog_title_prefix"),
+        ]
+
+    def apply_block_summary(self, blocks):
+        """Set the block summary fields from ``blocks`` (in display order); returns them as a dict."""
+        blocks = sorted(blocks, key=lambda block: block.order)
+        words = sum(
+            len((strip_tags(block.content) if "<" in block.content else block.content).split())
+            for block in blocks if block.type == BlogBlock.TEXT and block.content
+        )
+        images = [block for block in blocks if block.type == BlogBlock.IMAGE]
+        first_image = next((block for block in images if block.media_file), None)
+        values = {
+            "word_count": words,
+            "reading_time": -(-words // self.WORDS_PER_MINUTE),
+            "image_count": len(images),
+            "video_count": sum(1 for block in blocks if block.type == BlogBlock.VIDEO),
+            "thumbnail": first_image.media_file.name if first_image else "",
+            "thumbnail_width": first_image.media_width if first_image else None,
+            "thumbnail_height": first_image.media_height if first_image else None,
+            "thumbnail_placeholder": first_image.media_placeholder if first_image else "",
+        }
+        for name, value in values.items():
+            setattr(self, name, value)
+        return values
 
     def save(self, *args, **kwargs):
+        refresh_image_metadata(self, "cover_image", "cover_image")
         try:
-            old_blog = Blog.objects.get(pk=self.pk)
+            old_blog = Blog.objects.db_manager(router.db_for_write(Blog, instance=self)).get(pk=self.pk)
             if old_blog.cover_image and self.cover_image != old_blog.cover_image:
                 old_blog.cover_image.delete(save=False)
         except Blog.DoesNotExist:
@@ -191,16 +322,33 @@ class BlogBlock(models.Model):
     BLOCK_TYPES = [(TEXT, "Text"), (IMAGE, "Image"), (VIDEO, "Video")]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="blocks")
+    # Indexed by blog_block_order (blog first)
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="blocks", db_index=False)
     type = models.CharField(max_length=10, choices=BLOCK_TYPES)
     content = models.TextField(blank=True, null=True)
     media_file = models.FileField(upload_to="blog_media/", blank=True, null=True)
+    media_width = models.PositiveIntegerField(blank=True, null=True)
+    media_height = models.PositiveIntegerField(blank=True, null=True)
+    media_placeholder = models.TextField(blank=True, default="")
     order = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["order"]
+        # Blocks are read per blog, in order
+        indexes = [models.Index(fields=["blog", "order"], name="blog_block_order")]
+
+    def refresh_media_metadata(self, force=False):
+        # Only image blocks get dimensions/placeholders; video files are never decoded
+        if self.type != self.IMAGE:
+            self.media_width, self.media_height, self.media_placeholder = None, None, ""
+            return True
+        return refresh_image_metadata(self, "media_file", "media", force=force)
+
+    def save(self, *args, **kwargs):
+        self.refresh_media_metadata()
+        super().save(*args, **kwargs)
 
     def delete(self, *args, **kwargs):
         if self.media_file:
@@ -210,4 +358,61 @@ class BlogBlock(models.Model):
     def __str__(self):
         return f"{self.type} Block - {self.blog.title} (Order: {self.order})"
 
-        
\ No newline at end of file
+        
+
+
+class RelatedPost(models.Model):
+    """One precomputed "related post" of a blog, best first (api/related.py)."""
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="related_links")
+    related = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ["rank"]
+        # Also the index behind ?include=related: one range scan per blog
+        constraints = [
+            models.UniqueConstraint(fields=["blog", "rank"], name="unique_related_post_rank"),
+        ]
+
+    def __str__(self):
+        return f"{self.blog_id} -> {self.related_id} ({self.score:.2f})"
+
+
+class BlogArchiveCount(models.Model):
+    """Posts per month, category or tag, kept up to date on every blog write (api/archive.py)."""
+    MONTH = "month"
+    CATEGORY = "category"
+    TAG = "tag"
+
+    DIMENSIONS = [(MONTH, "Month"), (CATEGORY, "Category"), (TAG, "Tag")]
+
+    dimension = models.CharField(max_length=10, choices=DIMENSIONS)
+    value = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "value"], name="unique_blog_archive_value"),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension} {self.value}: {self.count}"
+
+
+class PageViewDaily(models.Model):
+    """Views of one resume or blog on one day (UTC), written in batches by api/analytics.py."""
+    kind = models.CharField(max_length=10)  # api.changes.RESUME / BLOG
+    # No foreign key: counts are upserted blindly and outlive deleted posts
+    object_id = models.UUIDField()
+    day = models.DateField()
+    views = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id", "day"], name="unique_page_view_day"),
+        ]
+        indexes = [models.Index(fields=["kind", "day"], name="page_view_kind_day")]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} on {self.day}: {self.views}"
@@ -0,0 +1,30 @@
+import threading
+
+from django.conf import settings
+
+_lock = threading.Lock()
+_connected = False
+
+
+def get_connection():
+    """
+    Return the mongoengine connection, opening it on first use.
+
+    settings.py only records ``MONGODB_SETTINGS``; importing mongoengine/pymongo
+    and the server handshake happen here, the first time Mongo is needed.
+    """
+    global _connected
+    import mongoengine
+
+    if not _connected:
+        with _lock:
+            if not _connected:
+                options = dict(settings.MONGODB_SETTINGS)
+                if getattr(settings, "MONGODB_MOCK", False):
+                    # In-process mongomock for tests and local runs without mongod
+                    import mongomock
+                    options = {"db": options["db"], "host": "mongodb://localhost",
+                               "mongo_client_class": mongomock.MongoClient}
+                mongoengine.connect(**options)
+                _connected = True
+    return mongoengine.get_connection()
@@ -0,0 +1,347 @@
+"""
+JSON Lines export/import of users, resumes (with children) and blogs (with blocks).
+
+One object per line, parents before the rows that reference them::
+
+    {"type": "header", "format": "portfolio-jsonl", "version": 1, ...}
+    {"type": "user", "id": "...", "email": "...", ...}
+    {"type": "resume", "user": "...", ..., "experiences": [...], "gallery": [...]}
+    {"type": "blog", "id": "...", "user": "...", ..., "blocks": [...]}
+
+Files are stored by their storage name (e.g. ``blog_covers/x.jpg``), so an
+import points at the existing media instead of uploading it again. Both
+directions stream: export iterates in chunks with per-chunk prefetching,
+import inserts in batches with ``bulk_create``, one transaction per batch.
+"""
+import json
+from datetime import date, datetime
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DataError, IntegrityError, connections, router, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .archive import blogs_added
+from .cache import bump_version
+from .edge import BLOGS, purge_keys
+from .changes import BLOG, RESUME, mark_changed
+from .models import (
+    Resume, Experience, Certification, Project, Education, TechSkill, SoftSkill, Hobby, SliderGallery, Blog, BlogBlock
+)
+from .related import rebuild_related
+
+FORMAT = "portfolio-jsonl"
+VERSION = 1
+
+# related_name -> model, for every child collection of a resume
+RESUME_CHILDREN = {
+    "experiences": Experience,
+    "certifications": Certification,
+    "projects": Project,
+    "education": Education,
+    "tech_skills": TechSkill,
+    "soft_skills": SoftSkill,
+    "hobbies": Hobby,
+    "gallery": SliderGallery,
+}
+
+USER_FIELDS = ("id", "email", "is_active", "is_staff", "is_superuser")
+
+
+def columns(model, exclude=()):
+    """Field names for ``.values()``: FKs come out as the related id, files as their storage name."""
+    return [field.name for field in model._meta.concrete_fields if field.name not in exclude]
+
+
+def chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def dumps(data):
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":"))
+
+
+def export_rows(model, children, batch_size):
+    """
+    ``.values()`` rows of ``model`` with each child collection attached.
+
+    Plain dicts instead of model instances: building 100k+ instances only to
+    read their fields back would dominate the export. Children are fetched
+    one query per collection per chunk of parents (chunked prefetching).
+    """
+    pk_name = model._meta.pk.name
+    parents = model.objects.order_by("pk").values(*columns(model)).iterator(chunk_size=batch_size)
+    for chunk in chunks(parents, batch_size):
+        ids = [parent[pk_name] for parent in chunk]
+        attached = {}
+        for name, (child_model, fk_name, exclude) in children.items():
+            grouped = attached[name] = {}
+            queryset = child_model.objects.filter(**{f"{fk_name}__in": ids}).order_by(fk_name, *child_model._meta.ordering)
+            for child in queryset.values(fk_name, *columns(child_model, exclude=(fk_name, *exclude))).iterator(chunk_size=batch_size):
+                grouped.setdefault(child.pop(fk_name), []).append(child)
+        for parent, parent_id in zip(chunk, ids):
+            for name in children:
+                parent[name] = attached[name].get(parent_id, [])
+            yield parent
+
+
+def export_lines(batch_size=500, with_passwords=False, only=None):
+    """Yield the export one JSON line (without newline) at a time."""
+    yield dumps({"type": "header", "format": FORMAT, "version": VERSION, "exported_at": timezone.now()})
+
+    User = get_user_model()
+    user_fields = USER_FIELDS + (("password",) if with_passwords else ())
+    for user in User.objects.order_by("pk").values(*user_fields).iterator(chunk_size=batch_size):
+        yield dumps({"type": "user", **user})
+
+    if only in (None, "resumes"):
+        # Child ids are not exported: they are re-assigned on import
+        children = {name: (model, "resume", ("id",)) for name, model in RESUME_CHILDREN.items()}
+        for resume in export_rows(Resume, children, batch_size):
+            yield dumps({"type": "resume", **resume})
+
+    if only in (None, "blogs"):
+        for blog in export_rows(Blog, {"blocks": (BlogBlock, "blog", ())}, batch_size):
+            yield dumps({"type": "blog", **blog})
+
+
+def coerce(model, values):
+    """JSON values -> model field values (dates, datetimes; FKs by attname)."""
+    data = {}
+    for field in model._meta.concrete_fields:
+        if field.name not in values:
+            continue
+        value = values[field.name]
+        internal = field.get_internal_type()
+        if value is not None and internal == "DateTimeField" and not isinstance(value, datetime):
+            value = parse_datetime(value)
+        elif value is not None and internal == "DateField" and not isinstance(value, date):
+            value = parse_date(value)
+        data[field.attname if field.is_relation else field.name] = value
+    return data
+
+
+def timestamp_fields(model):
+    """The ``auto_now``/``auto_now_add`` fields, which ``bulk_create`` overwrites with "now"."""
+    return [
+        field for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+
+
+def take_timestamps(objs):
+    """``[(obj, {attname: value}), ...]`` for ``restore_timestamps``; call before the insert."""
+    return [
+        (obj, {field.attname: getattr(obj, field.attname) for field in timestamp_fields(type(obj))})
+        for obj in objs
+    ]
+
+
+def restore_timestamps(stamps, using=None):
+    """
+    Write the original timestamps over the "now" that ``auto_now``/
+    ``auto_now_add`` put in during ``bulk_create``.
+
+    ``stamps`` comes from ``take_timestamps``. A follow-up UPDATE, because
+    switching the flags off on the model fields would also drop the
+    timestamps of saves in other threads. One statement executed per row
+    (``executemany``): bulk_update's CASE per row is several times slower.
+    """
+    by_model = {}
+    for obj, values in stamps:
+        for attname, value in values.items():
+            setattr(obj, attname, value)
+        by_model.setdefault(type(obj), []).append(obj)
+    for model, objs in by_model.items():
+        fields = timestamp_fields(model)
+        if not fields:
+            continue
+        connection = connections[using or router.db_for_write(model)]
+        quote = connection.ops.quote_name
+        pk = model._meta.pk
+        assignments = ", ".join(f"{quote(field.column)} = %s" for field in fields)
+        sql = f"UPDATE {quote(model._meta.db_table)} SET {assignments} WHERE {quote(pk.column)} = %s"
+        params = [
+            [field.get_db_prep_value(getattr(obj, field.attname), connection) for field in fields]
+            + [pk.get_db_prep_value(obj.pk, connection)]
+            for obj in objs
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+
+
+class ImportBatchError(ValueError):
+    """A batch that could not be written; nothing of it was imported."""
+
+
+class PortfolioImporter:
+    """
+    Buffers parsed lines and writes them in dependency order, one batch per transaction.
+
+    Users are matched by email, so an export from another environment maps onto
+    the existing accounts. Resumes and blogs that already exist are skipped, or
+    deleted and re-inserted (children included) with ``replace=True``.
+    """
+
+    def __init__(self, batch_size=1000, replace=False):
+        self.batch_size = batch_size
+        self.replace = replace
+        self.user_ids = {}
+        self.unusable_password = make_password(None)
+        self.counts = {"users": 0, "resumes": 0, "blogs": 0, "skipped": 0}
+        self.imported_resumes = []
+        self.reset()
+
+    def reset(self):
+        self.users, self.resumes, self.blogs = [], [], []
+        self.lines = []
+
+    def add(self, data, line=None):
+        kind = data.pop("type", None)
+        if kind == "header":
+            if data.get("format") != FORMAT or data.get("version") != VERSION:
+                raise ValueError(f"Unsupported export format {data.get('format')!r} v{data.get('version')}")
+            return
+        if kind not in ("user", "resume", "blog"):
+            raise ValueError(f"Unknown line type {kind!r}")
+        getattr(self, f"{kind}s").append(data)
+        self.lines.append(line)
+        if len(self.users) + len(self.resumes) + len(self.blogs) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.lines:
+            return
+        try:
+            with transaction.atomic():
+                self.write_users()
+                self.write_resumes()
+                self.write_blogs()
+        except (IntegrityError, DataError, ValueError, KeyError, TypeError) as e:
+            # Rows are written per kind, not per line: name the whole batch
+            raise ImportBatchError(f"Lines {self.lines[0]}-{self.lines[-1]} (not imported): {e}") from e
+        self.reset()
+
+    def write_users(self):
+        if not self.users:
+            return
+        User = get_user_model()
+        existing = dict(
+            User.objects.filter(email__in=[user["email"] for user in self.users]).values_list("email", "pk")
+        )
+        new_users = []
+        for values in self.users:
+            if values["email"] in existing:
+                self.user_ids[str(values["id"])] = existing[values["email"]]
+                continue
+            user = User(**coerce(User, values))
+            if not values.get("password"):
+                user.password = self.unusable_password
+            self.user_ids[str(values["id"])] = user.pk
+            new_users.append(user)
+        User.objects.bulk_create(new_users, batch_size=self.batch_size)
+        self.counts["users"] += len(new_users)
+
+    def user_id(self, exported_id):
+        return self.user_ids.get(str(exported_id), exported_id)
+
+    def existing(self, model, ids):
+        found = set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+        if found and self.replace:
+            # Children go with the cascade; media files are left untouched
+            model.objects.filter(pk__in=found).delete()
+            return set()
+        return {str(pk) for pk in found}
+
+    def write_resumes(self):
+        if not self.resumes:
+            return
+        for values in self.resumes:
+            values["user"] = self.user_id(values["user"])
+        skip = self.existing(Resume, [values["user"] for values in self.resumes])
+
+        resumes, children = [], {name: [] for name in RESUME_CHILDREN}
+        for values in self.resumes:
+            if str(values["user"]) in skip:
+                self.counts["skipped"] += 1
+                continue
+            resumes.append(Resume(**coerce(Resume, values)))
+            for name, model in RESUME_CHILDREN.items():
+                children[name].extend(
+                    model(resume_id=values["user"], **coerce(model, item)) for item in values.get(name, [])
+                )
+        now = timezone.now()
+        for resume in resumes:
+            resume.updated_at = resume.updated_at or now
+        stamps = take_timestamps(resumes)
+        Resume.objects.bulk_create(resumes, batch_size=self.batch_size)
+        for name, model in RESUME_CHILDREN.items():
+            model.objects.bulk_create(children[name], batch_size=self.batch_size)
+        restore_timestamps(stamps)
+        self.counts["resumes"] += len(resumes)
+        self.imported_resumes.extend(resume.pk for resume in resumes)
+
+    def write_blogs(self):
+        if not self.blogs:
+            return
+        skip = self.existing(Blog, [values["id"] for values in self.blogs])
+
+        blogs, blocks = [], []
+        for values in self.blogs:
+            if str(values["id"]) in skip:
+                self.counts["skipped"] += 1
+                continue
+            values["user"] = self.user_id(values["user"])
+            blog = Blog(**coerce(Blog, values))
+            blog_blocks = [BlogBlock(blog_id=blog.pk, **coerce(BlogBlock, item)) for item in values.get("blocks", [])]
+            # Older exports lack the summary; recomputing also keeps it true to the blocks
+            blog.apply_block_summary(blog_blocks)
+            blogs.append(blog)
+            blocks.extend(blog_blocks)
+        now = timezone.now()
+        for obj in blogs + blocks:
+            # Older exports / hand-written lines may lack timestamps
+            obj.created_at = obj.created_at or now
+            obj.updated_at = obj.updated_at or obj.created_at
+        stamps = take_timestamps(blogs + blocks)
+        Blog.objects.bulk_create(blogs, batch_size=self.batch_size)
+        BlogBlock.objects.bulk_create(blocks, batch_size=self.batch_size)
+        restore_timestamps(stamps)
+        blogs_added(blogs)
+        self.counts["blogs"] += len(blogs)
+
+    def finish(self):
+        self.flush()
+        # bulk_create sends no post_save: refresh caches/read models explicitly
+        for resume_id in self.imported_resumes:
+            mark_changed(RESUME, resume_id)
+        if self.counts["blogs"]:
+            bump_version(BLOG)
+            rebuild_related()
+            purge_keys([BLOGS])
+        return self.counts
+
+
+def import_lines(lines, batch_size=1000, replace=False):
+    """Import an iterable of JSON lines; returns counts per kind."""
+    importer = PortfolioImporter(batch_size=batch_size, replace=replace)
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            importer.add(json.loads(line), number)
+        except ImportBatchError:
+            raise
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Line {number}: {e}") from e
+    return importer.finish()
@@ -0,0 +1,89 @@
+"""
+The first-paint bundle: resume, latest post cards and category facets.
+
+Built with a fixed set of queries (the resume with its prefetched children,
+one for the cards, one aggregate for the facets) and cached as a whole under
+the content versions of api/cache.py, so repeated page loads cost no query.
+"""
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.test import RequestFactory
+
+from . import mirror
+from .cache import content_versions
+from .changes import BLOG, RESUME
+from .models import Blog, Resume
+from .serializers import BlogPostSerializer, ResumeSerializer
+
+BUNDLE_DEFAULTS = {
+    "TTL": 300,
+    "POSTS": 6,
+    "MAX_POSTS": 50,
+    # Origin for absolute media URLs in the bundle ("https://example.com"); empty:
+    # URLs as the storage returns them (already absolute on Cloudinary)
+    "BASE_URL": "",
+}
+
+
+def bundle_settings():
+    return {**BUNDLE_DEFAULTS, **getattr(settings, "PORTFOLIO_BUNDLE", {})}
+
+
+def media_request(request):
+    """
+    The request the bundle is serialized with. Media URLs are made absolute
+    against BASE_URL, never the client's Host header: with ALLOWED_HOSTS =
+    ["*"] any Host is accepted, so a shared cached bundle must not depend on it.
+    """
+    base_url = bundle_settings()["BASE_URL"]
+    if not base_url:
+        return None
+    parts = urlsplit(base_url)
+    return RequestFactory().get(request.path, HTTP_HOST=parts.netloc, secure=parts.scheme == "https")
+
+
+def bundle_cache_key(resume_id, posts, selection):
+    resume_version, blogs_version = content_versions((RESUME, str(resume_id)), (BLOG, "*"))
+    return f"portfolio:{resume_id}:{posts}:{selection.cache_key}:{resume_version}:{blogs_version}"
+
+
+def resume_data(resume_id, request, selection):
+    if mirror.read_from_mongo():
+        data = mirror.get_resume(resume_id, request)
+        if data is not None:
+            return selection.prune(data)
+    resume = Resume.objects.prefetch_related(*selection.prefetch).filter(pk=resume_id).first()
+    if resume is None:
+        return None
+    serializer = ResumeSerializer(resume, context={"request": request}, fields=selection.fields)
+    return mirror.plain(serializer.data)
+
+
+def build_portfolio(resume_id, posts, request, selection):
+    """The bundle for ``resume_id``, or None if there is no such resume."""
+    resume = resume_data(resume_id, request, selection)
+    if resume is None:
+        return None
+
+    blogs = Blog.objects.filter(user_id=resume_id)
+    cards = blogs.only(*BlogPostSerializer.Meta.fields).order_by("-created_at")[:posts]
+    categories = blogs.values("category").annotate(count=Count("pk")).order_by("-count", "category")
+    return {
+        "resume": resume,
+        "posts": mirror.plain(BlogPostSerializer(cards, many=True, context={"request": request}).data),
+        "categories": list(categories),
+    }
+
+
+def get_portfolio(resume_id, posts, request, selection):
+    options = bundle_settings()
+    key = bundle_cache_key(resume_id, posts, selection)
+    bundle = cache.get(key)
+    if bundle is None:
+        bundle = build_portfolio(resume_id, posts, media_request(request), selection)
+        if bundle is not None:
+            cache.set(key, bundle, options["TTL"])
+    return bundle
@@ -0,0 +1,203 @@
+"""
+Static JSON publishing of the public read API (manage.py publish_static).
+
+Every public GET is rendered to a file with the API's own serializers,
+views and renderer, so a file holds exactly the body Django would return::
+
+    <output>/api/blog-post/<id>.<hash>.json
+    <output>/api/blogs/category/career.<hash>.json
+    <output>/manifest.json
+
+File names carry a hash of their content, so they can be served with an
+immutable cache header; only ``manifest.json`` (written last) needs a short
+TTL. It maps every API path to its file::
+
+    {"format": "portfolio-static", "version": 1, "published_at": "...", "base_url": "...",
+     "files": {"/api/blog-post/<id>/": {"file": "...", "hash": "...", "updated_at": "..."}}}
+
+With ``incremental=True`` resumes and blogs whose ``updated_at`` matches the
+previous manifest keep their file. List, category, archive and portfolio
+pages are rendered again only when a blog (or, for a portfolio, its resume)
+changed. Files no longer in the manifest are removed.
+"""
+import hashlib
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from django.test import RequestFactory
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework.renderers import JSONRenderer
+
+from .analytics import not_counted
+from .models import Blog, Resume
+from .portability import chunks
+from .serializers import BLOG_PREFETCH, RESUME_PREFETCH, BlogSerializer, ResumeSerializer
+
+FORMAT = "portfolio-static"
+VERSION = 1
+MANIFEST = "manifest.json"
+HASH_LENGTH = 16
+
+
+def file_stem(api_path):
+    """``/api/blog-post/<id>/`` -> ``api/blog-post/<id>``; a query string becomes the last segment."""
+    path, _, query = api_path.partition("?")
+    path = path.strip("/")
+    if query:
+        value = query.partition("=")[2]
+        path = f"{path}/{slugify(value) or hashlib.sha256(value.encode()).hexdigest()[:8]}"
+    return path
+
+
+def render_payload(data):
+    # What the views return: same envelope, same renderer
+    return JSONRenderer().render({"status": 200, "data": data})
+
+
+class StaticPublisher:
+    def __init__(self, output, base_url="http://localhost", incremental=False, batch_size=200):
+        self.output = Path(output)
+        self.base_url = base_url
+        parts = urlsplit(base_url)
+        # Media URLs are made absolute with the request's host
+        self.request_options = {"HTTP_HOST": parts.netloc or "localhost", "secure": parts.scheme == "https"}
+        self.batch_size = batch_size
+        # Files of the last publish: removed at the end unless still listed
+        self.published = self.load_manifest()
+        self.previous = self.published if incremental and self.compatible else {}
+        self.files = {}
+        self.counts = Counter()
+
+    def load_manifest(self):
+        self.compatible = False
+        try:
+            manifest = json.loads((self.output / MANIFEST).read_text())
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("format") != FORMAT or manifest.get("version") != VERSION:
+            return {}
+        # With another base URL every absolute media URL would differ
+        self.compatible = manifest.get("base_url") == self.base_url
+        return manifest.get("files", {})
+
+    def request(self, api_path):
+        return RequestFactory().get(api_path, **self.request_options)
+
+    def write(self, api_path, content, **meta):
+        digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+        name = f"{file_stem(api_path)}.{digest}.json"
+        target = self.output / name
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temporary = target.with_name(f".{target.name}.tmp")
+            temporary.write_bytes(content)
+            os.replace(temporary, target)
+        self.files[api_path] = {"file": name, "hash": digest, **meta}
+        self.counts["rendered"] += 1
+
+    def reuse(self, api_path, **meta):
+        entry = self.previous.get(api_path)
+        if entry is None or any(entry.get(key) != value for key, value in meta.items()):
+            return False
+        if not (self.output / entry["file"]).exists():
+            return False
+        self.files[api_path] = entry
+        self.counts["unchanged"] += 1
+        return True
+
+    def publish_view(self, api_path, view, **kwargs):
+        response = view(self.request(api_path), **kwargs)
+        response.render()
+        if response.status_code == 200:
+            self.write(api_path, response.content)
+        else:
+            self.counts["failed"] += 1
+
+    def publish_objects(self, queryset, path_format, serializer_class, prefetch):
+        """
+        Detail pages of ``queryset``, rendered in batches (one query per
+        relation per batch instead of per object); returns the ids that
+        were rendered or removed.
+        """
+        prefix = path_format.split("{", 1)[0]
+        stamps = {str(pk): stamp.isoformat() for pk, stamp in queryset.values_list("pk", "updated_at")}
+        changed = [pk for pk, stamp in stamps.items() if not self.reuse(path_format.format(pk=pk), updated_at=stamp)]
+        removed = [
+            path for path in self.previous
+            if path.startswith(prefix) and "?" not in path and path[len(prefix):].strip("/") not in stamps
+        ]
+
+        request = self.request(prefix)
+        for chunk in chunks(changed, self.batch_size):
+            objects = list(queryset.filter(pk__in=chunk).prefetch_related(*prefetch))
+            # many=True: the serializer fields are built once per batch, not per object
+            rendered = serializer_class(objects, many=True, context={"request": request}).data
+            for obj, data in zip(objects, rendered):
+                self.write(path_format.format(pk=obj.pk), render_payload(data), updated_at=stamps[str(obj.pk)])
+        return set(changed) | {path[len(prefix):].strip("/") for path in removed}
+
+    def publish(self):
+        from .views import BlogArchiveView, BlogByCategoryView, BlogListCreateView, BlogPostListView, PortfolioView
+
+        started = timezone.now()
+        with not_counted():
+            changed_resumes = self.publish_objects(
+                Resume.objects.all(), "/api/resumes/{pk}/", ResumeSerializer, RESUME_PREFETCH
+            )
+            blogs_changed = bool(self.publish_objects(
+                Blog.objects.all(), "/api/blog-post/{pk}/", BlogSerializer, BLOG_PREFETCH
+            ))
+
+            pages = [
+                ("/api/blogs/", BlogListCreateView.as_view(), {}),
+                ("/api/blog-posts/", BlogPostListView.as_view(), {}),
+                ("/api/blogs/archive/", BlogArchiveView.as_view(), {}),
+            ]
+            by_category = BlogByCategoryView.as_view()
+            categories = Blog.objects.order_by("category").values_list("category", flat=True).distinct()
+            pages += [(f"/api/blogs/category/?category={quote(category)}", by_category, {}) for category in categories]
+            for api_path, view, kwargs in pages:
+                if blogs_changed or not self.reuse(api_path):
+                    self.publish_view(api_path, view, **kwargs)
+
+            portfolio = PortfolioView.as_view()
+            for pk in Resume.objects.values_list("pk", flat=True):
+                api_path = f"/api/portfolio/{pk}/"
+                if blogs_changed or str(pk) in changed_resumes or not self.reuse(api_path):
+                    self.publish_view(api_path, portfolio, pk=pk)
+
+        self.write_manifest(started)
+        self.prune()
+        return self.counts
+
+    def write_manifest(self, published_at):
+        manifest = {
+            "format": FORMAT,
+            "version": VERSION,
+            "published_at": published_at.isoformat(),
+            "base_url": self.base_url,
+            "files": self.files,
+        }
+        self.output.mkdir(parents=True, exist_ok=True)
+        temporary = self.output / f".{MANIFEST}.tmp"
+        temporary.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+        os.replace(temporary, self.output / MANIFEST)
+
+    def prune(self):
+        """Remove the files of the previous manifest that the new one no longer lists."""
+        current = {entry["file"] for entry in self.files.values()}
+        for entry in self.published.values():
+            if entry["file"] not in current:
+                try:
+                    (self.output / entry["file"]).unlink()
+                    self.counts["removed"] += 1
+                except FileNotFoundError:
+                    pass
+
+
+def publish_static(output, base_url="http://localhost", incremental=False, batch_size=200):
+    return StaticPublisher(output, base_url, incremental, batch_size).publish()
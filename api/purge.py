@@ -0,0 +1,264 @@
+"""
+Bulk purge of users and everything they own (ClearDatabaseView,
+SetupAdminView, manage.py purge_content).
+
+``Model.objects.all().delete()`` makes Django's collector load every
+dependent row (blocks, experiences, gallery images...) into memory and send
+a signal per row. ``purge_content()`` walks the ``CASCADE`` graph from the
+user model instead and deletes table by table, children first, in one
+transaction:
+
+* everything: the backend's flush SQL (``TRUNCATE`` on PostgreSQL, ``DELETE
+  FROM`` on SQLite), derived tables (archive counts, page views) included;
+* some users: one ``DELETE ... WHERE <fk> IN (<subquery>)`` per table, then
+  the archive counts and the related-post lists of the remaining blogs are
+  adjusted.
+
+No per-row signal is sent, so what the receivers would have done happens
+once after commit: cache versions, user cache, Mongo mirror, CDN purge.
+Uploaded files are listed before the delete and removed from storage in
+batches after commit (``MediaCleanup``): on a background thread, or before
+the response where that thread would not survive it (``PURGE``).
+"""
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.color import no_style
+from django.db import connections, models, router, transaction
+
+from . import mirror
+from .archive import ARCHIVE_FIELDS, apply_counts, archive_keys
+from .authentication import user_cache
+from .cache import bump_version
+from .changes import BLOG, RESUME
+from .edge import BLOGS, purge_everything, purge_keys
+from .models import Blog, BlogArchiveCount, PageViewDaily, RelatedPost, Resume
+from .related import blog_index, refresh_related, schedule
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+# Rows derived from the content without a foreign key to it: emptied with
+# everything else. A partial purge fixes the archive counts and leaves page
+# views alone (they outlive deleted posts, see PageViewDaily).
+DERIVED_MODELS = (BlogArchiveCount, PageViewDaily)
+
+PURGE_DEFAULTS = {
+    # Serverless functions are frozen once they respond: delete files inline there
+    "BACKGROUND_MEDIA": True,
+}
+
+
+def purge_settings():
+    return {**PURGE_DEFAULTS, **getattr(settings, "PURGE", {})}
+
+
+def cascade_plan(model):
+    """
+    ``[(model, path), ...]``: every table a delete of ``model`` cascades to,
+    children before parents, ``model`` itself last. ``path`` is the chain of
+    foreign keys from that table back to ``model``.
+    """
+    plan = []
+
+    def visit(current, path):
+        # The relations Django's collector follows (Collector.collect)
+        for relation in current._meta.get_fields(include_hidden=True):
+            if not (relation.auto_created and not relation.concrete and (relation.one_to_many or relation.one_to_one)):
+                continue
+            if relation.on_delete is models.DO_NOTHING:
+                continue
+            if relation.on_delete is not models.CASCADE:
+                raise NotImplementedError(
+                    f"{relation.related_model._meta.label}.{relation.field.name}: only CASCADE can be purged in bulk"
+                )
+            visit(relation.related_model, [relation.field, *path])
+        plan.append((current, path))
+
+    visit(model, [])
+    return plan
+
+
+def reached(roots, path):
+    """The rows of the last model in ``path`` that belong to the ``roots`` queryset."""
+    queryset = roots
+    for field in reversed(path):
+        parents = queryset.values(field.target_field.attname)
+        queryset = field.model._base_manager.using(roots.db).filter(**{f"{field.name}__in": parents})
+    return queryset
+
+
+def file_names(queryset):
+    """``{storage: {name, ...}}`` for the files referenced by ``queryset``'s rows."""
+    files = defaultdict(set)
+    for field in queryset.model._meta.concrete_fields:
+        if isinstance(field, models.FileField):
+            names = queryset.exclude(**{f"{field.name}__isnull": True}).exclude(**{field.name: ""})
+            files[field.storage].update(names.values_list(field.name, flat=True))
+    return files
+
+
+class MediaCleanup:
+    """
+    Deletes purged files from storage in batches, on a background thread
+    or, with ``background=False``, in ``start()`` itself. Files the storage
+    no longer has are counted as ``missing``.
+    """
+
+    def __init__(self, files, batch_size=100, background=True):
+        self.files = {storage: sorted(names) for storage, names in files.items() if names}
+        self.batch_size = batch_size
+        self.background = background
+        self.deleted = 0
+        self.missing = 0
+        self.failed = 0
+        self.thread = None
+
+    def __len__(self):
+        return sum(len(names) for names in self.files.values())
+
+    def start(self):
+        if not self.files:
+            return
+        if self.background:
+            self.thread = threading.Thread(target=self.run, name="media-cleanup", daemon=True)
+            self.thread.start()
+        else:
+            self.run()
+
+    def run(self):
+        for storage, names in self.files.items():
+            # e.g. TimedMediaCloudinaryStorage.delete_many: one API call per batch
+            delete_many = getattr(storage, "delete_many", None)
+            for start in range(0, len(names), self.batch_size):
+                batch = names[start:start + self.batch_size]
+                if delete_many is not None:
+                    try:
+                        results = delete_many(batch)
+                    except Exception:
+                        logger.exception("Deleting %d purged files failed", len(batch))
+                        self.failed += len(batch)
+                        continue
+                    self.deleted += results["deleted"]
+                    self.missing += results["not_found"]
+                    failed = len(batch) - results["deleted"] - results["not_found"]
+                    if failed:
+                        logger.error("%d of %d purged files could not be deleted: %s", failed, len(batch), dict(results))
+                        self.failed += failed
+                    continue
+                for name in batch:
+                    try:
+                        storage.delete(name)
+                        self.deleted += 1
+                    except Exception:
+                        logger.exception("Deleting purged file %s failed", name)
+                        self.failed += 1
+
+    def wait(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+
+def invalidate(user_ids, resume_ids, blog_ids, everything):
+    """After commit: what the per-row signal receivers would have done, once."""
+    def forget_users():
+        for pk in user_ids:
+            user_cache.invalidate(str(pk), "deleted")
+
+    def bump_versions():
+        for pk in resume_ids:
+            bump_version(RESUME, str(pk))
+        bump_version(RESUME)
+        bump_version(BLOG)
+
+    def clear_mirror():
+        if mirror.mirror_enabled():
+            mirror.delete_documents(RESUME, None if everything else resume_ids)
+            mirror.delete_documents(BLOG, None if everything else blog_ids)
+
+    def purge_edge():
+        if everything:
+            purge_everything()
+        else:
+            keys = [f"{RESUME}:{pk}" for pk in resume_ids] + [f"{BLOG}:{pk}" for pk in blog_ids]
+            purge_keys(keys + [BLOGS] if blog_ids else keys)
+
+    for step in (forget_users, bump_versions, clear_mirror, purge_edge):
+        try:
+            step()
+        except Exception:
+            logger.exception("Purge: %s failed", step.__name__)
+
+
+def purge_content(users=None, delete_media=True, wait=False, file_batch_size=100):
+    """
+    Delete ``users`` (a queryset; every user when None) and every row that
+    cascades from them. Returns::
+
+        {"deleted": {"api.Blog": 20000, ...}, "files": 41000, "timings": {"collect": 0.41, "delete": 0.62}}
+
+    With ``wait=True`` the media cleanup runs to completion first, adding
+    ``"files_deleted"``, ``"files_missing"``, ``"files_failed"`` and a
+    ``"media"`` timing.
+    """
+    everything = users is None
+    alias = router.db_for_write(User)
+    roots = User._base_manager.using(alias).all() if everything else users.using(alias)
+    timings = {}
+
+    started = time.perf_counter()
+    plan = [(model, reached(roots, path)) for model, path in cascade_plan(User)]
+    user_ids = list(roots.values_list("pk", flat=True))
+    resume_ids = [pk for model, queryset in plan if model is Resume for pk in queryset.values_list("pk", flat=True)]
+    blogs = next(queryset for model, queryset in plan if model is Blog)
+    blog_ids = [] if everything else list(blogs.values_list("pk", flat=True))
+    files = defaultdict(set)
+    if delete_media:
+        for model, queryset in plan:
+            for storage, names in file_names(queryset).items():
+                files[storage] |= names
+    cleanup = MediaCleanup(files, file_batch_size, background=purge_settings()["BACKGROUND_MEDIA"])
+    timings["collect"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    deleted = Counter()
+    with transaction.atomic(using=alias):
+        # Before refresh_related below: it must not see the purged blogs
+        transaction.on_commit(blog_index.forget, using=alias)
+        if everything:
+            tables = {}
+            for model in [*(model for model, _ in plan), *DERIVED_MODELS]:
+                if model._meta.db_table not in tables:
+                    tables[model._meta.db_table] = model
+                    deleted[model._meta.label] = model._base_manager.using(alias).count()
+            connection = connections[alias]
+            connection.ops.execute_sql_flush(connection.ops.sql_flush(no_style(), list(tables)))
+        else:
+            archive = Counter(key for row in blogs.values_list(*ARCHIVE_FIELDS) for key in archive_keys(*row))
+            # Remaining blogs that list a purged one as related
+            listing = list(
+                RelatedPost.objects.using(alias).filter(related__in=blogs).exclude(blog__in=blogs)
+                .order_by().values_list("blog_id", flat=True).distinct()
+            )
+            for model, queryset in plan:
+                # Set-based DELETE: no collector, no per-row signals
+                deleted[model._meta.label] += queryset._raw_delete(alias)
+            apply_counts({key: -count for key, count in archive.items()})
+            if listing:
+                schedule(refresh_related, listing)
+        transaction.on_commit(lambda: invalidate(user_ids, resume_ids, blog_ids, everything), using=alias)
+        transaction.on_commit(cleanup.start, using=alias)
+    timings["delete"] = time.perf_counter() - started
+
+    report = {"deleted": {label: count for label, count in deleted.items() if count}, "files": len(cleanup)}
+    if wait:
+        started = time.perf_counter()
+        cleanup.wait()
+        timings["media"] = time.perf_counter() - started
+        report.update(files_deleted=cleanup.deleted, files_missing=cleanup.missing, files_failed=cleanup.failed)
+    report["timings"] = {phase: round(seconds, 3) for phase, seconds in timings.items()}
+    return report
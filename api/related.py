@@ -0,0 +1,372 @@
+"""
+Precomputed "related posts": the top ``TOP_K`` neighbours of every blog.
+
+Similarity of two blogs is the Jaccard index of their tag sets plus
+``CATEGORY_WEIGHT`` when they share a category (tags and category compared
+case-insensitively). The neighbours are stored as RelatedPost rows, so
+``?include=related`` on a blog costs one indexed lookup instead of a scan.
+
+Scoring works on bitsets: every blog is one bit of a Python int, with one
+int per tag, per category and per tag count. The blogs sharing exactly ``j``
+tags with a blog come out of a bit-sliced adder over its tags' bitsets, and
+the candidates of one score class (``j`` shared tags, ``n`` tags of their
+own, same category or not) are a few whole-set ANDs; only the winners are
+ever looked at one by one. Blogs are ordered oldest first and picked from
+the highest bit down, so ties go to the newer post and a new blog is simply
+the next bit.
+
+``rebuild_related()`` (the rebuild_related_posts command) recomputes
+everything; creating, editing or deleting a blog updates only the lists it
+can change (``update_related()`` / ``refresh_related()``), on an index each
+process keeps between writes (``blog_index``).
+"""
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min
+
+from .cache import fresh_version, is_shared
+from .models import Blog, RelatedPost
+
+logger = logging.getLogger(__name__)
+
+RELATED_DEFAULTS = {
+    "TOP_K": 5,
+    "CATEGORY_WEIGHT": 0.25,
+}
+
+
+def related_settings():
+    return {**RELATED_DEFAULTS, **getattr(settings, "RELATED_POSTS", {})}
+
+
+def normalize_tags(tags):
+    if not isinstance(tags, list):
+        return frozenset()
+    return frozenset(str(tag).strip().lower() for tag in tags if str(tag).strip())
+
+
+def normalize_category(category):
+    return (category or "").strip().lower()
+
+
+def bitset(positions, size):
+    data = bytearray(size // 8 + 1)
+    for position in positions:
+        data[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(data, "little")
+
+
+def similarity(tags, category, other_tags, other_category, category_weight):
+    union = len(tags | other_tags)
+    score = len(tags & other_tags) / union if union else 0.0
+    if category and category == other_category:
+        score += category_weight
+    return score
+
+
+class BlogIndex:
+    """Tags and categories of all blogs, as bitsets over blog positions (oldest first)."""
+
+    def __init__(self, rows):
+        self.ids, self.tags, self.categories = [], [], []
+        tag_positions, category_positions, length_positions = defaultdict(list), defaultdict(list), defaultdict(list)
+        for position, (pk, tags, category) in enumerate(rows):
+            tags, category = normalize_tags(tags), normalize_category(category)
+            self.ids.append(pk)
+            self.tags.append(tags)
+            self.categories.append(category)
+            for tag in tags:
+                tag_positions[tag].append(position)
+            if category:
+                category_positions[category].append(position)
+            length_positions[len(tags)].append(position)
+
+        size = len(self.ids)
+        self.all = (1 << size) - 1
+        self.position = {pk: position for position, pk in enumerate(self.ids)}
+        self.tag_bits = {tag: bitset(positions, size) for tag, positions in tag_positions.items()}
+        self.category_bits = {category: bitset(positions, size) for category, positions in category_positions.items()}
+        self.length_bits = {length: bitset(positions, size) for length, positions in length_positions.items()}
+
+    @classmethod
+    def load(cls):
+        return cls(Blog.objects.order_by("created_at", "-pk").values_list("pk", "tags", "category"))
+
+    def __contains__(self, pk):
+        return pk in self.position
+
+    def put(self, pk, tags, category):
+        """Set the tags and category of ``pk``; a blog not indexed yet becomes the newest."""
+        position = self.position.get(pk)
+        if position is None:
+            position = self.position[pk] = len(self.ids)
+            self.ids.append(pk)
+            self.tags.append(frozenset())
+            self.categories.append("")
+        bit = 1 << position
+        old_tags, old_category = self.tags[position], self.categories[position]
+        for tag in old_tags:
+            self.tag_bits[tag] &= ~bit
+        if old_category:
+            self.category_bits[old_category] &= ~bit
+        # A new blog is in no length bitset yet: .get()
+        self.length_bits[len(old_tags)] = self.length_bits.get(len(old_tags), 0) & ~bit
+
+        tags, category = normalize_tags(tags), normalize_category(category)
+        self.tags[position], self.categories[position] = tags, category
+        for tag in tags:
+            self.tag_bits[tag] = self.tag_bits.get(tag, 0) | bit
+        if category:
+            self.category_bits[category] = self.category_bits.get(category, 0) | bit
+        self.length_bits[len(tags)] = self.length_bits.get(len(tags), 0) | bit
+        self.all |= bit
+
+    def shared_counts(self, tags):
+        """Bit slices of "tags shared with ``tags``" per blog: slice k holds bit k of the count."""
+        slices = []
+        for tag in tags:
+            carry = self.tag_bits.get(tag, 0)
+            for k, value in enumerate(slices):
+                slices[k], carry = value ^ carry, value & carry
+                if not carry:
+                    break
+            if carry:
+                slices.append(carry)
+        return slices
+
+    def score_classes(self, position, category_weight):
+        """``{score: bitset of blogs with that score}`` for the blog at ``position``."""
+        tags, category = self.tags[position], self.categories[position]
+        others = self.all ^ (1 << position)
+        same_category = self.category_bits.get(category, 0) if category else 0
+        slices = self.shared_counts(tags)
+        classes = defaultdict(int)
+
+        for shared in range(1, len(tags) + 1):
+            if shared.bit_length() > len(slices):
+                break
+            exact = others
+            for k, value in enumerate(slices):
+                exact &= value if shared >> k & 1 else self.all ^ value
+            if not exact:
+                continue
+            for length, length_bits in self.length_bits.items():
+                members = exact & length_bits if length >= shared else 0
+                if not members:
+                    continue
+                jaccard = shared / (len(tags) + length - shared)
+                in_category = members & same_category
+                if in_category:
+                    classes[jaccard + category_weight] |= in_category
+                if members ^ in_category:
+                    classes[jaccard] |= members ^ in_category
+
+        if category_weight > 0 and same_category:
+            any_shared = 0
+            for value in slices:
+                any_shared |= value
+            category_only = same_category & others & (self.all ^ any_shared)
+            if category_only:
+                classes[category_weight] |= category_only
+        return classes
+
+    def neighbours(self, position, top_k, category_weight):
+        """``[(blog_id, score), ...]``: the ``top_k`` best matches, best (then newest) first."""
+        found = []
+        classes = self.score_classes(position, category_weight)
+        for score in sorted(classes, reverse=True):
+            members = classes[score]
+            while members and len(found) < top_k:
+                highest = members.bit_length() - 1
+                found.append((self.ids[highest], score))
+                members ^= 1 << highest
+            if len(found) >= top_k:
+                break
+        return found
+
+
+def link_rows(index, blog_ids, options):
+    rows = []
+    for pk in blog_ids:
+        neighbours = index.neighbours(index.position[pk], options["TOP_K"], options["CATEGORY_WEIGHT"])
+        rows.extend(
+            RelatedPost(blog_id=pk, related_id=related_id, score=score, rank=rank)
+            for rank, (related_id, score) in enumerate(neighbours)
+        )
+    return rows
+
+
+INDEX_GENERATION_KEY = "related-index:generation"
+
+
+class IndexCache:
+    """
+    This process's BlogIndex, kept between writes instead of loaded for each.
+
+    Every change to the indexed blogs bumps a generation in CACHES, and a
+    process that finds another generation than the one its index is at
+    loads the index again. A process's own edits are applied in place when
+    nobody else wrote in between. A per-process cache (LocMemCache) cannot
+    show other workers' writes, so the index is then loaded on every use.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._generation = None
+
+    @contextmanager
+    def current(self, changed=None):
+        """
+        The up-to-date index, with the row of ``changed`` (a blog just
+        created or edited) read again. Held for the ``with`` block: the
+        index is updated in place, so other threads wait.
+        """
+        with self._lock:
+            shared = is_shared()
+            generation = cache.get(INDEX_GENERATION_KEY) if shared else None
+            if shared and generation is None:
+                cache.add(INDEX_GENERATION_KEY, fresh_version(), timeout=None)
+                generation = cache.get(INDEX_GENERATION_KEY)
+            index = self._index
+            if index is None or generation is None or generation != self._generation:
+                index = BlogIndex.load()
+            elif changed is not None:
+                row = Blog.objects.filter(pk=changed).values_list("tags", "category").first()
+                if row is not None:
+                    index.put(changed, *row)
+            self._index = self._generation = None
+
+            if shared and changed is not None:
+                bumped = bump_generation()
+                # Otherwise another process wrote meanwhile: load again next time
+                if generation is not None and bumped == generation + 1:
+                    self._index, self._generation = index, bumped
+            elif shared and generation is not None:
+                self._index, self._generation = index, generation
+            yield index
+
+    def forget(self):
+        """Blogs were deleted or rewritten in bulk: every process loads the index again."""
+        with self._lock:
+            self._index = self._generation = None
+        if is_shared():
+            bump_generation()
+
+
+def bump_generation():
+    try:
+        return cache.incr(INDEX_GENERATION_KEY)
+    except ValueError:
+        # Evicted: the next use starts a new generation
+        return None
+
+
+blog_index = IndexCache()
+
+
+def rebuild_related(batch_size=1000):
+    """Recompute every blog's related posts; returns (blogs, links)."""
+    options = related_settings()
+    index = BlogIndex.load()
+    rows = link_rows(index, index.ids, options)
+    with transaction.atomic():
+        RelatedPost.objects.all().delete()
+        RelatedPost.objects.bulk_create(rows, batch_size=batch_size)
+    blog_index.forget()
+    return len(index.ids), len(rows)
+
+
+def replace_links(index, blog_ids, options):
+    blog_ids = [pk for pk in blog_ids if pk in index]
+    rows = link_rows(index, blog_ids, options)
+    with transaction.atomic():
+        RelatedPost.objects.filter(blog_id__in=blog_ids).delete()
+        RelatedPost.objects.bulk_create(rows)
+    return len(blog_ids)
+
+
+def blogs_listing(blog_id):
+    """Ids of the blogs that currently list ``blog_id`` as related."""
+    return list(RelatedPost.objects.filter(related_id=blog_id).values_list("blog_id", flat=True).distinct())
+
+
+def refresh_related(blog_ids):
+    """Recompute the lists of ``blog_ids`` (e.g. the ones that listed a deleted blog)."""
+    if not blog_ids:
+        return 0
+    with blog_index.current() as index:
+        return replace_links(index, blog_ids, related_settings())
+
+
+def list_sizes(blog_ids, chunk_size=500):
+    """``{blog_id: {"weakest": score, "links": count}}`` for the lists of ``blog_ids``."""
+    lists = {}
+    for start in range(0, len(blog_ids), chunk_size):
+        rows = (
+            RelatedPost.objects.filter(blog_id__in=blog_ids[start:start + chunk_size])
+            .values("blog_id").annotate(weakest=Min("score"), links=Count("pk"))
+        )
+        lists.update((row["blog_id"], row) for row in rows)
+    return lists
+
+
+def update_related(blog_id):
+    """
+    Bring the related posts up to date after ``blog_id`` was created or its
+    tags/category changed; returns the number of lists recomputed.
+
+    Recomputed: the blog's own list, the lists that had it, and the lists
+    whose weakest entry it now matches or beats (or that are not full yet).
+    Only blogs sharing a tag or the category can be in the last group, so
+    only their lists are read. Every other list keeps the same top K.
+    """
+    options = related_settings()
+    with blog_index.current(changed=blog_id) as index:
+        if blog_id not in index:
+            return 0
+        position = index.position[blog_id]
+        tags, category = index.tags[position], index.categories[position]
+
+        affected = {blog_id, *blogs_listing(blog_id)}
+        candidates = 0
+        for tag in tags:
+            candidates |= index.tag_bits[tag]
+        if category and options["CATEGORY_WEIGHT"] > 0:
+            candidates |= index.category_bits[category]
+        candidates &= ~(1 << position)
+        others = []
+        while candidates:
+            highest = candidates.bit_length() - 1
+            candidates ^= 1 << highest
+            others.append(highest)
+
+        lists = list_sizes([index.ids[other] for other in others])
+        for other in others:
+            pk = index.ids[other]
+            current = lists.get(pk)
+            if current is None or current["links"] < options["TOP_K"]:
+                affected.add(pk)
+                continue
+            score = similarity(tags, category, index.tags[other], index.categories[other], options["CATEGORY_WEIGHT"])
+            # Equal scores too: the tie-break (newest first) may favour this blog
+            if score >= current["weakest"] - 1e-9:
+                affected.add(pk)
+        return replace_links(index, affected, options)
+
+
+def schedule(function, *args):
+    """Run ``function`` after the current transaction commits; failures are logged, not raised."""
+    def run():
+        try:
+            function(*args)
+        except Exception:
+            logger.exception("Updating related posts failed; run the rebuild_related_posts command")
+
+    transaction.on_commit(run)
@@ -0,0 +1,250 @@
+import contextvars
+import hashlib
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ALIAS = "snapshot"
+
+# Public content served from the read-only snapshot or a replica. CustomUser
+# is exported (FK targets) but never read from either: authentication must
+# see live users.
+PUBLIC_READ_LABELS = frozenset({
+    "api.Resume",
+    "api.Experience",
+    "api.Certification",
+    "api.Project",
+    "api.Education",
+    "api.TechSkill",
+    "api.SoftSkill",
+    "api.Hobby",
+    "api.SliderGallery",
+    "api.Blog",
+    "api.BlogBlock",
+    "api.RelatedPost",
+    "api.BlogArchiveCount",
+})
+
+_primary_pinned = contextvars.ContextVar("primary_pinned", default=False)
+
+
+def pin_primary():
+    """Send reads to the primary until ``unpin_primary(token)``; returns the reset token."""
+    return _primary_pinned.set(True)
+
+
+def unpin_primary(token):
+    _primary_pinned.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    token = pin_primary()
+    try:
+        yield
+    finally:
+        unpin_primary(token)
+
+
+def reads_pinned_to_primary():
+    # Inside a write transaction the caller must see its own uncommitted rows
+    return _primary_pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+class SnapshotRouter:
+    """
+    Serve public reads from the immutable SQLite snapshot, write to the primary.
+
+    Reads are pinned to the primary for unsafe requests (see
+    ``PrimaryReadMiddleware``) and inside transactions, so an editor never
+    reads a stale snapshot row back and saves it over newer data.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.label in PUBLIC_READ_LABELS and not reads_pinned_to_primary():
+            return SNAPSHOT_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Explicit: rows loaded from the snapshot would otherwise save back to it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, SNAPSHOT_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == SNAPSHOT_ALIAS:
+            return False
+        return None
+
+
+REPLICA_DEFAULTS = {
+    "MAX_LAG_SECONDS": 5.0,
+    "CHECK_INTERVAL": 5.0,
+    "STICKY_SECONDS": 15,
+    # Upper bound for one probe (PostgreSQL statement_timeout)
+    "PROBE_TIMEOUT": 2.0,
+}
+
+# Seconds the replica is behind the primary. An idle primary sends no WAL, so
+# a replica that has replayed everything it received counts as caught up.
+POSTGRES_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def replica_options():
+    return {**REPLICA_DEFAULTS, **getattr(settings, "REPLICA_READS", {})}
+
+
+def replica_aliases():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def replica_lag(alias, timeout=None):
+    """Replication delay of ``alias`` in seconds; raises DatabaseError if it is down."""
+    connection = connections[alias]
+    with transaction.atomic(using=alias), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            if timeout:
+                cursor.execute("SET LOCAL statement_timeout = %s", [int(timeout * 1000)])
+            cursor.execute(POSTGRES_LAG_SQL)
+            return float(cursor.fetchone()[0] or 0)
+        cursor.execute("SELECT 1")
+        return 0.0
+
+
+class ReplicaHealth:
+    """
+    Last known state of each replica, re-checked every CHECK_INTERVAL.
+
+    The first request that needs a replica probes it (bounded by
+    PROBE_TIMEOUT and the replica's connect_timeout, see
+    ``replica_database()``), so a healthy replica serves reads from the
+    start. Later probes run on a background thread while requests keep using
+    the previous result: a hanging replica never holds up a request.
+    Concurrent requests that arrive during the first probe read from the
+    primary.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+        self._checking = set()
+
+    def is_healthy(self, alias):
+        options = replica_options()
+        healthy, checked_at = self._state.get(alias, (False, None))
+        if checked_at is not None and time.monotonic() - checked_at < options["CHECK_INTERVAL"]:
+            return healthy
+
+        with self._lock:
+            if alias in self._checking:
+                return healthy
+            self._checking.add(alias)
+        if checked_at is None:
+            return self.refresh(alias, options)
+        threading.Thread(
+            target=self.refresh, args=(alias, options, True), name=f"replica-health-{alias}", daemon=True
+        ).start()
+        return healthy
+
+    def refresh(self, alias, options, background=False):
+        healthy = False
+        try:
+            healthy = self.check(alias, options["MAX_LAG_SECONDS"], options["PROBE_TIMEOUT"])
+        finally:
+            if background:
+                # The thread ends here; its connection would never be reused
+                connections[alias].close()
+            with self._lock:
+                self._state[alias] = (healthy, time.monotonic())
+                self._checking.discard(alias)
+        return healthy
+
+    def check(self, alias, max_lag, timeout=None):
+        try:
+            lag = replica_lag(alias, timeout)
+        except DatabaseError as e:
+            logger.warning("Replica %s is unavailable, reading from the primary: %s", alias, e)
+            connections[alias].close()
+            return False
+        if lag > max_lag:
+            logger.warning("Replica %s is %.1fs behind, reading from the primary", alias, lag)
+            return False
+        return True
+
+    def reset(self):
+        with self._lock:
+            self._state.clear()
+
+
+replica_health = ReplicaHealth()
+
+
+def writer_cache_key(request):
+    """Cache key for the editor behind ``request`` (JWT or admin session), or None."""
+    credential = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credential:
+        return None
+    return "replica-sticky:" + hashlib.blake2b(credential.encode(), digest_size=16).hexdigest()
+
+
+def remember_write(request):
+    """Keep this editor's reads on the primary until the replicas have caught up."""
+    key = writer_cache_key(request)
+    if key and replica_aliases():
+        cache.set(key, True, replica_options()["STICKY_SECONDS"])
+
+
+def wrote_recently(request):
+    key = writer_cache_key(request)
+    return bool(key and replica_aliases() and cache.get(key))
+
+
+class ReplicaRouter:
+    """
+    Send public content reads of safe requests to a healthy read replica.
+
+    Falls back to the primary when every replica is down or lagging by more
+    than MAX_LAG_SECONDS, for unsafe requests and transactions, and for an
+    editor's GETs during STICKY_SECONDS after their last write (read-your-writes,
+    see ``PrimaryReadMiddleware``).
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.label not in PUBLIC_READ_LABELS or reads_pinned_to_primary():
+            return None
+        healthy = [alias for alias in replica_aliases() if replica_health.is_healthy(alias)]
+        if not healthy:
+            return None
+        return random.choice(healthy)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
@@ -1,14 +1,16 @@
 import json
+import logging
 import os
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
 from rest_framework import serializers
-from .models import Resume, Experience, Certification, Education, TechSkill, SoftSkill, Hobby, SliderGallery, Blog, BlogBlock
-import cloudinary.api
-from cloudinary.exceptions import NotFound
-from cloudinary.uploader import upload as cloudinary_upload, destroy as cloudinary_destroy
+from .models import Resume, Experience, Certification, Education, TechSkill, SoftSkill, Hobby, SliderGallery, Blog, BlogBlock, RelatedPost
+from .related import schedule, update_related
+from .timing import TimedSerializerMixin, timed
 # from .models import Note
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -18,14 +20,14 @@ class UserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         user = User.objects.create_user(**validated_data)
-        print(f'{user} user created')
+        logger.info("User %s created", user)
         
         if user.is_staff:
-            print("creating resume")
+            logger.info("Creating resume for staff user %s", user)
             try:
                 Resume.objects.create(user=user, email=user.email)
             except Exception as e:
-                print(f"Resume creation failed: {e}")
+                logger.warning("Resume creation failed: %s", e)
         return user
 
 
@@ -61,10 +63,14 @@ class HobbySerializer(serializers.ModelSerializer):
 
 class SliderGallerySerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    # Precomputed at upload so clients can reserve layout space and paint a preview
+    width = serializers.IntegerField(source="image_width", read_only=True)
+    height = serializers.IntegerField(source="image_height", read_only=True)
+    placeholder = serializers.CharField(source="image_placeholder", read_only=True)
 
     class Meta:
         model = SliderGallery
-        fields = ("image",)
+        fields = ("image", "width", "height", "placeholder")
 
     def get_image(self, obj):
         try:
@@ -73,11 +79,66 @@ class SliderGallerySerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.image.url)
             return obj.image.url if obj.image else None
         except Exception as e:
-            print(f"Error in get_image: {e}")
+            logger.warning("Error in get_image: %s", e)
             return None
 
 
-class ResumeSerializer(serializers.ModelSerializer):
+# URL slug -> serializer for the per-collection resume endpoints
+# (/api/resumes/<id>/<slug>/, see ResumeSectionListView)
+RESUME_SECTIONS = {
+    "experiences": ExperienceSerializer,
+    "certifications": CertificationSerializer,
+    "education": EducationSerializer,
+    "tech-skills": TechSkillSerializer,
+    "soft-skills": SoftSkillSerializer,
+    "hobbies": HobbySerializer,
+}
+
+
+# Nested field -> relation it reads. Views prefetch the relations that will be
+# rendered to avoid N+1 queries (all of them unless ?fields=/?include= prune).
+RESUME_RELATIONS = {
+    "experiences": "experiences",
+    "certifications": "certifications",
+    "education": "education",
+    "tech_skills": "tech_skills",
+    "soft_skills": "soft_skills",
+    "hobbies": "hobbies",
+    "slider_gallery": "gallery",
+}
+BLOG_RELATIONS = {"blocks": "blocks"}
+# Rendered only when asked for (?include=related); never part of the mirror
+BLOG_OPTIONAL_RELATIONS = {
+    "related": Prefetch(
+        "related_links",
+        queryset=RelatedPost.objects.select_related("related").only(
+            "blog", "related", "score", "rank", "related__title", "related__category", "related__cover_image"
+        ),
+    ),
+}
+RESUME_PREFETCH = tuple(RESUME_RELATIONS.values())
+BLOG_PREFETCH = tuple(BLOG_RELATIONS.values())
+
+
+class SparseFieldsMixin:
+    """Serializer mixin: ``fields=[...]`` keeps only those fields (see api/fieldsets.py)."""
+
+    RELATIONS = {}
+    OPTIONAL_RELATIONS = {}
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is None and self.OPTIONAL_RELATIONS:
+            fields = set(self.fields) - set(self.OPTIONAL_RELATIONS)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class ResumeSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    RELATIONS = RESUME_RELATIONS
+
     profile_image = serializers.ImageField(use_url=True, required=False)
     experiences = ExperienceSerializer(many=True, required=False)
     certifications = CertificationSerializer(many=True, required=False)
@@ -101,7 +162,7 @@ class ResumeSerializer(serializers.ModelSerializer):
         slider_gallery_urls = json.loads(request.data.get('slider_gallery', '[]'))  # URLs from frontend
         slider_gallery_files = request.FILES.getlist('slider_gallery') 
 
-        print("Validated Data:", validated_data)
+        logger.debug("Validated data: %s", validated_data)
 
         resume = Resume.objects.create(**validated_data)
 
@@ -130,6 +191,11 @@ class ResumeSerializer(serializers.ModelSerializer):
         return resume
 
     def update(self, instance, validated_data):
+        # Imported on first edit rather than at module load (cold-start cost)
+        import cloudinary.api
+        from cloudinary.exceptions import NotFound
+        from cloudinary.uploader import destroy as cloudinary_destroy
+
         try:
             request = self.context['request']
             profile_image = validated_data.get('profile_image', None)
@@ -140,15 +206,15 @@ class ResumeSerializer(serializers.ModelSerializer):
                     old_image_name = instance.profile_image.name
                     if old_image_name:
                         public_id = os.path.splitext(old_image_name)[0]
-                        print(f"Deleting Cloudinary image: {public_id}")
+                        logger.info("Deleting Cloudinary image: %s", public_id)
                         try:
-                            cloudinary.api.resource(public_id)
-                            print(f"Resource exists. Deleting Cloudinary image: {public_id}")
-                            cloudinary_destroy(public_id)
+                            with timed("storage"):
+                                cloudinary.api.resource(public_id)
+                                cloudinary_destroy(public_id)
                         except NotFound:
-                            print(f"Cloudinary image {public_id} not found, skipping delete.")
+                            logger.info("Cloudinary image %s not found, skipping delete.", public_id)
                         except Exception as e:
-                            print(f"Unexpected error while deleting Cloudinary image: {e}")
+                            logger.warning("Unexpected error while deleting Cloudinary image: %s", e)
 
 
                 # Set new image
@@ -205,23 +271,24 @@ class ResumeSerializer(serializers.ModelSerializer):
                     # Delete from Cloudinary
                     public_id = f"resume_gallery/{os.path.splitext(db_filename)[0]}"
                     try:
-                        print(f"Deleting Cloudinary slider image: {public_id}")
-                        cloudinary_destroy(public_id)
+                        logger.info("Deleting Cloudinary slider image: %s", public_id)
+                        with timed("storage"):
+                            cloudinary_destroy(public_id)
                     except Exception as e:
-                        print(f"Error deleting slider image from Cloudinary: {e}")
+                        logger.warning("Error deleting slider image from Cloudinary: %s", e)
                     slider.delete()
 
             # Upload new slider files to Cloudinary
             for file in slider_gallery_files:
                 try:
-                    print(f"Uploading to Cloudinary: {file.name}")
+                    logger.info("Uploading to Cloudinary: %s", file.name)
                     instance.gallery.create(image=file)
                 except Exception as e:
-                    print(f"Error uploading slider image to Cloudinary: {e}")
+                    logger.warning("Error uploading slider image to Cloudinary: %s", e)
 
             return instance
         except Exception as e:
-            print("Update error:", str(e))
+            logger.warning("Update error: %s", e)
             raise serializers.ValidationError({"detail": str(e)})
 
     class Meta:
@@ -234,6 +301,9 @@ class ResumeSerializer(serializers.ModelSerializer):
             'location',
             "bio",
             "profile_image",
+            "profile_image_width",
+            "profile_image_height",
+            "profile_image_placeholder",
             "experiences",
             'certifications',
             'education',
@@ -242,11 +312,16 @@ class ResumeSerializer(serializers.ModelSerializer):
             'hobbies',
             'slider_gallery',
         )
+        read_only_fields = ("profile_image_width", "profile_image_height", "profile_image_placeholder")
 
 class BlogBlockSerializer(serializers.ModelSerializer):
+    width = serializers.IntegerField(source="media_width", read_only=True)
+    height = serializers.IntegerField(source="media_height", read_only=True)
+    placeholder = serializers.CharField(source="media_placeholder", read_only=True)
+
     class Meta:
         model = BlogBlock
-        fields = ["id", "type", "content", "media_file", "order"]
+        fields = ["id", "type", "content", "media_file", "width", "height", "placeholder", "order"]
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -257,12 +332,27 @@ class BlogBlockSerializer(serializers.ModelSerializer):
         return data
 
 
-class BlogSerializer(serializers.ModelSerializer):
+class RelatedPostSerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField(source="related_id", read_only=True)
+    title = serializers.CharField(source="related.title", read_only=True)
+    category = serializers.CharField(source="related.category", read_only=True)
+    cover_image = serializers.ImageField(source="related.cover_image", read_only=True)
+
+    class Meta:
+        model = RelatedPost
+        fields = ["id", "title", "category", "cover_image", "score"]
+
+
+class BlogSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    RELATIONS = BLOG_RELATIONS
+    OPTIONAL_RELATIONS = BLOG_OPTIONAL_RELATIONS
     blocks = BlogBlockSerializer(many=True, required=False)
+    related = RelatedPostSerializer(source="related_links", many=True, read_only=True)
 
     class Meta:
         model = Blog
-        fields = ["id", "user", "title", "description", "category", "cover_image", "tags", "likes_count", "resource_link", "deployed_link", "blocks", "created_at"]
+        fields = ["id", "user", "title", "description", "category", "cover_image", "cover_image_width", "cover_image_height", "cover_image_placeholder", "tags", "likes_count", "resource_link", "deployed_link", *Blog.BLOCK_SUMMARY_FIELDS, "blocks", "related", "created_at"]
+        read_only_fields = ["cover_image_width", "cover_image_height", "cover_image_placeholder", *Blog.BLOCK_SUMMARY_FIELDS]
 
     def create(self, validated_data):
         request = self.context['request']
@@ -279,16 +369,20 @@ class BlogSerializer(serializers.ModelSerializer):
                 media_file = media_files[media_index]
                 media_index += 1
 
-            blocks.append(
-                BlogBlock(
-                    blog=blog,
-                    type=block_data.get("type"),
-                    content=block_data.get("content"),
-                    media_file=media_file,
-                    order=index,
-                )
+            block = BlogBlock(
+                blog=blog,
+                type=block_data.get("type"),
+                content=block_data.get("content"),
+                media_file=media_file,
+                order=index,
             )
+            # bulk_create skips save(), so compute image metadata here
+            block.refresh_media_metadata()
+            blocks.append(block)
         BlogBlock.objects.bulk_create(blocks)
+        # After bulk_create: the thumbnail is the stored name of the block's file
+        Blog.objects.filter(pk=blog.pk).update(**blog.apply_block_summary(blocks))
+        schedule(update_related, blog.pk)
         return blog
 
     def update(self, instance, validated_data):
@@ -296,7 +390,7 @@ class BlogSerializer(serializers.ModelSerializer):
         blocks_data = json.loads(request.data.get("blocks", "[]"))
         media_files = request.FILES.getlist("blocks_files")
         media_index = 0
-        updated_block_ids = []
+        updated_blocks = []
 
         for index, block_data in enumerate(blocks_data):
             block_id = block_data.get("id")
@@ -336,14 +430,20 @@ class BlogSerializer(serializers.ModelSerializer):
                     order=index,
                 )
 
-            updated_block_ids.append(block.id)
+            updated_blocks.append(block)
 
-        for block in instance.blocks.exclude(id__in=updated_block_ids):
+        for block in instance.blocks.exclude(id__in=[block.id for block in updated_blocks]):
             block.delete()
 
-        return super().update(instance, validated_data)
+        # Saved with the other fields below
+        instance.apply_block_summary(updated_blocks)
+        similarity_before = (instance.tags, instance.category)
+        blog = super().update(instance, validated_data)
+        if (blog.tags, blog.category) != similarity_before:
+            schedule(update_related, blog.pk)
+        return blog
     
-class BlogPostSerializer(serializers.ModelSerializer):
+class BlogPostSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Blog
         fields = [
@@ -353,6 +453,10 @@ class BlogPostSerializer(serializers.ModelSerializer):
             "category",
             "tags",
             "cover_image",
+            "cover_image_width",
+            "cover_image_height",
+            "cover_image_placeholder",
+            *Blog.BLOCK_SUMMARY_FIELDS,
             "created_at",
             "comments",
             "likes_count"
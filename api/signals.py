@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import archive, cache, edge, mirror, related
+from .authentication import invalidate_user
+from .changes import BLOG, RESUME, changes_dispatched, content_changed, mark_changed
+from .models import (
+    Resume, Experience, Certification, Project, Education, TechSkill, SoftSkill, Hobby, SliderGallery, Blog, BlogBlock
+)
+from .timing import install_execute_hook
+
+User = get_user_model()
+
+RESUME_CHILDREN = (Experience, Certification, Project, Education, TechSkill, SoftSkill, Hobby, SliderGallery)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    invalidate_user(instance)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    invalidate_user(instance, deleted=True)
+
+
+# Only saves are tracked on child rows: a post_delete receiver would stop
+# Django from fast-deleting them. Code that deletes children without saving
+# the parent calls mark_changed() itself.
+@receiver(post_save, sender=Resume)
+def resume_saved(sender, instance, **kwargs):
+    mark_changed(RESUME, instance.pk)
+
+
+@receiver(post_delete, sender=Resume)
+def resume_deleted(sender, instance, **kwargs):
+    mark_changed(RESUME, instance.pk, deleted=True)
+
+
+def resume_child_saved(sender, instance, **kwargs):
+    mark_changed(RESUME, instance.resume_id, child=True)
+
+
+for child in RESUME_CHILDREN:
+    post_save.connect(resume_child_saved, sender=child, dispatch_uid=f"resume_child_saved_{child.__name__}")
+
+
+@receiver(pre_save, sender=Blog)
+def blog_saving(sender, instance, update_fields=None, **kwargs):
+    archive.remember_keys(instance, update_fields)
+
+
+@receiver(post_save, sender=Blog)
+def blog_saved(sender, instance, **kwargs):
+    archive.blog_saved(instance)
+    mark_changed(BLOG, instance.pk)
+
+
+@receiver(post_delete, sender=Blog)
+def blog_deleted(sender, instance, **kwargs):
+    archive.blog_deleted(instance)
+    # Before the refresh_related() the deleting code schedules
+    transaction.on_commit(related.blog_index.forget)
+    mark_changed(BLOG, instance.pk, deleted=True)
+
+
+@receiver(post_save, sender=BlogBlock)
+def blog_block_saved(sender, instance, **kwargs):
+    mark_changed(BLOG, instance.blog_id, child=True)
+
+
+def touch_updated_at(sender, object_id, deleted, children_only=False, **kwargs):
+    # Child rows (experiences, blocks...) do not save their parent: keep the
+    # parent's updated_at meaningful for incremental publish_static runs. A
+    # saved parent already has a fresh one.
+    if children_only and not deleted:
+        model = Resume if sender == RESUME else Blog
+        model.objects.filter(pk=object_id).update(updated_at=timezone.now())
+
+
+content_changed.connect(touch_updated_at, dispatch_uid="touch_updated_at")
+content_changed.connect(mirror.content_changed_receiver, dispatch_uid="mongo_mirror")
+content_changed.connect(cache.content_changed_receiver, dispatch_uid="content_versions")
+changes_dispatched.connect(edge.changes_dispatched_receiver, dispatch_uid="edge_purge")
+connection_created.connect(install_execute_hook, dispatch_uid="server_timing")
@@ -0,0 +1,92 @@
+import os
+import sqlite3
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .portability import restore_timestamps, take_timestamps
+
+EXPORT_ALIAS = "snapshot_export"
+
+# Dependency order: every FK target is copied before the rows pointing at it
+SNAPSHOT_MODELS = [
+    "api.CustomUser",
+    "api.Resume",
+    "api.Experience",
+    "api.Certification",
+    "api.Project",
+    "api.Education",
+    "api.TechSkill",
+    "api.SoftSkill",
+    "api.Hobby",
+    "api.SliderGallery",
+    "api.Blog",
+    "api.BlogBlock",
+    "api.RelatedPost",
+    "api.BlogArchiveCount",
+]
+
+
+def copy_rows(model, rows):
+    """Insert ``rows`` into the export as they are, ``auto_now`` timestamps included."""
+    stamps = take_timestamps(rows)
+    model.objects.using(EXPORT_ALIAS).bulk_create(rows)
+    restore_timestamps(stamps, using=EXPORT_ALIAS)
+
+
+def export_snapshot(path, using=DEFAULT_DB_ALIAS, batch_size=1000):
+    """
+    Copy public content from ``using`` into a compact SQLite file at ``path``.
+
+    The file is built next to the target and swapped in with ``os.replace``
+    so a running process never sees a half-written snapshot. Password hashes
+    are not exported. Returns ``{model label: row count}``.
+    """
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    connections.settings[EXPORT_ALIAS] = connections.configure_settings({
+        DEFAULT_DB_ALIAS: dict(connections.settings[DEFAULT_DB_ALIAS]),
+        EXPORT_ALIAS: {"ENGINE": "django.db.backends.sqlite3", "NAME": tmp_path},
+    })[EXPORT_ALIAS]
+    counts = {}
+    try:
+        call_command("migrate", database=EXPORT_ALIAS, interactive=False, verbosity=0)
+        unusable_password = make_password(None)
+
+        for label in SNAPSHOT_MODELS:
+            model = apps.get_model(label)
+            rows = []
+            counts[label] = 0
+            for obj in model.objects.using(using).order_by().iterator(chunk_size=batch_size):
+                if label == "api.CustomUser":
+                    obj.password = unusable_password
+                rows.append(obj)
+                if len(rows) >= batch_size:
+                    copy_rows(model, rows)
+                    counts[label] += len(rows)
+                    rows = []
+            if rows:
+                copy_rows(model, rows)
+                counts[label] += len(rows)
+    finally:
+        connections[EXPORT_ALIAS].close()
+        del connections[EXPORT_ALIAS]
+        del connections.settings[EXPORT_ALIAS]
+
+    # Planner statistics + a compact single file (no WAL/journal side files)
+    with sqlite3.connect(tmp_path) as db:
+        db.execute("ANALYZE")
+    db = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        db.execute("PRAGMA journal_mode=DELETE")
+        db.execute("VACUUM")
+    finally:
+        db.close()
+
+    os.replace(tmp_path, path)
+    return counts
+
@@ -0,0 +1,51 @@
+from collections import Counter, defaultdict
+
+from cloudinary_storage.storage import MediaCloudinaryStorage # type: ignore
+
+from .timing import timed
+
+
+class TimedStorageMixin:
+    """Count uploads, deletes and existence checks as the ``storage`` phase (api/timing.py)."""
+
+    def _save(self, name, content):
+        with timed("storage"):
+            return super()._save(name, content)
+
+    def _open(self, name, mode="rb"):
+        with timed("storage"):
+            return super()._open(name, mode)
+
+    def delete(self, name):
+        with timed("storage"):
+            return super().delete(name)
+
+    def exists(self, name):
+        with timed("storage"):
+            return super().exists(name)
+
+
+class TimedMediaCloudinaryStorage(TimedStorageMixin, MediaCloudinaryStorage):
+    # Admin API limit of public ids per delete_resources call
+    DELETE_BATCH = 100
+
+    def delete_many(self, names):
+        """
+        Delete ``names`` with one Admin API call per resource type and
+        ``DELETE_BATCH``. Returns a ``Counter`` of the per-file results
+        (``"deleted"``, ``"not_found"``, ...).
+        """
+        import cloudinary.api
+
+        by_type = defaultdict(list)
+        for name in names:
+            by_type[self._get_resource_type(name)].append(name)
+
+        results = Counter()
+        for resource_type, group in by_type.items():
+            for start in range(0, len(group), self.DELETE_BATCH):
+                batch = group[start:start + self.DELETE_BATCH]
+                with timed("storage"):
+                    response = cloudinary.api.delete_resources(batch, resource_type=resource_type, invalidate=True)
+                results.update(response.get("deleted", {}).values())
+        return results
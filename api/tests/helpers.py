@@ -0,0 +1,68 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.models import CustomUser, Resume
+
+# Uploads without Cloudinary credentials
+IN_MEMORY_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+# The page-view flusher writes from its own thread, outside the test transaction.
+# No sampled Server-Timing either: its log lines would land in the test output.
+@override_settings(PAGE_VIEWS={"ENABLED": False}, SERVER_TIMING={"SAMPLE_RATE": 0.0})
+class APITestCase(TestCase):
+    """
+    An editor with an authenticated client (``self.editor``) next to an
+    anonymous one (``self.client``). Writes run their on-commit work
+    (``content_changed``, related posts) before returning.
+    """
+
+    client_class = APIClient
+
+    def setUp(self):
+        # Content versions and cached payloads outlive the rolled back rows
+        cache.clear()
+        self.user = self.make_user("editor@example.com")
+        self.editor = APIClient()
+        self.editor.force_authenticate(self.user)
+
+    def make_user(self, email, **fields):
+        return CustomUser.objects.create_user(email=email, password="correct-horse-battery", **fields)
+
+    def make_resume(self, user):
+        return Resume.objects.create(
+            user=user, name="Ada", title="Engineer", email=user.email, phone_number="1", location="London", bio="..."
+        )
+
+    def create_blog(self, title="Post", category="python", tags=(), blocks=(), client=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = (client or self.editor).post("/api/blogs/", {
+                "title": title,
+                "description": "...",
+                "category": category,
+                "user": str(self.user.pk),
+                "tags": json.dumps(list(tags)),
+                "blocks": json.dumps(list(blocks)),
+            })
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["data"]["id"]
+
+    def update_blog(self, blog_id, **fields):
+        for name in ("tags", "blocks"):
+            if name in fields:
+                fields[name] = json.dumps(fields[name])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.editor.patch(f"/api/blog-post/{blog_id}/", fields, format="multipart")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["data"]
+
+    def delete_blog(self, blog_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.editor.delete(f"/api/blog-post/{blog_id}/")
+        self.assertEqual(response.status_code, 204, response.content)
@@ -0,0 +1,51 @@
+from unittest import mock
+
+from api.admin import EstimatedCountPaginator
+from api.models import Blog, BlogBlock
+
+from .helpers import APITestCase
+
+
+class BlogAdminTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_user("admin@example.com", is_staff=True, is_superuser=True)
+        self.client.force_login(self.admin)
+        self.blog_id = self.create_blog("Django ORM", category="Python", blocks=[
+            {"type": "text", "content": "one two"}, {"type": "text", "content": "three"},
+        ])
+        self.create_blog("Django views", category="web")
+
+    def test_the_count_is_estimated_for_big_unfiltered_tables(self):
+        self.create_blog("Django admin")
+        Blog.objects.filter(category="web").delete()
+        with mock.patch.object(EstimatedCountPaginator, "EXACT_BELOW", 2):
+            # SQLite's estimate is the highest rowid, deleted rows included
+            self.assertEqual(EstimatedCountPaginator(Blog.objects.all(), 10).count, 3)
+            self.assertEqual(EstimatedCountPaginator(Blog.objects.filter(category="Python"), 10).count, 1)
+        self.assertEqual(EstimatedCountPaginator(Blog.objects.all(), 10).count, 2)
+
+    def test_the_category_filter_matches_case_insensitively(self):
+        response = self.client.get("/admin/api/blog/", {"category": "PYTHON"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([blog.title for blog in response.context["cl"].result_list], ["Django ORM"])
+        category_filter = response.context["cl"].filter_specs[0]
+        self.assertEqual([value for value, _ in category_filter.lookup_choices], ["Python", "web"])
+
+    def test_block_edits_refresh_the_blog_summary(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/admin/api/blogblock/add/", {
+                "blog": self.blog_id, "type": BlogBlock.TEXT, "content": "four five", "order": 5,
+            })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Blog.objects.get(pk=self.blog_id).word_count, 5)
+
+        block = BlogBlock.objects.get(blog_id=self.blog_id, order=5)
+        added = Blog.objects.get(pk=self.blog_id).updated_at
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"/admin/api/blogblock/{block.pk}/delete/", {"post": "yes"})
+        self.assertEqual(response.status_code, 302)
+        refreshed = Blog.objects.get(pk=self.blog_id)
+        self.assertEqual(refreshed.word_count, 3)
+        # Block deletes send no content change, the admin does
+        self.assertGreater(refreshed.updated_at, added)
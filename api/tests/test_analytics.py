@@ -0,0 +1,95 @@
+import threading
+import time
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from api.analytics import EPOCH, SECONDS_PER_DAY, PageViewBuffer, add_counts, page_views
+from api.changes import BLOG, RESUME
+from api.models import PageViewDaily
+
+from .helpers import APITestCase
+
+
+def today():
+    return int(time.time() // SECONDS_PER_DAY)
+
+
+class PageViewBufferTests(SimpleTestCase):
+    def test_hits_are_summed_per_object_and_day(self):
+        buffer = PageViewBuffer()
+        object_id = uuid.uuid4()
+        for hit in [(BLOG, object_id), (BLOG, str(object_id)), (RESUME, object_id)]:
+            buffer.hits.append((*hit, 5))
+        self.assertEqual(buffer.drain(), {(BLOG, str(object_id), 5): 2, (RESUME, str(object_id), 5): 1})
+        self.assertFalse(buffer.hits)
+
+    def test_failed_flushes_are_retried(self):
+        buffer = PageViewBuffer()
+        buffer.hits.append((BLOG, "a", 5))
+        with mock.patch("api.analytics.add_counts", side_effect=RuntimeError("down")), self.assertLogs("api.analytics"):
+            self.assertEqual(buffer.flush(), 0)
+        buffer.hits.append((BLOG, "a", 5))
+        with mock.patch("api.analytics.add_counts") as add:
+            self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(add.call_args.args[0], {(BLOG, "a", 5): 2})
+
+    @override_settings(PAGE_VIEWS={"MAX_BUFFER": 3})
+    def test_an_overflow_drops_the_oldest_hits(self):
+        buffer = PageViewBuffer()
+        with mock.patch("api.analytics.threading.Thread"):
+            for object_id in "abcde":
+                buffer.record(BLOG, object_id)
+        self.assertEqual([hit[1] for hit in buffer.hits], ["c", "d", "e"])
+
+    @override_settings(PAGE_VIEWS={"FLUSH_INTERVAL": 60.0, "FLUSH_AT": 3})
+    def test_the_flusher_wakes_up_early_when_hits_pile_up(self):
+        buffer = PageViewBuffer()
+        flushed = threading.Event()
+        with mock.patch.object(buffer, "flush", side_effect=lambda: flushed.set()):
+            for object_id in "abc":
+                buffer.record(BLOG, object_id)
+            # Long before the 60s interval
+            self.assertTrue(flushed.wait(5))
+            buffer.stop()
+        self.assertFalse(buffer.thread.is_alive())
+
+
+class PageViewCountTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        page_views.drain()
+        # Forget the (mocked) flusher thread started by record()
+        self.addCleanup(setattr, page_views, "pid", None)
+
+    def views(self):
+        return {(row.kind, str(row.object_id)): row.views for row in PageViewDaily.objects.all()}
+
+    def test_add_counts_upserts(self):
+        first, second = str(uuid.uuid4()), str(uuid.uuid4())
+        add_counts({(BLOG, first, today()): 2, (BLOG, second, today()): 1})
+        add_counts({(BLOG, first, today()): 3})
+        self.assertEqual(self.views(), {(BLOG, first): 5, (BLOG, second): 1})
+        self.assertEqual(PageViewDaily.objects.get(object_id=first).day, EPOCH + timedelta(days=today()))
+
+    @override_settings(PAGE_VIEWS={"ENABLED": True})
+    def test_recorded_views_are_flushed_into_the_daily_counts(self):
+        blog_id = self.create_blog()
+        with mock.patch("api.analytics.threading.Thread"):
+            for _ in range(3):
+                self.assertEqual(self.client.get(f"/api/blog-post/{blog_id}/").status_code, 200)
+        self.assertEqual(self.views(), {})
+
+        self.assertEqual(page_views.flush(), 3)
+        self.assertEqual(self.views(), {(BLOG, blog_id): 3})
+
+    @override_settings(PAGE_VIEWS={"ENABLED": True, "BACKGROUND": False})
+    def test_views_are_written_inline_without_a_background_thread(self):
+        blog_id = self.create_blog()
+        with mock.patch("api.analytics.threading.Thread") as thread:
+            self.client.get(f"/api/blog-post/{blog_id}/")
+            self.client.get(f"/api/blog-post/{blog_id}/")
+        thread.assert_not_called()
+        self.assertEqual(self.views(), {(BLOG, blog_id): 2})
@@ -0,0 +1,63 @@
+from django.utils import timezone
+
+from api.archive import rebuild_archive
+from api.models import BlogArchiveCount
+
+from .helpers import APITestCase
+
+
+class ArchiveCountTests(APITestCase):
+    def archive(self):
+        response = self.client.get("/api/blogs/archive/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        return (
+            data["total"],
+            {item["category"]: item["count"] for item in data["categories"]},
+            {item["tag"]: item["count"] for item in data["tags"]},
+        )
+
+    def test_counts_follow_creates(self):
+        self.create_blog(category="python", tags=["django", "orm"])
+        self.create_blog(category="python", tags=["django"])
+        self.create_blog(category="go", tags=[])
+
+        total, categories, tags = self.archive()
+        self.assertEqual(total, 3)
+        self.assertEqual(categories, {"python": 2, "go": 1})
+        self.assertEqual(tags, {"django": 2, "orm": 1})
+        month = timezone.localtime().strftime("%Y-%m")
+        self.assertEqual(BlogArchiveCount.objects.get(dimension=BlogArchiveCount.MONTH, value=month).count, 3)
+
+    def test_counts_follow_edits(self):
+        blog_id = self.create_blog(category="python", tags=["django"])
+        self.create_blog(category="python", tags=["django"])
+        self.archive()
+
+        self.update_blog(blog_id, category="go", tags=["gin"])
+        total, categories, tags = self.archive()
+        self.assertEqual(total, 2)
+        self.assertEqual(categories, {"python": 1, "go": 1})
+        self.assertEqual(tags, {"django": 1, "gin": 1})
+
+    def test_counts_follow_deletes(self):
+        blog_id = self.create_blog(category="go", tags=["gin"])
+        self.create_blog(category="python", tags=["django"])
+        self.archive()
+
+        self.delete_blog(blog_id)
+        total, categories, tags = self.archive()
+        self.assertEqual(total, 1)
+        self.assertEqual(categories, {"python": 1})
+        self.assertEqual(tags, {"django": 1})
+        # Rows that reach zero are removed
+        self.assertFalse(BlogArchiveCount.objects.filter(value__in=["go", "gin"]).exists())
+
+    def test_incremental_counts_match_a_rebuild(self):
+        first = self.create_blog(category="python", tags=["django", "orm"])
+        self.create_blog(category="go", tags=["gin", "orm"])
+        self.update_blog(first, tags=["django"])
+        rows = set(BlogArchiveCount.objects.values_list("dimension", "value", "count"))
+
+        rebuild_archive()
+        self.assertEqual(set(BlogArchiveCount.objects.values_list("dimension", "value", "count")), rows)
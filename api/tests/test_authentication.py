@@ -0,0 +1,65 @@
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from api.authentication import user_cache
+from api.models import CustomUser
+
+from .helpers import APITestCase
+
+MODES = ("db", "cache", "claims")
+
+
+class TokenRevocationTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        user_cache.clear()
+
+    def token_client(self):
+        response = self.client.post("/api/token/", {"email": self.user.email, "password": "correct-horse-battery"})
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['access']}")
+        return client
+
+    def status(self, client):
+        return client.get("/api/resumes/").status_code
+
+    def test_a_valid_token_is_accepted_in_every_mode(self):
+        client = self.token_client()
+        for mode in MODES:
+            with self.subTest(mode=mode), override_settings(JWT_USER_RESOLUTION={"MODE": mode}):
+                self.assertEqual(self.status(client), 200)
+
+    def test_a_password_change_revokes_issued_tokens(self):
+        client = self.token_client()
+        self.user.set_password("another-horse-battery")
+        self.user.save()
+        for mode in MODES:
+            with self.subTest(mode=mode), override_settings(JWT_USER_RESOLUTION={"MODE": mode}):
+                self.assertEqual(self.status(client), 401)
+
+    def test_deactivating_a_user_revokes_issued_tokens(self):
+        client = self.token_client()
+        self.user.is_active = False
+        self.user.save()
+        for mode in MODES:
+            with self.subTest(mode=mode), override_settings(JWT_USER_RESOLUTION={"MODE": mode}):
+                self.assertEqual(self.status(client), 401)
+
+    def test_a_change_made_by_another_worker_is_seen_in_claims_mode(self):
+        client = self.token_client()
+        with override_settings(JWT_USER_RESOLUTION={"MODE": "claims"}):
+            self.assertEqual(self.status(client), 200)
+            # Another process changed the password: no signal ran here, and the
+            # per-process cache of this one never learns the new version
+            self.user.set_password("another-horse-battery")
+            CustomUser.objects.filter(pk=self.user.pk).update(password=self.user.password)
+            user_cache.clear()
+            self.assertEqual(self.status(client), 401)
+
+    def test_claims_mode_checks_the_version_once_per_ttl(self):
+        client = self.token_client()
+        with override_settings(JWT_USER_RESOLUTION={"MODE": "claims"}):
+            self.status(client)
+            with self.assertNumQueries(1):
+                # Only the view's own resume query
+                self.assertEqual(self.status(client), 200)
@@ -0,0 +1,66 @@
+import io
+import json
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from api.benchmarks import generate_portfolio, percentile, summarize
+from api.management.commands.benchmark_endpoints import BENCHMARK_SETTINGS, ENDPOINTS, Command
+from api.models import Blog, BlogBlock, Resume, SliderGallery
+
+from .helpers import APITestCase
+
+
+class SummaryTests(SimpleTestCase):
+    def test_percentiles_use_the_nearest_rank(self):
+        samples = list(range(100, 0, -1))
+        self.assertEqual([percentile(samples, pct) for pct in (50, 95, 99, 100)], [50, 95, 99, 100])
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summarize(self):
+        self.assertEqual(summarize([1, 2, 3, 4]), {
+            "mean_ms": 2.5, "p50_ms": 2, "p95_ms": 4, "p99_ms": 4, "max_ms": 4,
+        })
+
+    def test_unknown_endpoints_are_refused(self):
+        with self.assertRaisesMessage(CommandError, "Unknown endpoints: nope"):
+            call_command("benchmark_endpoints", "--endpoints", "blog_list,nope")
+
+
+@override_settings(**BENCHMARK_SETTINGS)
+class BenchmarkTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.dataset = generate_portfolio(
+            experiences=2, skills=3, gallery_images=1, blogs=5, blocks=3, tags=2, comments=1, categories=2, seed=1,
+        )
+        self.command = Command(stdout=io.StringIO(), stderr=io.StringIO())
+
+    def test_synthetic_data_matches_the_scale(self):
+        self.assertEqual(Resume.objects.get().experiences.count(), 2)
+        self.assertEqual(SliderGallery.objects.get().image_width, 64)
+        self.assertEqual(Blog.objects.count(), 5)
+        self.assertEqual(BlogBlock.objects.count(), 15)
+        blog = Blog.objects.get(pk=self.dataset["blog_id"])
+        self.assertEqual(len(blog.tags), 2)
+        # Block summaries are filled in like an API write would
+        self.assertEqual(blog.word_count, sum(
+            len((block.content or "").split()) for block in blog.blocks.all()
+        ))
+
+    def test_every_endpoint_succeeds(self):
+        for name in ENDPOINTS:
+            with self.subTest(endpoint=name):
+                result = self.command.measure(name, self.dataset, iterations=2, warmup=0)
+                self.assertEqual(set(result["status_codes"]), {"200"})
+                self.assertGreater(result["queries"], 0)
+
+    def test_compare_reports_the_p95_change(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as previous:
+            json.dump({"results": [{"endpoint": "blog_list", "p95_ms": 10.0, "queries": 4}]}, previous)
+            previous.flush()
+            deltas = self.command.compare(previous.name, [{"endpoint": "blog_list", "p95_ms": 12.0, "queries": 3}])
+        self.assertEqual(deltas["blog_list"]["p95_change_pct"], 20.0)
+        self.assertEqual((deltas["blog_list"]["queries_before"], deltas["blog_list"]["queries_after"]), (4, 3))
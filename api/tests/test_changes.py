@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.changes import BLOG, mark_changed
+from api.models import Blog, Resume
+
+from .helpers import APITestCase
+
+OLD = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+class UpdatedAtTests(APITestCase):
+    """Parents keep a meaningful updated_at for incremental publish_static runs."""
+
+    def touches(self, table, request):
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                request()
+        touch = f'UPDATE "{table}" SET "updated_at"'
+        return sum(query["sql"].startswith(touch) for query in queries.captured_queries)
+
+    def test_a_saved_parent_is_not_touched_again(self):
+        blog_id = self.create_blog("Django ORM", blocks=[{"type": "text", "content": "one"}])
+        self.assertEqual(self.touches("api_blog", lambda: self.update_blog(blog_id, title="Renamed")), 0)
+
+    def test_a_child_write_touches_its_parent_once(self):
+        resume = self.make_resume(self.user)
+        Resume.objects.filter(pk=resume.pk).update(updated_at=OLD)
+        url = f"/api/resumes/{resume.pk}/hobbies/"
+
+        touches = self.touches("api_resume", lambda: self.editor.post(url, {"name": "Chess", "icon": "x"}, format="json"))
+        self.assertEqual(touches, 1)
+        self.assertTrue(resume.hobbies.exists())
+        self.assertGreater(Resume.objects.get(pk=resume.pk).updated_at, OLD)
+
+    def test_imported_rows_keep_their_timestamps(self):
+        blog_id = self.create_blog("Django ORM")
+        Blog.objects.filter(pk=blog_id).update(updated_at=OLD)
+        # What the importer sends for bulk-created rows
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_changed(BLOG, blog_id)
+        self.assertEqual(Blog.objects.get(pk=blog_id).updated_at, OLD)
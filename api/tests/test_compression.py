@@ -0,0 +1,77 @@
+import gzip
+from unittest import mock
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.test import SimpleTestCase
+
+from api import compression
+from api.compression import compressed_cache, is_compressible, negotiate
+
+from .helpers import APITestCase
+
+
+class NegotiationTests(SimpleTestCase):
+    def test_highest_q_value_wins(self):
+        with mock.patch.object(compression, "brotli", object()):
+            self.assertEqual(negotiate("gzip;q=0.5, br;q=0.8"), "br")
+            self.assertEqual(negotiate("gzip, br;q=0.5"), "gzip")
+            # Ties go to brotli
+            self.assertEqual(negotiate("gzip, br"), "br")
+
+    def test_q_zero_refuses_an_encoding(self):
+        with mock.patch.object(compression, "brotli", object()):
+            self.assertEqual(negotiate("gzip, br;q=0"), "gzip")
+            self.assertEqual(negotiate("br;q=0, *"), "gzip")
+            self.assertIsNone(negotiate("gzip;q=0, br;q=0.0"))
+
+    def test_wildcard_and_identity(self):
+        with mock.patch.object(compression, "brotli", object()):
+            self.assertEqual(negotiate("*"), "br")
+            self.assertIsNone(negotiate("identity"))
+            self.assertIsNone(negotiate(""))
+            self.assertIsNone(negotiate("*;q=0"))
+
+    def test_gzip_only_without_brotli(self):
+        with mock.patch.object(compression, "brotli", None):
+            self.assertEqual(negotiate("br, gzip;q=0.1"), "gzip")
+            self.assertIsNone(negotiate("br"))
+
+    def test_malformed_q_values_count_as_refused(self):
+        self.assertIsNone(negotiate("gzip;q=high"))
+
+    def test_responses_setting_the_csrf_cookie_are_not_compressed(self):
+        response = JsonResponse({"token": "x" * 1000})
+        self.assertTrue(is_compressible(response))
+        response.set_cookie(settings.CSRF_COOKIE_NAME, "secret")
+        self.assertFalse(is_compressible(response))
+
+
+class CompressionMiddlewareTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        compressed_cache.clear()
+        for number in range(5):
+            self.create_blog(f"Post number {number} with a reasonably long title", tags=["django", "orm"])
+
+    def test_json_is_compressed_with_a_weak_etag(self):
+        plain = self.client.get("/api/blogs/")
+        response = self.client.get("/api/blogs/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertTrue(plain["ETag"].startswith('"'))
+        self.assertEqual(response["ETag"], "W/" + plain["ETag"])
+
+    def test_the_weak_etag_revalidates(self):
+        response = self.client.get("/api/blogs/", HTTP_ACCEPT_ENCODING="gzip")
+        revalidated = self.client.get(
+            "/api/blogs/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b"")
+
+    def test_identity_gets_the_plain_body(self):
+        response = self.client.get("/api/blogs/", HTTP_ACCEPT_ENCODING="identity")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", response["Vary"])
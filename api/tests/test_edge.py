@@ -0,0 +1,105 @@
+from django.test import override_settings
+
+from api.edge import purger
+from api.models import Experience
+
+from .helpers import APITestCase
+
+RECORDING = {"ENABLED": True, "PURGE_BACKEND": "api.edge.RecordingPurger"}
+
+
+@override_settings(EDGE_CACHE=RECORDING)
+class PurgeOnWriteTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.purged = purger()
+        self.purged.clear()
+
+    def test_blog_create_purges_the_blog_and_lists_once(self):
+        blog_id = self.create_blog(blocks=[{"type": "text", "content": "one"}, {"type": "text", "content": "two"}])
+        self.assertEqual(list(self.purged.calls), [(f"blog:{blog_id}", "blogs")])
+
+    def test_blog_update_purges_the_blog_and_lists(self):
+        blog_id = self.create_blog()
+        self.purged.clear()
+        self.update_blog(blog_id, title="Renamed")
+        self.assertEqual(self.purged.purged, {f"blog:{blog_id}", "blogs"})
+
+    def test_blog_delete_purges_the_blog_and_lists(self):
+        blog_id = self.create_blog()
+        self.purged.clear()
+        self.delete_blog(blog_id)
+        self.assertEqual(self.purged.purged, {f"blog:{blog_id}", "blogs"})
+
+    def test_resume_section_writes_purge_the_resume(self):
+        resume = self.make_resume(self.user)
+        self.purged.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.editor.post(f"/api/resumes/{resume.pk}/experiences/", {
+                "title": "Engineer", "company": "Acme", "start_date": "2020-01-01", "description": "...",
+            }, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(list(self.purged.calls), [(f"resume:{resume.pk}",)])
+
+        self.purged.clear()
+        item = Experience.objects.get(resume=resume)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.editor.delete(f"/api/resumes/{resume.pk}/experiences/{item.pk}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(list(self.purged.calls), [(f"resume:{resume.pk}",)])
+
+    def test_reads_purge_nothing(self):
+        blog_id = self.create_blog()
+        self.purged.clear()
+        self.client.get("/api/blogs/")
+        self.client.get(f"/api/blog-post/{blog_id}/")
+        self.assertEqual(list(self.purged.calls), [])
+
+
+@override_settings(EDGE_CACHE=RECORDING)
+class EdgeHeaderTests(APITestCase):
+    def test_each_endpoint_gets_its_policy_and_keys(self):
+        blog_id = self.create_blog()
+        resume = self.make_resume(self.user)
+        cases = [
+            (f"/api/blog-post/{blog_id}/", "max-age=0", f"blog:{blog_id}"),
+            (f"/api/blog-post/{blog_id}/?include=related", "max-age=0", f"blog:{blog_id} blogs"),
+            ("/api/blogs/", "max-age=30", "blogs"),
+            ("/api/blogs/archive/", "max-age=300", "blogs"),
+            (f"/api/resumes/{resume.pk}/", "max-age=0", f"resume:{resume.pk}"),
+            (f"/api/portfolio/{resume.pk}/", "max-age=60", f"resume:{resume.pk} blogs"),
+        ]
+        for path, max_age, keys in cases:
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("public", response["Cache-Control"])
+                self.assertIn(max_age, response["Cache-Control"])
+                # Purgeable: the edge keeps it for PURGED_TTL
+                self.assertIn("s-maxage=86400", response["Cache-Control"])
+                self.assertEqual(response["Surrogate-Key"], keys)
+
+    def test_credentialed_reads_are_private(self):
+        self.client.force_login(self.user)
+        response = self.client.get("/api/blogs/")
+        self.assertIn("private", response["Cache-Control"])
+        self.assertFalse(response.has_header("Surrogate-Key"))
+
+    def test_unchanged_content_revalidates_with_304(self):
+        blog_id = self.create_blog()
+        response = self.client.get(f"/api/blog-post/{blog_id}/")
+        etag = response["ETag"]
+
+        revalidated = self.client.get(f"/api/blog-post/{blog_id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b"")
+        self.assertEqual(revalidated["Cache-Control"], response["Cache-Control"])
+
+        self.update_blog(blog_id, title="Renamed")
+        changed = self.client.get(f"/api/blog-post/{blog_id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+
+    @override_settings(EDGE_CACHE={"ENABLED": True, "PURGE_BACKEND": None})
+    def test_without_a_purge_backend_the_edge_ttl_is_short(self):
+        response = self.client.get("/api/blogs/")
+        self.assertIn("s-maxage=60", response["Cache-Control"])
@@ -0,0 +1,36 @@
+import io
+import re
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import override_settings
+
+from api.benchmarks import generate_portfolio
+from api.management.commands.explain_queries import Command
+from api.models import Blog
+
+from .helpers import IN_MEMORY_STORAGES, APITestCase
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+class ExplainQueriesTests(APITestCase):
+    def test_the_read_endpoints_use_indexes(self):
+        generate_portfolio(experiences=2, skills=2, gallery_images=0, blogs=30, blocks=2, comments=0, categories=3)
+        output = io.StringIO()
+        call_command("explain_queries", "--existing", "--fail-on-scan", stdout=output)
+        self.assertIn("No unindexed scans or sorts in 9 endpoints", output.getvalue())
+        self.assertEqual(set(re.findall(r"-> (\d+),", output.getvalue())), {"200"})
+
+    def test_unindexed_lookups_are_reported(self):
+        queryset = Blog.objects.filter(description="...").order_by("likes_count")[:5]
+        sql, params = queryset.query.sql_with_params()
+        command = Command()
+        problems = command.problems(sql, command.explain(sql, params))
+        if connection.vendor == "sqlite":
+            self.assertEqual(problems, ["full scan of api_blog", "sort without an index before LIMIT"])
+        else:
+            self.assertIn("full scan of api_blog", problems)
+
+    def test_existing_needs_data(self):
+        with self.assertRaisesMessage(CommandError, "--existing needs at least one resume and one blog"):
+            call_command("explain_queries", "--existing", stdout=io.StringIO())
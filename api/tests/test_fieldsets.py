@@ -0,0 +1,59 @@
+from .helpers import APITestCase
+
+
+class SparseFieldsTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.resume = self.make_resume(self.user)
+        self.resume.tech_skills.create(name="Python", level=9)
+        self.resume.hobbies.create(name="Chess", icon="x")
+        self.url = f"/api/resumes/{self.resume.pk}/"
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["data"]
+
+    def test_fields_keep_only_the_named_fields(self):
+        with self.assertNumQueries(1):
+            data = self.get(f"{self.url}?fields=name,title")
+        self.assertEqual(data, {"name": "Ada", "title": "Engineer"})
+
+    def test_include_adds_only_the_named_relations(self):
+        data = self.get(f"{self.url}?include=tech_skills")
+        self.assertEqual([skill["name"] for skill in data["tech_skills"]], ["Python"])
+        self.assertNotIn("hobbies", data)
+        self.assertEqual(data["name"], "Ada")
+
+        data = self.get(f"{self.url}?fields=name,hobbies")
+        self.assertEqual(set(data), {"name", "hobbies"})
+
+    def test_unknown_names_are_refused(self):
+        response = self.client.get(f"{self.url}?fields=name,secret&include=gallery")
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertIn("Unknown fields: secret.", str(errors))
+        self.assertIn("Unknown relations: gallery.", str(errors))
+
+    def test_without_parameters_the_response_is_unchanged(self):
+        data = self.get(self.url)
+        self.assertIn("slider_gallery", data)
+        self.assertEqual([hobby["name"] for hobby in data["hobbies"]], ["Chess"])
+
+    def test_blog_reads(self):
+        self.create_blog("Django ORM", tags=["django"], blocks=[{"type": "text", "content": "one two"}])
+        self.create_blog("Django views", tags=["django"])
+        blogs = self.get("/api/blogs/?fields=title")
+        self.assertEqual(blogs, [{"title": "Django views"}, {"title": "Django ORM"}])
+
+        blog_id = self.create_blog("Django admin", tags=["django"])
+        self.assertNotIn("related", self.get(f"/api/blog-post/{blog_id}/"))
+        related = self.get(f"/api/blog-post/{blog_id}/?fields=title&include=related")["related"]
+        self.assertEqual(len(related), 2)
+
+    def test_the_portfolio_bundle_applies_the_selection_to_the_resume(self):
+        url = f"/api/portfolio/{self.resume.pk}/"
+        self.assertEqual(self.get(f"{url}?fields=name")["resume"], {"name": "Ada"})
+        # Cached separately from the full bundle
+        self.assertIn("hobbies", self.get(url)["resume"])
+        self.assertEqual(self.client.get(f"{url}?include=nope").status_code, 400)
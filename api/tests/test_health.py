@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from api.health import API_ROOT_PAYLOAD, HEALTH_PAYLOAD, deep_health
+from api.views import HealthCheckView
+
+from .helpers import APITestCase
+
+
+class FastPathTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        deep_health.clear()
+        self.addCleanup(deep_health.clear)
+
+    def test_health_and_root_skip_the_stack(self):
+        for path, payload in (("/api/health/", HEALTH_PAYLOAD), ("/api/", API_ROOT_PAYLOAD)):
+            with self.subTest(path=path), self.assertNumQueries(0):
+                response = self.client.get(path, HTTP_AUTHORIZATION="Bearer not-a-token")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), payload)
+                self.assertEqual(response["X-Content-Type-Options"], "nosniff")
+                self.assertNotIn("Set-Cookie", response)
+
+    def test_head_has_no_body(self):
+        response = self.client.head("/api/health/")
+        self.assertEqual(response.content, b"")
+        self.assertEqual(int(response["Content-Length"]), len(self.client.get("/api/health/").content))
+
+    def test_the_view_returns_the_same_json(self):
+        response = HealthCheckView.as_view()(APIRequestFactory().get("/api/health/"))
+        self.assertEqual(response.data, self.client.get("/api/health/").json())
+
+    def test_other_methods_reach_the_views(self):
+        self.assertEqual(self.client.post("/api/health/").status_code, 405)
+
+    def test_deep_health_reports_failing_probes(self):
+        probe = mock.Mock(side_effect=OSError("unreachable"))
+        with mock.patch.dict("api.health.PROBES", storage=probe):
+            response = self.client.get("/api/health/?deep=1")
+            self.client.get("/api/health/?deep=1")
+        self.assertEqual(response.status_code, 503)
+        checks = response.json()["checks"]
+        self.assertTrue(checks["database"]["ok"])
+        self.assertEqual(checks["storage"]["error"], "unreachable")
+        # Reused for HEALTH_CHECK["TTL"] seconds
+        self.assertEqual(probe.call_count, 1)
+
+    @override_settings(HEALTH_CHECK={"DEEP": True, "TTL": 0})
+    def test_deep_by_default(self):
+        with mock.patch.dict("api.health.PROBES", storage=lambda: None):
+            response = self.client.get("/api/health/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()["checks"]), {"database", "storage"})
@@ -0,0 +1,86 @@
+import base64
+import io
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+
+from api.images import PLACEHOLDER_SIZE, read_image_metadata
+from api.models import Blog, BlogBlock, SliderGallery
+
+from .helpers import IN_MEMORY_STORAGES, APITestCase
+
+
+def jpeg(width, height, orientation=None):
+    buffer = io.BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    Image.new("RGB", (width, height), (200, 10, 10)).save(buffer, format="JPEG", exif=exif)
+    return SimpleUploadedFile("photo.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+
+class ImageMetadataTests(SimpleTestCase):
+    def test_placeholder_is_a_tiny_jpeg(self):
+        width, height, placeholder = read_image_metadata(jpeg(300, 200))
+        self.assertEqual((width, height), (300, 200))
+        prefix, encoded = placeholder.split(",", 1)
+        self.assertEqual(prefix, "data:image/jpeg;base64")
+        with Image.open(io.BytesIO(base64.b64decode(encoded))) as preview:
+            self.assertEqual(preview.width, PLACEHOLDER_SIZE)
+            self.assertLess(preview.height, preview.width)
+
+    def test_exif_rotation_swaps_the_dimensions(self):
+        width, height, placeholder = read_image_metadata(jpeg(300, 200, orientation=6))
+        self.assertEqual((width, height), (200, 300))
+        with Image.open(io.BytesIO(base64.b64decode(placeholder.split(",", 1)[1]))) as preview:
+            self.assertGreater(preview.height, preview.width)
+
+    def test_unreadable_files_have_no_metadata(self):
+        upload = SimpleUploadedFile("photo.jpg", b"not an image")
+        with self.assertLogs("api.images", "WARNING"):
+            self.assertEqual(read_image_metadata(upload), (None, None, ""))
+        # Rewound for storage
+        self.assertEqual(upload.read(), b"not an image")
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+class StoredMetadataTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.resume = self.make_resume(self.user)
+
+    def test_uploads_store_their_metadata(self):
+        image = SliderGallery.objects.create(resume=self.resume, image=jpeg(50, 80))
+        self.assertEqual((image.image_width, image.image_height), (50, 80))
+
+        gallery = self.client.get(f"/api/resumes/{self.resume.pk}/").json()["data"]["slider_gallery"]
+        self.assertTrue(gallery[0]["image"].endswith(image.image.url))
+        self.assertEqual((gallery[0]["width"], gallery[0]["height"]), (50, 80))
+        self.assertEqual(gallery[0]["placeholder"], image.image_placeholder)
+
+    def test_only_image_blocks_are_decoded(self):
+        blog = Blog.objects.create(user=self.user, title="Post", description="...", category="python")
+        image = BlogBlock.objects.create(blog=blog, type=BlogBlock.IMAGE, media_file=jpeg(10, 20))
+        video = BlogBlock.objects.create(blog=blog, type=BlogBlock.VIDEO, media_file=jpeg(10, 20), order=1)
+        self.assertEqual((image.media_width, image.media_height), (10, 20))
+        self.assertEqual((video.media_width, video.media_placeholder), (None, ""))
+
+    def test_backfill_fills_in_rows_without_metadata(self):
+        missing = SliderGallery.objects.create(resume=self.resume, image=jpeg(50, 80))
+        stored = SliderGallery.objects.create(resume=self.resume, image=jpeg(30, 30))
+        SliderGallery.objects.filter(pk=missing.pk).update(image_width=None, image_height=None, image_placeholder="")
+        SliderGallery.objects.filter(pk=stored.pk).update(image_width=1)
+
+        output = io.StringIO()
+        call_command("backfill_image_metadata", stdout=output)
+        self.assertIn("SliderGallery.image: 1 updated, 0 skipped", output.getvalue())
+
+        missing.refresh_from_db()
+        self.assertEqual((missing.image_width, missing.image_height), (50, 80))
+        self.assertTrue(missing.image_placeholder.startswith("data:image/jpeg"))
+        self.assertEqual(SliderGallery.objects.get(pk=stored.pk).image_width, 1)
+
+        call_command("backfill_image_metadata", "--force", stdout=output)
+        self.assertEqual(SliderGallery.objects.get(pk=stored.pk).image_width, 30)
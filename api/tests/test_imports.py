@@ -0,0 +1,68 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from api.management.commands.profile_imports import COLD_START_SNIPPET, parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   api.images
+import time:      3000 |       9000 | api.serializers
+import time:      2000 |       2000 | json
+"""
+
+# Kept off the cold start: imported when first needed
+LAZY_MODULES = ("mongoengine", "pymongo", "mongomock", "PIL")
+
+
+def finished(stdout="COLD_START_MS=50.0\n", stderr=IMPORTTIME, returncode=0):
+    return subprocess.CompletedProcess([], returncode, stdout=stdout, stderr=stderr)
+
+
+class ProfileImportsTests(SimpleTestCase):
+    def profile(self, *args, **run):
+        output = io.StringIO()
+        with mock.patch("subprocess.run", return_value=finished(**run)):
+            call_command("profile_imports", "--json", *args, stdout=output)
+        # The JSON report is followed by the budget line
+        return json.JSONDecoder().raw_decode(output.getvalue())[0]
+
+    def test_parse_importtime(self):
+        self.assertEqual(parse_importtime(IMPORTTIME), [
+            ("api.images", 120, 120, 1), ("api.serializers", 3000, 9000, 0), ("json", 2000, 2000, 0),
+        ])
+
+    def test_report_ranks_top_level_imports_and_packages(self):
+        report = self.profile("--budget-ms", "100")
+        self.assertEqual((report["cold_start_ms"], report["import_ms"]), (50.0, 11.0))
+        self.assertEqual([entry["module"] for entry in report["modules"]], ["api.serializers", "json"])
+        self.assertEqual(report["packages"][0], {"package": "api", "self_ms": 3.1})
+
+    def test_budgets_are_enforced(self):
+        with self.assertRaisesMessage(CommandError, "cold start 50.0 ms exceeds budget 40.0 ms"):
+            self.profile("--budget-ms", "40")
+        with self.assertRaisesMessage(CommandError, "api.serializers takes 9.0 ms (budget 5.0 ms)"):
+            self.profile("--budget-ms", "100", "--module-budget-ms", "5")
+
+    def test_a_failing_cold_start_is_reported(self):
+        with self.assertRaisesMessage(CommandError, "ImportError: boom"):
+            self.profile(stdout="", stderr="ImportError: boom", returncode=1)
+
+    def test_heavy_integrations_stay_off_the_cold_start(self):
+        check = COLD_START_SNIPPET + f"import sys\nprint([m for m in {LAZY_MODULES!r} if m in sys.modules])\n"
+        result = subprocess.run(
+            [sys.executable, "-c", check],
+            cwd=settings.BASE_DIR,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE),
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.splitlines()[-1], "[]")
@@ -0,0 +1,56 @@
+from importlib.util import find_spec
+from unittest import skipUnless
+
+from django.test import override_settings
+
+from api import mirror
+from api.changes import BLOG, RESUME
+
+from .helpers import APITestCase
+
+
+@skipUnless(find_spec("mongomock"), "mongomock is not installed")
+@override_settings(READ_BACKEND="mongo", MONGODB_MIRROR=True, MONGODB_MOCK=True)
+class MongoMirrorTests(APITestCase):
+    """The read model on an in-process mongomock client (``MONGODB_MOCK``)."""
+
+    def setUp(self):
+        super().setUp()
+        mirror.delete_documents(RESUME)
+        mirror.delete_documents(BLOG)
+
+    def test_blog_writes_are_mirrored_and_served_without_sql(self):
+        blog_id = self.create_blog("Django ORM", tags=["django"], blocks=[{"type": "text", "content": "one two"}])
+        with self.assertNumQueries(0):
+            response = self.client.get(f"/api/blog-post/{blog_id}/")
+        data = response.json()["data"]
+        self.assertEqual((data["title"], data["word_count"]), ("Django ORM", 2))
+        self.assertEqual([block["content"] for block in data["blocks"]], ["one two"])
+
+        self.update_blog(blog_id, title="Renamed", blocks=[])
+        data = self.client.get(f"/api/blog-post/{blog_id}/").json()["data"]
+        self.assertEqual((data["title"], data["blocks"]), ("Renamed", []))
+
+        self.delete_blog(blog_id)
+        self.assertIsNone(mirror.get_blog(blog_id))
+        self.assertEqual(self.client.get(f"/api/blog-post/{blog_id}/").status_code, 404)
+
+    def test_mirrored_blog_matches_the_orm_response(self):
+        blog_id = self.create_blog("Django ORM", tags=["django"], blocks=[{"type": "text", "content": "one"}])
+        mirrored = self.client.get(f"/api/blog-post/{blog_id}/").json()["data"]
+        with override_settings(READ_BACKEND="orm"):
+            from_orm = self.client.get(f"/api/blog-post/{blog_id}/").json()["data"]
+        self.assertEqual(mirrored, from_orm)
+
+    def test_resume_writes_are_mirrored(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resume = self.make_resume(self.user)
+        with self.assertNumQueries(0):
+            response = self.client.get(f"/api/resumes/{resume.pk}/")
+        self.assertEqual(response.json()["data"]["name"], "Ada")
+
+    def test_related_posts_are_read_from_the_orm(self):
+        first = self.create_blog("Django ORM", tags=["django"])
+        second = self.create_blog("Django views", tags=["django"])
+        response = self.client.get(f"/api/blog-post/{first}/?include=related")
+        self.assertEqual([post["id"] for post in response.json()["data"]["related"]], [second])
@@ -0,0 +1,58 @@
+from django.test import override_settings
+
+from .helpers import APITestCase
+
+
+class PortfolioBundleTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.resume = self.make_resume(self.user)
+        self.url = f"/api/portfolio/{self.resume.pk}/"
+        self.create_blog("First", category="python")
+        self.create_blog("Second", category="web")
+
+    def bundle(self, url=None):
+        response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["data"]
+
+    def test_a_cached_bundle_costs_no_queries(self):
+        bundle = self.bundle()
+        self.assertEqual(bundle["resume"]["name"], "Ada")
+        self.assertEqual([post["title"] for post in bundle["posts"]], ["Second", "First"])
+        self.assertEqual(bundle["categories"], [{"category": "python", "count": 1}, {"category": "web", "count": 1}])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.bundle(), bundle)
+
+    def test_blog_writes_invalidate_the_bundle(self):
+        self.bundle()
+        blog_id = self.create_blog("Third", category="python")
+        self.assertEqual(self.bundle()["posts"][0]["title"], "Third")
+
+        self.update_blog(blog_id, title="Renamed")
+        self.assertEqual(self.bundle()["posts"][0]["title"], "Renamed")
+
+        self.delete_blog(blog_id)
+        bundle = self.bundle()
+        self.assertEqual(len(bundle["posts"]), 2)
+        self.assertEqual(bundle["categories"][0], {"category": "python", "count": 1})
+
+    def test_resume_writes_invalidate_the_bundle(self):
+        self.bundle()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.editor.post(
+                f"/api/resumes/{self.resume.pk}/hobbies/", {"name": "Chess", "icon": "x"}, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([hobby["name"] for hobby in self.bundle()["resume"]["hobbies"]], ["Chess"])
+
+    @override_settings(PORTFOLIO_BUNDLE={"MAX_POSTS": 1})
+    def test_the_number_of_posts_is_capped(self):
+        self.assertEqual(len(self.bundle(f"{self.url}?posts=10")["posts"]), 1)
+        self.assertEqual(len(self.bundle(f"{self.url}?posts=0")["posts"]), 0)
+
+    def test_unknown_resumes_are_not_found(self):
+        other = self.make_user("other@example.com")
+        response = self.client.get(f"/api/portfolio/{other.pk}/")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"status": 404, "data": "Resume not found"})
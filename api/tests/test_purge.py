@@ -0,0 +1,140 @@
+from collections import Counter
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase, override_settings
+
+from api.edge import purger
+from api.models import Blog, BlogArchiveCount, BlogBlock, CustomUser, RelatedPost, Resume
+from api.purge import MediaCleanup, purge_content
+from api.storage import TimedMediaCloudinaryStorage
+
+from .helpers import IN_MEMORY_STORAGES, APITestCase
+
+
+@override_settings(
+    EDGE_CACHE={"ENABLED": True, "PURGE_BACKEND": "api.edge.RecordingPurger"},
+    STORAGES=IN_MEMORY_STORAGES,
+    PURGE={"BACKGROUND_MEDIA": False},
+)
+class PurgeContentTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = self.make_user("other@example.com")
+        self.make_resume(self.user)
+        self.make_resume(self.other)
+        self.kept = self.create_blog("Django ORM", tags=["django", "orm"])
+        self.editor.force_authenticate(self.other)
+        self.purged_blog = self.create_blog("Django views", category="web", tags=["django", "orm"])
+        self.editor.force_authenticate(self.user)
+        purger().clear()
+
+    def add_media(self, blog_id, name):
+        block = BlogBlock(blog_id=blog_id, type=BlogBlock.VIDEO, order=9)
+        block.media_file.save(name, ContentFile(b"not really a video"))
+        return block.media_file.name
+
+    def test_purging_everything_empties_every_table(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            report = purge_content()
+
+        for model in (CustomUser, Resume, Blog, BlogBlock, RelatedPost, BlogArchiveCount):
+            self.assertFalse(model.objects.exists(), model.__name__)
+        self.assertEqual(report["deleted"]["api.CustomUser"], 2)
+        self.assertEqual(report["deleted"]["api.Blog"], 2)
+        self.assertEqual(list(purger().calls), [("*",)])
+
+    def test_purging_one_user_keeps_the_others_consistent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            report = purge_content(CustomUser.objects.filter(pk=self.other.pk))
+
+        self.assertEqual(report["deleted"]["api.Blog"], 1)
+        self.assertEqual([str(pk) for pk in Blog.objects.values_list("pk", flat=True)], [self.kept])
+        self.assertTrue(Resume.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Resume.objects.filter(pk=self.other.pk).exists())
+        # The remaining post no longer lists the purged one
+        self.assertFalse(RelatedPost.objects.filter(related_id=self.purged_blog).exists())
+        counts = dict(BlogArchiveCount.objects.values_list("value", "count"))
+        self.assertEqual((counts["django"], counts["orm"], counts.get("web")), (1, 1, None))
+        self.assertEqual(
+            purger().purged, {f"resume:{self.other.pk}", f"blog:{self.purged_blog}", "blogs"}
+        )
+
+    def test_purged_media_is_deleted_and_kept_media_is_not(self):
+        purged_file = self.add_media(self.purged_blog, "purged.mp4")
+        kept_file = self.add_media(self.kept, "kept.mp4")
+
+        # Deleted on commit, i.e. when this block exits
+        with self.captureOnCommitCallbacks(execute=True):
+            report = purge_content(CustomUser.objects.filter(pk=self.other.pk))
+
+        self.assertEqual(report["files"], 1)
+        self.assertFalse(default_storage.exists(purged_file))
+        self.assertTrue(default_storage.exists(kept_file))
+
+    def test_media_can_be_kept(self):
+        purged_file = self.add_media(self.purged_blog, "purged.mp4")
+        with self.captureOnCommitCallbacks(execute=True):
+            report = purge_content(CustomUser.objects.filter(pk=self.other.pk), delete_media=False)
+        self.assertEqual(report["files"], 0)
+        self.assertTrue(default_storage.exists(purged_file))
+
+
+class MediaCleanupTests(SimpleTestCase):
+    def storage(self, results):
+        storage = mock.Mock()
+        storage.delete_many.side_effect = lambda batch: Counter(results[name] for name in batch)
+        return storage
+
+    def test_counts_deleted_missing_and_failed_files(self):
+        results = {"a": "deleted", "b": "not_found", "c": "error", "d": "deleted"}
+        storage = self.storage(results)
+        cleanup = MediaCleanup({storage: set(results)}, batch_size=3, background=False)
+
+        with self.assertLogs("api.purge", "ERROR"):
+            cleanup.start()
+        self.assertIsNone(cleanup.thread)
+        self.assertEqual((cleanup.deleted, cleanup.missing, cleanup.failed), (2, 1, 1))
+        self.assertEqual([call.args[0] for call in storage.delete_many.call_args_list], [["a", "b", "c"], ["d"]])
+
+    def test_a_failing_batch_counts_as_failed(self):
+        storage = mock.Mock()
+        storage.delete_many.side_effect = RuntimeError("storage is down")
+        cleanup = MediaCleanup({storage: {"a", "b"}}, background=False)
+        with self.assertLogs("api.purge", "ERROR"):
+            cleanup.start()
+        self.assertEqual((cleanup.deleted, cleanup.failed), (0, 2))
+
+    def test_runs_in_the_background_by_default(self):
+        storage = self.storage({"a": "deleted"})
+        cleanup = MediaCleanup({storage: {"a"}})
+        cleanup.start()
+        cleanup.wait()
+        self.assertIsNotNone(cleanup.thread)
+        self.assertEqual(cleanup.deleted, 1)
+
+
+class CloudinaryDeleteManyTests(SimpleTestCase):
+    def test_one_call_per_resource_type_and_batch(self):
+        storage = TimedMediaCloudinaryStorage()
+        calls = []
+
+        def delete_resources(batch, resource_type, invalidate):
+            calls.append((resource_type, list(batch)))
+            return {"deleted": {name: "not_found" if name == "gone.png" else "deleted" for name in batch}}
+
+        resource_type = lambda name: "video" if name.endswith(".mp4") else "image"
+        with (
+            mock.patch("cloudinary.api.delete_resources", delete_resources),
+            mock.patch.object(storage, "_get_resource_type", resource_type),
+            mock.patch.object(storage, "DELETE_BATCH", 2),
+        ):
+            results = storage.delete_many(["a.png", "b.mp4", "gone.png", "c.png", "d.mp4"])
+
+        self.assertEqual(results, Counter({"deleted": 4, "not_found": 1}))
+        self.assertEqual(calls, [
+            ("image", ["a.png", "gone.png"]),
+            ("image", ["c.png"]),
+            ("video", ["b.mp4", "d.mp4"]),
+        ])
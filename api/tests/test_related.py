@@ -0,0 +1,98 @@
+from unittest import mock
+
+from api.models import Blog, RelatedPost
+from api.related import BlogIndex, blog_index, bump_generation, rebuild_related
+
+from .helpers import APITestCase
+
+
+class RelatedMixin:
+    def related(self, blog_id):
+        response = self.client.get(f"/api/blog-post/{blog_id}/?include=related")
+        self.assertEqual(response.status_code, 200)
+        return [post["id"] for post in response.json()["data"]["related"]]
+
+
+class RelatedPostTests(RelatedMixin, APITestCase):
+
+    def test_related_posts_are_ranked_by_shared_tags(self):
+        first = self.create_blog("Django ORM", tags=["django", "orm", "sql"])
+        close = self.create_blog("Django queries", tags=["django", "orm"])
+        loose = self.create_blog("SQL tips", category="databases", tags=["sql"])
+        self.create_blog("Gardening", category="life", tags=["plants"])
+
+        self.assertEqual(self.related(first), [close, loose])
+        self.assertEqual(self.related(loose), [first])
+
+    def test_related_posts_are_only_sent_when_included(self):
+        blog_id = self.create_blog(tags=["django"])
+        response = self.client.get(f"/api/blog-post/{blog_id}/")
+        self.assertNotIn("related", response.json()["data"])
+
+    def test_related_posts_entries_carry_the_post_card(self):
+        first = self.create_blog("Django ORM", tags=["django"])
+        second = self.create_blog("Django views", tags=["django"])
+        response = self.client.get(f"/api/blog-post/{first}/?include=related")
+        [post] = response.json()["data"]["related"]
+        self.assertEqual(post["id"], second)
+        self.assertEqual(post["title"], "Django views")
+        self.assertEqual(post["category"], "python")
+
+    def test_changing_tags_updates_both_lists(self):
+        first = self.create_blog("Django ORM", category="web", tags=["django"])
+        second = self.create_blog("Flask", category="micro", tags=["flask"])
+        self.assertEqual(self.related(first), [])
+
+        self.update_blog(second, tags=["django"])
+        self.assertEqual(self.related(first), [second])
+        self.assertEqual(self.related(second), [first])
+
+    def test_deleting_a_post_removes_it_from_other_lists(self):
+        first = self.create_blog("Django ORM", tags=["django", "orm"])
+        second = self.create_blog("Django queries", tags=["django", "orm"])
+        third = self.create_blog("Django views", tags=["django"])
+        self.assertEqual(self.related(first), [second, third])
+
+        self.delete_blog(second)
+        self.assertEqual(self.related(first), [third])
+        self.assertFalse(RelatedPost.objects.filter(related_id=second).exists())
+
+
+@mock.patch("api.related.is_shared", return_value=True)
+class BlogIndexCacheTests(RelatedMixin, APITestCase):
+    """The index kept between writes when CACHES is shared by the workers."""
+
+    def setUp(self):
+        super().setUp()
+        blog_index.forget()
+        self.addCleanup(blog_index.forget)
+
+    def links(self):
+        return set(RelatedPost.objects.values_list("blog_id", "related_id", "rank"))
+
+    def test_edits_reuse_the_index_and_match_a_rebuild(self, is_shared):
+        with mock.patch.object(BlogIndex, "load", wraps=BlogIndex.load) as load:
+            first = self.create_blog("Django ORM", tags=["django", "orm"])
+            second = self.create_blog("Django views", category="web", tags=["django"])
+            self.create_blog("Gardening", category="life", tags=["plants"])
+            self.update_blog(second, tags=["django", "orm"])
+        load.assert_called_once()
+        self.assertEqual(self.related(first), [second])
+
+        links = self.links()
+        rebuild_related()
+        self.assertEqual(self.links(), links)
+
+    def test_a_write_elsewhere_loads_the_index_again(self, is_shared):
+        first = self.create_blog("Django ORM", tags=["django"])
+        # Another process added a blog with the same tag
+        with self.captureOnCommitCallbacks(execute=True):
+            other = Blog.objects.create(
+                title="Django views", description="...", category="web", tags=["django"], user=self.user
+            )
+        bump_generation()
+
+        with mock.patch.object(BlogIndex, "load", wraps=BlogIndex.load) as load:
+            self.update_blog(first, tags=["django", "orm"])
+        load.assert_called_once()
+        self.assertEqual(self.related(first), [str(other.pk)])
@@ -0,0 +1,122 @@
+from contextlib import ExitStack
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api import routers
+from api.models import Blog, CustomUser, Resume
+from api.routers import ReplicaRouter, primary_reads, remember_write, replica_health, wrote_recently
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaRouterTests(SimpleTestCase):
+    router = ReplicaRouter()
+
+    def test_public_reads_go_to_a_healthy_replica(self):
+        with mock.patch.object(replica_health, "is_healthy", return_value=True):
+            self.assertEqual(self.router.db_for_read(Blog), "replica_1")
+            self.assertIsNone(self.router.db_for_read(CustomUser))
+            with primary_reads():
+                self.assertIsNone(self.router.db_for_read(Blog))
+
+    def test_reads_fall_back_to_the_primary(self):
+        with mock.patch.object(replica_health, "is_healthy", return_value=False):
+            self.assertIsNone(self.router.db_for_read(Blog))
+
+    def test_writes_go_to_the_primary(self):
+        self.assertEqual(self.router.db_for_write(Blog), "default")
+
+    def test_an_editor_reads_the_primary_after_writing(self):
+        cache.clear()
+        request = RequestFactory().get("/api/blogs/", HTTP_AUTHORIZATION="Bearer token")
+        self.assertFalse(wrote_recently(request))
+        remember_write(request)
+        self.assertTrue(wrote_recently(request))
+        self.assertFalse(wrote_recently(RequestFactory().get("/api/blogs/", HTTP_AUTHORIZATION="Bearer other")))
+
+
+@override_settings(REPLICA_READS={"MAX_LAG_SECONDS": 5.0, "CHECK_INTERVAL": 60.0})
+class ReplicaHealthTests(SimpleTestCase):
+    def setUp(self):
+        self.health = routers.ReplicaHealth()
+
+    def test_a_caught_up_replica_is_checked_once_per_interval(self):
+        with mock.patch("api.routers.replica_lag", return_value=0.5) as lag:
+            self.assertTrue(self.health.is_healthy("replica_1"))
+            self.assertTrue(self.health.is_healthy("replica_1"))
+        lag.assert_called_once()
+
+    def test_a_lagging_replica_is_skipped(self):
+        with mock.patch("api.routers.replica_lag", return_value=30.0), self.assertLogs("api.routers", "WARNING"):
+            self.assertFalse(self.health.is_healthy("replica_1"))
+
+    def test_an_unreachable_replica_is_skipped(self):
+        with (
+            mock.patch("api.routers.replica_lag", side_effect=DatabaseError("down")),
+            mock.patch("api.routers.connections"),
+            self.assertLogs("api.routers", "WARNING"),
+        ):
+            self.assertFalse(self.health.is_healthy("replica_1"))
+
+    @override_settings(REPLICA_READS={"CHECK_INTERVAL": 0.0})
+    def test_later_checks_do_not_block_the_request(self):
+        with mock.patch("api.routers.replica_lag", return_value=0.0):
+            self.assertTrue(self.health.is_healthy("replica_1"))
+        with (
+            mock.patch("api.routers.replica_lag", side_effect=DatabaseError("down")),
+            mock.patch("api.routers.threading.Thread") as thread,
+        ):
+            # The previous result while the probe runs in the background
+            self.assertTrue(self.health.is_healthy("replica_1"))
+        thread.return_value.start.assert_called_once()
+
+
+@skipUnless(settings.DATABASE_REPLICAS, "set DATABASE_REPLICA_URLS (any URL: tests mirror 'default')")
+@override_settings(PAGE_VIEWS={"ENABLED": False}, SERVER_TIMING={"SAMPLE_RATE": 0.0})
+class ReplicaReadTests(TransactionTestCase):
+    """End to end through the middleware; each replica is a TEST MIRROR of 'default'."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        replica_health.reset()
+        self.user = CustomUser.objects.create_user(email="editor@example.com", password="correct-horse-battery")
+        self.resume = Resume.objects.create(
+            user=self.user, name="Ada", title="Engineer", email=self.user.email, phone_number="1",
+            location="London", bio="...",
+        )
+
+    def queries(self, client, path):
+        """(queries on the primary, queries on the replicas) of one GET."""
+        with ExitStack() as stack:
+            primary = stack.enter_context(CaptureQueriesContext(connections["default"]))
+            replicas = [
+                stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in settings.DATABASE_REPLICAS
+            ]
+            response = client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return len(primary), sum(len(replica) for replica in replicas)
+
+    def test_anonymous_reads_use_a_replica(self):
+        primary, replica = self.queries(APIClient(), f"/api/resumes/{self.resume.pk}/")
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_an_editor_reads_the_primary_after_writing(self):
+        editor = APIClient()
+        token = editor.post("/api/token/", {"email": self.user.email, "password": "correct-horse-battery"})
+        editor.credentials(HTTP_AUTHORIZATION=f"Bearer {token.json()['access']}")
+        response = editor.post("/api/blogs/", {
+            "title": "Post", "description": "...", "category": "python", "user": str(self.user.pk), "tags": "[]",
+        })
+        self.assertEqual(response.status_code, 201)
+
+        primary, replica = self.queries(editor, f"/api/resumes/{self.resume.pk}/")
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
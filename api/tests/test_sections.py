@@ -0,0 +1,57 @@
+from rest_framework.test import APIClient
+
+from api.models import Hobby
+
+from .helpers import APITestCase
+
+
+class ResumeSectionTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.resume = self.make_resume(self.user)
+        self.url = f"/api/resumes/{self.resume.pk}/hobbies/"
+
+    def add(self, name, **fields):
+        response = self.editor.post(self.url, {"name": name, "icon": "star", **fields}, format="json")
+        self.assertEqual(response.status_code, 201)
+        return response.json()["data"]
+
+    def reorder(self, ids):
+        return self.editor.post(f"{self.url}reorder/", {"order": ids}, format="json")
+
+    def test_create_appends_after_the_last_item(self):
+        self.add("Chess", order=5)
+        self.assertEqual(self.add("Go")["order"], 6)
+        names = [item["name"] for item in self.client.get(self.url).json()["data"]]
+        self.assertEqual(names, ["Chess", "Go"])
+
+    def test_reorder_rewrites_the_positions(self):
+        first, second = self.add("Chess")["id"], self.add("Go")["id"]
+        response = self.reorder([second, first])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["id"] for item in response.json()["data"]], [second, first])
+
+    def test_reorder_rejects_invalid_orders(self):
+        first, second = self.add("Chess")["id"], self.add("Go")["id"]
+        other = Hobby.objects.create(resume=self.make_resume(self.make_user("other@example.com")), name="Golf", icon="x")
+        for order in ([True, second], [first, first], [first, second, other.pk], [first], "1,2"):
+            with self.subTest(order=order):
+                self.assertEqual(self.reorder(order).status_code, 400)
+        self.assertEqual(list(Hobby.objects.filter(resume=self.resume).values_list("pk", flat=True)), [first, second])
+
+    def test_unknown_sections_are_not_routed(self):
+        for section in ("projects", "gallery", "hobbiesx"):
+            with self.subTest(section=section):
+                self.assertEqual(self.client.get(f"/api/resumes/{self.resume.pk}/{section}/").status_code, 404)
+
+    def test_anonymous_writes_are_refused(self):
+        item = self.add("Chess")
+        anonymous = APIClient()
+        responses = [
+            anonymous.post(self.url, {"name": "Go", "icon": "star"}, format="json"),
+            anonymous.patch(f"{self.url}{item['id']}/", {"name": "Go"}, format="json"),
+            anonymous.delete(f"{self.url}{item['id']}/"),
+            anonymous.post(f"{self.url}reorder/", {"order": [item["id"]]}, format="json"),
+        ]
+        self.assertEqual([response.status_code for response in responses], [401] * 4)
+        self.assertEqual(anonymous.get(self.url).status_code, 200)
@@ -0,0 +1,80 @@
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils.dateparse import parse_datetime
+
+from api.models import Blog, BlogBlock, CustomUser, RelatedPost, Resume
+from api.routers import PUBLIC_READ_LABELS, SnapshotRouter, primary_reads
+from api.snapshot import EXPORT_ALIAS, SNAPSHOT_MODELS, export_snapshot
+
+from .helpers import APITestCase
+
+
+class SnapshotRouterTests(SimpleTestCase):
+    router = SnapshotRouter()
+
+    def test_public_content_is_read_from_the_snapshot(self):
+        for model in (Resume, Blog, RelatedPost):
+            self.assertEqual(self.router.db_for_read(model), "snapshot")
+
+    def test_users_are_read_from_the_primary(self):
+        self.assertIsNone(self.router.db_for_read(CustomUser))
+
+    def test_pinned_reads_and_writes_use_the_primary(self):
+        with primary_reads():
+            self.assertIsNone(self.router.db_for_read(Blog))
+        self.assertEqual(self.router.db_for_write(Blog), "default")
+
+    def test_every_exported_model_is_routed(self):
+        # A model exported but not routed would be read from an empty primary
+        self.assertEqual(set(SNAPSHOT_MODELS), PUBLIC_READ_LABELS | {"api.CustomUser"})
+
+
+class SnapshotExportTests(APITestCase):
+    def export(self, path):
+        # export_snapshot() writes the file through a connection of its own
+        with mock.patch.object(type(self), "databases", {"default", EXPORT_ALIAS}):
+            return export_snapshot(path)
+
+    def test_export_contains_public_content_without_passwords(self):
+        first = self.create_blog("Django ORM", tags=["django"])
+        self.create_blog("Django views", tags=["django"])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.sqlite3")
+            counts = self.export(path)
+            with sqlite3.connect(path) as db:
+                related = db.execute("SELECT COUNT(*) FROM api_relatedpost WHERE blog_id = ?", [first.replace("-", "")])
+                self.assertEqual(related.fetchone()[0], 1)
+                passwords = {row[0] for row in db.execute("SELECT password FROM api_customuser")}
+
+        self.assertEqual(counts["api.Blog"], 2)
+        self.assertEqual(counts["api.RelatedPost"], 2)
+        self.assertGreater(counts["api.BlogArchiveCount"], 0)
+        self.assertTrue(all(password.startswith("!") for password in passwords))
+
+    def test_export_keeps_the_timestamps(self):
+        blog_id = self.create_blog("Django ORM", blocks=[{"type": "text", "content": "one"}])
+        resume = self.make_resume(self.user)
+        created = datetime(2020, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc)
+        updated = datetime(2021, 6, 7, 8, 9, 10, tzinfo=timezone.utc)
+        Blog.objects.filter(pk=blog_id).update(created_at=created, updated_at=updated)
+        Resume.objects.filter(pk=resume.pk).update(updated_at=updated)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.sqlite3")
+            self.export(path)
+            with sqlite3.connect(path) as db:
+                blog = db.execute("SELECT created_at, updated_at FROM api_blog").fetchone()
+                block = db.execute("SELECT created_at, updated_at FROM api_blogblock").fetchone()
+                [resume_updated] = db.execute("SELECT updated_at FROM api_resume").fetchone()
+
+        # SQLite stores naive UTC
+        naive = lambda value: value.astimezone(timezone.utc).replace(tzinfo=None)
+        self.assertEqual([parse_datetime(value) for value in blog], [naive(created), naive(updated)])
+        self.assertEqual(parse_datetime(resume_updated), naive(updated))
+        original = BlogBlock.objects.get(blog_id=blog_id)
+        self.assertEqual([parse_datetime(value) for value in block], [naive(original.created_at), naive(original.updated_at)])
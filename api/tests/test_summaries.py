@@ -0,0 +1,54 @@
+import io
+from datetime import datetime, timezone
+
+from django.core.management import call_command
+
+from api.models import Blog, BlogBlock
+
+from .helpers import APITestCase
+
+OLD = datetime(2020, 1, 1, tzinfo=timezone.utc)
+EMPTY_SUMMARY = {
+    "word_count": 0, "reading_time": 0, "image_count": 0, "video_count": 0,
+    "thumbnail": "", "thumbnail_width": None, "thumbnail_height": None, "thumbnail_placeholder": "",
+}
+
+
+class BlockSummaryTests(APITestCase):
+    def summary(self, blog_id):
+        return Blog.objects.filter(pk=blog_id).values(*Blog.BLOCK_SUMMARY_FIELDS).get()
+
+    def test_writes_keep_the_summary_current(self):
+        blog_id = self.create_blog("Django ORM", blocks=[
+            {"type": "text", "content": "<p>one <b>two</b></p>"}, {"type": "text", "content": "three"},
+        ])
+        self.assertEqual(self.summary(blog_id), {**EMPTY_SUMMARY, "word_count": 3, "reading_time": 1})
+        card = self.client.get("/api/blog-posts/").json()["data"][0]
+        self.assertEqual((card["word_count"], card["reading_time"]), (3, 1))
+
+        self.update_blog(blog_id, blocks=[])
+        self.assertEqual(self.summary(blog_id), EMPTY_SUMMARY)
+
+    def test_backfill_updates_only_stale_blogs(self):
+        portfolio = f"/api/portfolio/{self.make_resume(self.user).pk}/"
+        stale = self.create_blog("Django ORM", blocks=[{"type": "text", "content": "one two"}])
+        current = self.create_blog("Django views", blocks=[{"type": "text", "content": "one"}])
+        BlogBlock.objects.create(
+            blog_id=stale, type=BlogBlock.IMAGE, media_file="blog_media/a.jpg", media_width=40, media_height=30, order=1,
+        )
+        Blog.objects.update(updated_at=OLD)
+        Blog.objects.filter(pk=stale).update(**EMPTY_SUMMARY)
+        self.assertEqual(self.client.get(portfolio).json()["data"]["posts"][1]["word_count"], 0)
+
+        output = io.StringIO()
+        call_command("backfill_blog_summaries", "--batch-size", "1", stdout=output)
+        self.assertIn("1 of 2 blogs updated", output.getvalue())
+
+        self.assertEqual(self.summary(stale), {
+            **EMPTY_SUMMARY, "word_count": 2, "reading_time": 1, "image_count": 1,
+            "thumbnail": "blog_media/a.jpg", "thumbnail_width": 40, "thumbnail_height": 30,
+        })
+        self.assertGreater(Blog.objects.get(pk=stale).updated_at, OLD)
+        self.assertEqual(Blog.objects.get(pk=current).updated_at, OLD)
+        # The cached bundle is invalidated
+        self.assertEqual(self.client.get(portfolio).json()["data"]["posts"][1]["word_count"], 2)
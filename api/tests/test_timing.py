@@ -0,0 +1,25 @@
+from django.test import override_settings
+
+from .helpers import APITestCase
+
+
+@override_settings(SERVER_TIMING={"SAMPLE_RATE": 0.0, "TOKEN": "secret"})
+class ServerTimingTests(APITestCase):
+    def test_forced_requests_get_the_header_and_one_log_line(self):
+        self.create_blog()
+        with self.assertLogs("api.timing", "INFO") as logs:
+            response = self.client.get("/api/blogs/", HTTP_X_SERVER_TIMING="secret")
+        self.assertIn("total;dur=", response["Server-Timing"])
+        [line] = logs.output
+        self.assertIn("method=GET path=/api/blogs/ status=200", line)
+
+    def test_unsampled_requests_are_left_alone(self):
+        with self.assertNoLogs("api.timing"):
+            response = self.client.get("/api/blogs/", HTTP_X_SERVER_TIMING="wrong")
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @override_settings(SERVER_TIMING={"SAMPLE_RATE": 1.0, "LOG": False})
+    def test_the_log_line_can_be_switched_off(self):
+        with self.assertNoLogs("api.timing"):
+            response = self.client.get("/api/blogs/")
+        self.assertTrue(response.has_header("Server-Timing"))
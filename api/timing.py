@@ -0,0 +1,193 @@
+"""
+Per-request instrumentation: ORM queries, DB time and named phases.
+
+``ServerTimingMiddleware`` (api/middleware.py) opens a ``RequestTimings`` for
+sampled requests; code marks phases with ``timed("storage")`` and friends.
+Outside a sampled request ``timed()`` does nothing but one contextvar lookup,
+so it is safe to leave in hot paths.
+
+Queries are counted by one execute wrapper installed on every connection as
+it opens (``install_execute_hook``), which reports to the request found in
+the contextvar. That also covers async views, whose ORM calls run on worker
+threads with their own connections but a copy of the request's context.
+"""
+import contextvars
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+TIMING_DEFAULTS = {
+    "SAMPLE_RATE": 0.0,
+    "HEADER": True,
+    "LOG": True,
+    "TOKEN": "",
+}
+
+# Request header that forces instrumentation: `curl -H "X-Server-Timing: <TOKEN>"`
+FORCE_HEADER = "HTTP_X_SERVER_TIMING"
+
+_current = contextvars.ContextVar("request_timings", default=None)
+
+
+def timing_settings():
+    return {**TIMING_DEFAULTS, **getattr(settings, "SERVER_TIMING", {})}
+
+
+def should_sample(request, options):
+    token = options["TOKEN"]
+    if token and request.META.get(FORCE_HEADER) == token:
+        return True
+    return random.random() < options["SAMPLE_RATE"]
+
+
+class RequestTimings:
+    """Totals for one request: queries per SQL template and time per phase (ms)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = Counter()
+        self.db_ms = 0.0
+        self.phases = {}
+        self.active = set()
+        # Async views run independent queries in parallel threads
+        self._lock = threading.Lock()
+
+    @property
+    def query_count(self):
+        return sum(self.queries.values())
+
+    @property
+    def repeated_queries(self):
+        # Same SQL with different parameters: the N+1 signature
+        return self.query_count - len(self.queries)
+
+    def most_repeated(self):
+        if not self.queries:
+            return None, 0
+        return self.queries.most_common(1)[0]
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def add_phase(self, name, elapsed_ms):
+        total, count = self.phases.get(name, (0.0, 0))
+        self.phases[name] = (total + elapsed_ms, count + 1)
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self.db_ms += elapsed_ms
+                self.queries[sql] += 1
+
+
+def current_timings():
+    return _current.get()
+
+
+def execute_hook(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings(execute, sql, params, many, context)
+
+
+def install_execute_hook(connection, **kwargs):
+    """``connection_created`` receiver (api/signals.py); idempotent across reconnects."""
+    if execute_hook not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_hook)
+
+
+@contextmanager
+def instrument():
+    """Collect timings for the code in the block (every database alias)."""
+    # Connections opened before the receiver was connected (e.g. by startup checks)
+    for connection in connections.all():
+        install_execute_hook(connection)
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """
+    Add the block's wall time to phase ``name`` of the current request.
+
+    Re-entrant per name: nested serializers or storage calls made inside an
+    already timed phase are not counted twice.
+    """
+    timings = _current.get()
+    if timings is None or name in timings.active:
+        yield
+        return
+    timings.active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.active.discard(name)
+        timings.add_phase(name, (time.perf_counter() - started) * 1000)
+
+
+def server_timing_header(timings):
+    """``Server-Timing`` value, e.g. ``db;dur=4.1;desc="9 queries, 6 repeated", total;dur=12.0``."""
+    metrics = [
+        f'db;dur={timings.db_ms:.1f};desc="{timings.query_count} queries, {timings.repeated_queries} repeated"'
+    ]
+    for name, (elapsed_ms, count) in timings.phases.items():
+        metrics.append(f'{name};dur={elapsed_ms:.1f};desc="{count}x"')
+    metrics.append(f"total;dur={timings.total_ms():.1f}")
+    return ", ".join(metrics)
+
+
+def log_fields(request, response, timings):
+    """Flat key/value pairs for one structured log line."""
+    fields = {
+        "method": request.method,
+        "path": request.path,
+        "status": response.status_code,
+        "total_ms": round(timings.total_ms(), 1),
+        "db_ms": round(timings.db_ms, 1),
+        "queries": timings.query_count,
+        "repeated": timings.repeated_queries,
+    }
+    for name, (elapsed_ms, count) in timings.phases.items():
+        fields[f"{name}_ms"] = round(elapsed_ms, 1)
+        fields[f"{name}_calls"] = count
+    sql, count = timings.most_repeated()
+    if count > 1:
+        fields["top_repeated"] = count
+        fields["top_repeated_sql"] = " ".join(sql.split())[:200]
+    return fields
+
+
+def format_log_fields(fields):
+    # logfmt: key=value, values with spaces or quotes are quoted
+    parts = []
+    for key, value in fields.items():
+        text = str(value)
+        if not text or any(c in text for c in ' "='):
+            text = '"' + text.replace('"', '\\"') + '"'
+        parts.append(f"{key}={text}")
+    return " ".join(parts)
+
+
+class TimedSerializerMixin:
+    """Serializer mixin: time ``to_representation`` as the ``serialize`` phase."""
+
+    def to_representation(self, instance):
+        with timed("serialize"):
+            return super().to_representation(instance)
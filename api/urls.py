@@ -1,20 +1,42 @@
 from django.conf import settings
 from django.conf.urls.static import static
-from django.urls import path
-from .views import ResumeListCreateView, ResumeDetailView, BlogListCreateView, BlogDetailView, BlogByCategoryView, BlogPostListView, HealthCheckView, APIRootView, SetupAdminView, ClearDatabaseView
+from django.urls import path, register_converter
+from .async_views import AsyncResumeDetailView, AsyncBlogListView, AsyncBlogDetailView, AsyncBlogByCategoryView, AsyncBlogPostListView, public_read
+from .serializers import RESUME_SECTIONS
+from .views import ResumeSectionListView, ResumeSectionItemView, ResumeSectionReorderView
+from .views import ResumeListCreateView, ResumeDetailView, BlogListCreateView, BlogDetailView, BlogByCategoryView, BlogPostListView, PortfolioView, TopPostsView, BlogArchiveView, HealthCheckView, APIRootView, SetupAdminView, ClearDatabaseView
 from uuid import UUID
 
+
+class ResumeSectionConverter:
+    regex = "|".join(RESUME_SECTIONS)
+
+    def to_python(self, value):
+        return value
+
+    def to_url(self, value):
+        return value
+
+
+register_converter(ResumeSectionConverter, "section")
+
 urlpatterns = [
     path('', APIRootView.as_view(), name='api-root'),  # Root API endpoint
     path('health/', HealthCheckView.as_view(), name='health_check'),
     path('setup-admin/', SetupAdminView.as_view(), name='setup-admin'),  # Setup admin user
     path('clear-database/', ClearDatabaseView.as_view(), name='clear-database'),  # Clear all data
     path('resumes/', ResumeListCreateView.as_view(), name='resume-list-create'),
-    path('resumes/<uuid:pk>/', ResumeDetailView.as_view(), name='resume-detail'),
-    path('blogs/', BlogListCreateView.as_view(), name='blog-list-create'),
-    path('blog-post/<uuid:pk>/', BlogDetailView.as_view(), name='blog-detail'),
-    path('blogs/category/', BlogByCategoryView.as_view(), name='blog-by-category'),
-    path('blog-posts/', BlogPostListView.as_view(), name='blog-posts'),
+    path('resumes/<uuid:pk>/', public_read(ResumeDetailView, AsyncResumeDetailView), name='resume-detail'),
+    path('resumes/<uuid:pk>/<section:section>/', ResumeSectionListView.as_view(), name='resume-section'),
+    path('resumes/<uuid:pk>/<section:section>/reorder/', ResumeSectionReorderView.as_view(), name='resume-section-reorder'),
+    path('resumes/<uuid:pk>/<section:section>/<int:item_id>/', ResumeSectionItemView.as_view(), name='resume-section-item'),
+    path('blogs/', public_read(BlogListCreateView, AsyncBlogListView), name='blog-list-create'),
+    path('blog-post/<uuid:pk>/', public_read(BlogDetailView, AsyncBlogDetailView), name='blog-detail'),
+    path('blogs/archive/', BlogArchiveView.as_view(), name='blog-archive'),
+    path('blogs/category/', public_read(BlogByCategoryView, AsyncBlogByCategoryView), name='blog-by-category'),
+    path('blog-posts/', public_read(BlogPostListView, AsyncBlogPostListView), name='blog-posts'),
+    path('portfolio/<uuid:pk>/', PortfolioView.as_view(), name='portfolio'),
+    path('analytics/top-posts/', TopPostsView.as_view(), name='top-posts'),
 ]
 
 # # Serve media files in development
@@ -1,19 +1,60 @@
+import logging
+
+from django.db import transaction
+from django.db.models import Max
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny, BasePermission
+from django.conf import settings
 from django.contrib.auth import get_user_model
-
+from django.utils.crypto import constant_time_compare
+
+from . import mirror
+from .analytics import record_view, top_objects
+from .archive import get_archive
+from .changes import BLOG, RESUME, mark_changed
+from .fieldsets import select_fields
+from .health import API_ROOT_PAYLOAD, HEALTH_PAYLOAD, deep_health, wants_deep
+from .portfolio import bundle_settings, get_portfolio
+from .purge import purge_content
+from .related import blogs_listing, refresh_related, schedule
 from .models import Resume, Blog
 from .serializers import (
     UserSerializer,
     ResumeSerializer,
     BlogSerializer,
-    BlogPostSerializer
+    BlogPostSerializer,
+    RESUME_SECTIONS,
 )
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+class SparseFieldsViewMixin:
+    """
+    ``?fields=`` / ``?include=`` on GET (api/fieldsets.py): prune the
+    serializer and prefetch only the relations it will render.
+    """
+
+    def field_selection(self):
+        if not hasattr(self, "_field_selection"):
+            self._field_selection = select_fields(self.get_serializer_class(), self.request.query_params)
+        return self._field_selection
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method == "GET":
+            queryset = queryset.prefetch_related(*self.field_selection().prefetch)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == "GET" and self.field_selection().fields is not None:
+            kwargs["fields"] = self.field_selection().fields
+        return super().get_serializer(*args, **kwargs)
+
 
 class APIRootView(APIView):
     """
@@ -22,36 +63,32 @@ class APIRootView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, *args, **kwargs):
-        return Response({
-            "message": "Welcome to Portfolio Backend API",
-            "version": "1.0.0",
-            "status": "online",
-            "endpoints": {
-                "health": "/api/health/",
-                "resumes": "/api/resumes/",
-                "resume_detail": "/api/resumes/{id}/",
-                "blogs": "/api/blogs/",
-                "blog_detail": "/api/blog-post/{id}/",
-                "blog_posts": "/api/blog-posts/",
-                "auth": {
-                    "register": "/api/user/register/",
-                    "token": "/api/token/",
-                    "refresh": "/api/token/refresh/"
-                },
-                "admin": "/admin/",
-                "setup": "/api/setup-admin/",
-                "clear_database": "/api/clear-database/"
-            },
-            "database": "MongoDB" if hasattr(request, '_mongodb_connected') else "Connected",
-            "media_storage": "Cloudinary"
-        }, status=status.HTTP_200_OK)
+        # Normally answered by FastPathMiddleware before DRF is reached
+        return Response(API_ROOT_PAYLOAD, status=status.HTTP_200_OK)
+
+
+class SetupTokenOrAdmin(BasePermission):
+    """
+    Staff users, or ``X-Setup-Token: <SETUP_ADMIN_TOKEN>`` while no superuser
+    exists yet (the first admin of a fresh deploy); the token stops working
+    once setup has run.
+    """
+
+    def has_permission(self, request, view):
+        if request.user and request.user.is_staff:
+            return True
+        token = getattr(settings, "SETUP_ADMIN_TOKEN", "")
+        supplied = request.META.get("HTTP_X_SETUP_TOKEN", "")
+        if not token or not constant_time_compare(supplied, token):
+            return False
+        return not User.objects.filter(is_superuser=True).exists()
 
 
 class SetupAdminView(APIView):
     """
     Setup admin user - clears existing data and creates fresh admin user and resume
     """
-    permission_classes = [AllowAny]
+    permission_classes = [SetupTokenOrAdmin]
 
     def post(self, request, *args, **kwargs):
         try:
@@ -67,14 +104,12 @@ class SetupAdminView(APIView):
 
             # Clear existing data for this email
             try:
-                existing_user = User.objects.get(email=email)
-                # Delete associated resumes
-                Resume.objects.filter(user=existing_user).delete()
-                # Delete user
-                existing_user.delete()
-                print("Cleared existing admin user and data")
-            except User.DoesNotExist:
-                pass
+                existing_users = User.objects.filter(email=email)
+                if existing_users.exists():
+                    # Resumes, blogs and their rows go in one set-based pass (api/purge.py);
+                    # uploaded files stay in storage, as they did before the purge engine
+                    report = purge_content(existing_users, delete_media=False)
+                    logger.info("Cleared existing admin user and data: %s", report)
             except Exception as db_error:
                 return Response({
                     "success": False,
@@ -149,32 +184,27 @@ class SetupAdminView(APIView):
 
 class ClearDatabaseView(APIView):
     """
-    Clear all data from database - use with caution!
+    Clear all data from database - use with caution! Staff only.
     """
-    permission_classes = [AllowAny]
+    permission_classes = [IsAdminUser]
 
     def post(self, request, *args, **kwargs):
         try:
-            # Clear all data
-            from .models import Blog
-            
-            blog_count = Blog.objects.count()
-            resume_count = Resume.objects.count()
-            user_count = User.objects.count()
-            
-            # Delete all records
-            Blog.objects.all().delete()
-            Resume.objects.all().delete()
-            User.objects.all().delete()
+            # Table by table, no per-row signals; files are deleted in the background
+            report = purge_content()
+            deleted = report["deleted"]
 
             return Response({
                 "success": True,
                 "message": "Database cleared successfully!",
                 "deleted": {
-                    "blogs": blog_count,
-                    "resumes": resume_count,
-                    "users": user_count
-                }
+                    "blogs": deleted.get(Blog._meta.label, 0),
+                    "resumes": deleted.get(Resume._meta.label, 0),
+                    "users": deleted.get(User._meta.label, 0)
+                },
+                "tables": deleted,
+                "files_queued": report["files"],
+                "timings": report["timings"]
             }, status=status.HTTP_200_OK)
 
         except Exception as e:
@@ -189,10 +219,11 @@ class HealthCheckView(APIView):
     permission_classes = [AllowAny]  # Allow anyone to access the health check endpoint
 
     def get(self, request, *args, **kwargs):
-        return Response({
-            "status": "healthy",
-            "message": "Server is up and running"
-        }, status=status.HTTP_200_OK)
+        if wants_deep(request):
+            report = deep_health.report()
+            healthy = report["status"] == "healthy"
+            return Response(report, status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response(HEALTH_PAYLOAD, status=status.HTTP_200_OK)
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -208,7 +239,7 @@ class CreateUserView(generics.CreateAPIView):
         }, status=response.status_code)
 
 
-class ResumeListCreateView(generics.ListCreateAPIView):
+class ResumeListCreateView(SparseFieldsViewMixin, generics.ListCreateAPIView):
     queryset = Resume.objects.all()
     serializer_class = ResumeSerializer
     permission_classes = [IsAuthenticated]
@@ -228,7 +259,7 @@ class ResumeListCreateView(generics.ListCreateAPIView):
         }, status=response.status_code)
 
 
-class ResumeDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ResumeDetailView(SparseFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Resume.objects.all()
     serializer_class = ResumeSerializer
 
@@ -238,10 +269,20 @@ class ResumeDetailView(generics.RetrieveUpdateDestroyAPIView):
         return [IsAuthenticated()]
 
     def get_object(self):
-        return get_object_or_404(Resume, user_id=self.kwargs["pk"])
+        return get_object_or_404(self.get_queryset(), user_id=self.kwargs["pk"])
 
     def retrieve(self, request, *args, **kwargs):
+        if mirror.read_from_mongo():
+            # One embedded document instead of eight relational queries
+            data = mirror.get_resume(self.kwargs["pk"], request)
+            if data is not None:
+                record_view(RESUME, self.kwargs["pk"])
+                return Response({
+                    "status": status.HTTP_200_OK,
+                    "data": self.field_selection().prune(data)
+                }, status=status.HTTP_200_OK)
         response = super().retrieve(request, *args, **kwargs)
+        record_view(RESUME, self.kwargs["pk"])
         return Response({
             "status": response.status_code,
             "data": response.data
@@ -262,7 +303,122 @@ class ResumeDetailView(generics.RetrieveUpdateDestroyAPIView):
         }, status=status.HTTP_204_NO_CONTENT)
 
 
-class BlogListCreateView(generics.ListCreateAPIView):
+class ResumeSectionMixin:
+    """
+    One child collection of a resume (``/api/resumes/<id>/<section>/``).
+
+    Writes touch only the affected rows; the resume is marked changed once
+    per request, so its caches and Mongo document are refreshed once.
+    """
+
+    def get_permissions(self):
+        if self.request.method == "GET":
+            return [AllowAny()]
+        return [IsAuthenticated()]
+
+    def get_serializer_class(self):
+        return RESUME_SECTIONS[self.kwargs["section"]]
+
+    def get_queryset(self):
+        model = self.get_serializer_class().Meta.model
+        return model.objects.filter(resume_id=self.kwargs["pk"])
+
+
+class ResumeSectionListView(ResumeSectionMixin, generics.ListCreateAPIView):
+    def list(self, request, *args, **kwargs):
+        get_object_or_404(Resume, pk=self.kwargs["pk"])
+        response = super().list(request, *args, **kwargs)
+        return Response({
+            "status": response.status_code,
+            "data": response.data
+        }, status=response.status_code)
+
+    def perform_create(self, serializer):
+        resume = get_object_or_404(Resume, pk=self.kwargs["pk"])
+        order = serializer.validated_data.get("order")
+        if order is None:
+            # Append after the current last item
+            order = (self.get_queryset().aggregate(last=Max("order"))["last"] or 0) + 1
+        serializer.save(resume=resume, order=order)
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        return Response({
+            "status": response.status_code,
+            "data": response.data
+        }, status=response.status_code)
+
+
+class ResumeSectionItemView(ResumeSectionMixin, generics.RetrieveUpdateDestroyAPIView):
+    lookup_url_kwarg = "item_id"
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        return Response({
+            "status": response.status_code,
+            "data": response.data
+        }, status=response.status_code)
+
+    def update(self, request, *args, **kwargs):
+        response = super().update(request, *args, **kwargs)
+        return Response({
+            "status": response.status_code,
+            "data": response.data
+        }, status=response.status_code)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        # Child deletes send no signal (see api/signals.py)
+        mark_changed(RESUME, instance.resume_id, child=True)
+
+    def destroy(self, request, *args, **kwargs):
+        super().destroy(request, *args, **kwargs)
+        return Response({
+            "status": status.HTTP_204_NO_CONTENT,
+            "data": "Item deleted successfully"
+        }, status=status.HTTP_204_NO_CONTENT)
+
+
+class ResumeSectionReorderView(ResumeSectionMixin, generics.GenericAPIView):
+    """``POST {"order": [id, id, ...]}`` with every item id of the section, in the new order."""
+
+    def post(self, request, *args, **kwargs):
+        ids = request.data.get("order")
+        if not isinstance(ids, list) or not all(
+            isinstance(item_id, int) and not isinstance(item_id, bool) for item_id in ids
+        ):
+            return Response({
+                "status": status.HTTP_400_BAD_REQUEST,
+                "data": "order must be a list of item ids"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            items = {item.pk: item for item in self.get_queryset().select_for_update()}
+            if len(ids) != len(set(ids)) or set(ids) != set(items):
+                return Response({
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "data": "order must list every item of the section exactly once"
+                }, status=status.HTTP_400_BAD_REQUEST)
+            changed = []
+            for position, item_id in enumerate(ids):
+                item = items[item_id]
+                if item.order != position:
+                    item.order = position
+                    changed.append(item)
+            model = self.get_serializer_class().Meta.model
+            model.objects.bulk_update(changed, ["order"])
+            if changed:
+                # bulk_update sends no post_save
+                mark_changed(RESUME, self.kwargs["pk"], child=True)
+
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response({
+            "status": status.HTTP_200_OK,
+            "data": serializer.data
+        }, status=status.HTTP_200_OK)
+
+
+class BlogListCreateView(SparseFieldsViewMixin, generics.ListCreateAPIView):
     queryset = Blog.objects.all().order_by("-created_at")
     serializer_class = BlogSerializer
 
@@ -288,7 +444,7 @@ class BlogListCreateView(generics.ListCreateAPIView):
         }, status=status.HTTP_201_CREATED)
 
 
-class BlogDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BlogDetailView(SparseFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Blog.objects.all()
     serializer_class = BlogSerializer
 
@@ -298,7 +454,17 @@ class BlogDetailView(generics.RetrieveUpdateDestroyAPIView):
         return [IsAuthenticated()]
 
     def retrieve(self, request, *args, **kwargs):
+        # The read model has no related posts
+        if mirror.read_from_mongo() and not self.field_selection().selects("related"):
+            data = mirror.get_blog(self.kwargs["pk"], request)
+            if data is not None:
+                record_view(BLOG, self.kwargs["pk"])
+                return Response({
+                    "status": status.HTTP_200_OK,
+                    "data": self.field_selection().prune(data)
+                }, status=status.HTTP_200_OK)
         response = super().retrieve(request, *args, **kwargs)
+        record_view(BLOG, self.kwargs["pk"])
         return Response({
             "status": response.status_code,
             "data": response.data
@@ -311,6 +477,12 @@ class BlogDetailView(generics.RetrieveUpdateDestroyAPIView):
             "data": response.data
         }, status=response.status_code)
 
+    def perform_destroy(self, instance):
+        # Lists that had this blog lose a slot to the cascade: refill them
+        listing = blogs_listing(instance.pk)
+        super().perform_destroy(instance)
+        schedule(refresh_related, listing)
+
     def destroy(self, request, *args, **kwargs):
         super().destroy(request, *args, **kwargs)
         return Response({
@@ -319,14 +491,14 @@ class BlogDetailView(generics.RetrieveUpdateDestroyAPIView):
         }, status=status.HTTP_204_NO_CONTENT)
 
 
-class BlogByCategoryView(generics.ListAPIView):
+class BlogByCategoryView(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = BlogSerializer
     permission_classes = [AllowAny]
 
     def get_queryset(self):
         category = self.request.query_params.get('category', None)
         if category:
-            return Blog.objects.filter(category__iexact=category)
+            return Blog.objects.in_category(category).prefetch_related(*self.field_selection().prefetch)
         return Blog.objects.none()
 
     def list(self, request, *args, **kwargs):
@@ -337,7 +509,37 @@ class BlogByCategoryView(generics.ListAPIView):
         }, status=response.status_code)
 
 
-class BlogPostListView(generics.ListAPIView):
+class PortfolioView(APIView):
+    """
+    Resume, latest post cards and category facets in one response (first paint).
+
+    ``?posts=N`` sets the number of cards (default PORTFOLIO_BUNDLE["POSTS"]);
+    ``?fields=`` / ``?include=`` apply to the resume.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, pk, *args, **kwargs):
+        options = bundle_settings()
+        try:
+            posts = int(request.query_params.get("posts", options["POSTS"]))
+        except ValueError:
+            posts = options["POSTS"]
+        posts = max(0, min(posts, options["MAX_POSTS"]))
+
+        selection = select_fields(ResumeSerializer, request.query_params)
+        bundle = get_portfolio(pk, posts, request, selection)
+        if bundle is None:
+            return Response({
+                "status": status.HTTP_404_NOT_FOUND,
+                "data": "Resume not found"
+            }, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            "status": status.HTTP_200_OK,
+            "data": bundle
+        }, status=status.HTTP_200_OK)
+
+
+class BlogPostListView(SparseFieldsViewMixin, generics.ListAPIView):
     queryset = Blog.objects.all().order_by("-created_at")
     serializer_class = BlogPostSerializer
     permission_classes = [AllowAny]
@@ -348,3 +550,46 @@ class BlogPostListView(generics.ListAPIView):
             "status": response.status_code,
             "data": response.data
         }, status=response.status_code)
+
+
+class TopPostsView(APIView):
+    """
+    Most viewed posts of the last ``?days=`` days (default 7) as post cards
+    with a ``views`` count; ``?limit=`` caps the list (default 10, max 50).
+    Counts lag by up to PAGE_VIEWS["FLUSH_INTERVAL"] seconds (api/analytics.py).
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            days = max(1, min(int(request.query_params.get("days", 7)), 366))
+            limit = max(1, min(int(request.query_params.get("limit", 10)), 50))
+        except ValueError:
+            return Response({
+                "status": status.HTTP_400_BAD_REQUEST,
+                "data": "days and limit must be integers"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        top = top_objects(BLOG, days, limit)
+        blogs = Blog.objects.only(*BlogPostSerializer.Meta.fields).in_bulk([pk for pk, _ in top])
+        # Posts deleted since they were viewed are left out
+        ranked = [(blogs[pk], views) for pk, views in top if pk in blogs]
+        cards = BlogPostSerializer([blog for blog, _ in ranked], many=True, context={"request": request}).data
+        return Response({
+            "status": status.HTTP_200_OK,
+            "data": [{**card, "views": views} for card, (_, views) in zip(cards, ranked)]
+        }, status=status.HTTP_200_OK)
+
+
+class BlogArchiveView(APIView):
+    """
+    Post counts by month (of ``created_at``), category and tag for archive
+    navigation, from the summary rows maintained in api/archive.py.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        return Response({
+            "status": status.HTTP_200_OK,
+            "data": get_archive()
+        }, status=status.HTTP_200_OK)
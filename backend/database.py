@@ -0,0 +1,114 @@
+"""
+Database configuration helpers shared by settings.py and the DB benchmarks.
+
+Kept free of Django model imports so settings.py can use them at load time.
+"""
+import importlib.util
+import warnings
+from pathlib import Path
+
+POOL_MODES = ("off", "persistent", "pool")
+
+
+def database_from_url(url, **kwargs):
+    # dj_database_url is only needed while parsing, keep it off the import path
+    import dj_database_url # type: ignore
+    return dj_database_url.parse(url, **kwargs)
+
+
+def check_pooled_connection(connection):
+    """psycopg_pool ``check`` callback: reject dead connections before handing them out."""
+    connection.execute("SELECT 1")
+
+
+def pool_size_per_worker(max_connections, workers, threads):
+    """
+    Split a deployment-wide connection budget across worker processes.
+
+    Each worker needs at least one connection per thread to avoid waiting on
+    its own pool; beyond that it gets an equal share of ``max_connections``.
+    """
+    share = max_connections // max(workers, 1)
+    return max(share, threads, 1)
+
+
+def configure_pooling(database, mode, max_connections=20, workers=1, threads=1,
+                      min_size=1, timeout=10, max_age=600, fallback="persistent"):
+    """
+    Apply a connection reuse ``mode`` to a DATABASES entry (in place).
+
+    - ``off``: a new connection (TCP + TLS + auth) for every request.
+    - ``persistent``: Django's built-in per-thread reuse (CONN_MAX_AGE) with
+      health checks, the only option for SQLite.
+    - ``pool``: Django 5.1+ native psycopg 3 pool, bounded per worker. Falls
+      back to ``fallback`` when the engine or driver cannot pool.
+    """
+    if mode not in POOL_MODES:
+        raise ValueError(f"DB_POOL_MODE must be one of {', '.join(POOL_MODES)}, got {mode!r}")
+
+    if mode == "pool":
+        engine = database.get("ENGINE", "")
+        driver_ready = (
+            importlib.util.find_spec("psycopg") is not None
+            and importlib.util.find_spec("psycopg_pool") is not None
+        )
+        if engine != "django.db.backends.postgresql" or not driver_ready:
+            warnings.warn(
+                "DB_POOL_MODE=pool needs PostgreSQL with psycopg[pool]; "
+                f"using DB_POOL_MODE={fallback} instead."
+            )
+            mode = fallback
+
+    if mode == "off":
+        database["CONN_MAX_AGE"] = 0
+        database["CONN_HEALTH_CHECKS"] = False
+    elif mode == "persistent":
+        database["CONN_MAX_AGE"] = max_age
+        database["CONN_HEALTH_CHECKS"] = True
+    else:
+        max_size = pool_size_per_worker(max_connections, workers, threads)
+        # Pooled connections are returned on close; Django rejects CONN_MAX_AGE with a pool
+        database["CONN_MAX_AGE"] = 0
+        database["CONN_HEALTH_CHECKS"] = False
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": min(min_size, max_size),
+            "max_size": max_size,
+            "timeout": timeout,
+            "max_lifetime": max_age,
+            "check": check_pooled_connection,
+        }
+    return database
+
+
+def snapshot_database(path, mmap_bytes=256 * 1024 * 1024):
+    """
+    DATABASES entry for the read-only snapshot written by ``export_snapshot``.
+
+    ``immutable=1`` tells SQLite the file never changes, so it skips locking
+    and change detection; mmap lets reads come straight from the page cache.
+    """
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": f"{Path(path).resolve().as_uri()}?mode=ro&immutable=1",
+        "OPTIONS": {
+            "init_command": f"PRAGMA mmap_size={mmap_bytes};PRAGMA query_only=ON",
+        },
+        # The file never changes, so one connection can live as long as the process
+        "CONN_MAX_AGE": None,
+        "TEST": {"MIRROR": "default"},
+    }
+
+
+def replica_database(url):
+    """
+    DATABASES entry for a read replica of 'default'.
+
+    In tests the replica mirrors 'default', so routed reads see the rows the
+    test just wrote instead of an empty second test database.
+    """
+    database = database_from_url(url)
+    if database.get("ENGINE") == "django.db.backends.postgresql":
+        # An unreachable replica must fail fast so reads fall back to the primary
+        database.setdefault("OPTIONS", {}).setdefault("connect_timeout", 2)
+    database["TEST"] = {"MIRROR": "default"}
+    return database
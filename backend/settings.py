@@ -13,9 +13,11 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 from decouple import config # type: ignore
-import dj_database_url # type: ignore
+from django.core.exceptions import ImproperlyConfigured
 import os
 
+from .database import configure_pooling, database_from_url, replica_database, snapshot_database
+
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -29,13 +31,12 @@ SECRET_KEY = config('DJANGO_SECRETE_KEY')
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = config("DEBUG", "False").lower() == "true"
-print(DEBUG)
 
 ALLOWED_HOSTS = ["*"]
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -47,6 +48,21 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+# How authenticated requests resolve request.user from the access token:
+# "db" (query every request), "cache" (in-process LRU, DB on miss) or
+# "claims" (signed token claims only). Saving a user changes its token version;
+# other workers see it within TTL seconds, through CACHES when it is shared
+# (Redis) and otherwise from one version query per user and TTL.
+JWT_USER_RESOLUTION = {
+    "MODE": config('JWT_USER_RESOLUTION', 'cache'),
+    "TTL": config('JWT_USER_CACHE_TTL', 60, cast=int),
+    "MAX_SIZE": 1024,
+}
+
+# POST /api/setup-admin/ without staff credentials (first admin of a fresh
+# deploy): sent as X-Setup-Token, accepted only while no superuser exists.
+SETUP_ADMIN_TOKEN = config('SETUP_ADMIN_TOKEN', '')
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -58,13 +74,25 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     "cloudinary_storage",
     "cloudinary",
-    "mongoengine",
     "api",
     "rest_framework",
     "corsheaders",
 ]
 
 MIDDLEWARE = [
+    # Must stay first: serves /api/health/ and /api/ without the rest of the stack
+    'api.middleware.FastPathMiddleware',
+    # Refuses unsafe requests when there is no primary database (SNAPSHOT_READ_ONLY)
+    'api.middleware.ReadOnlyMiddleware',
+    # Outside compression so the reported total includes it
+    'api.middleware.ServerTimingMiddleware',
+    # Compress after every other middleware has finished with the body
+    'api.middleware.CompressionMiddleware',
+    # ETag / If-None-Match -> 304; outside EdgeCache so a 304 keeps its Cache-Control
+    'django.middleware.http.ConditionalGetMiddleware',
+    'api.middleware.EdgeCacheMiddleware',
+    'api.middleware.PrimaryReadMiddleware',
+    'api.middleware.ContentChangeMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -110,24 +138,31 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # MongoDB Configuration with MongoEngine
 USE_MONGODB = config('USE_MONGODB', 'false').lower() == 'true'
 
+# Connection arguments only; api.mongo connects on first use so cold starts
+# never pay for the pymongo import and Atlas handshake.
+MONGODB_SETTINGS = {
+    'db': config('MONGODB_NAME', 'portfolio_db'),
+    'host': config('MONGODB_URI', 'mongodb://localhost:27017'),
+    'username': config('MONGODB_USERNAME', None),
+    'password': config('MONGODB_PASSWORD', None),
+    'authentication_source': config('MONGODB_AUTH_SOURCE', 'admin'),
+}
+
+# MongoDB read model (api/documents.py). READ_BACKEND=mongo serves resume and
+# blog detail reads from one embedded document; MONGODB_MIRROR keeps the
+# documents in sync with ORM writes (implied by READ_BACKEND=mongo).
+# MONGODB_MOCK=true uses an in-process mongomock client instead of a server.
+READ_BACKEND = config('READ_BACKEND', 'orm').lower()
+MONGODB_MIRROR = READ_BACKEND == 'mongo' or config('MONGODB_MIRROR', 'false').lower() == 'true'
+MONGODB_MOCK = config('MONGODB_MOCK', 'false').lower() == 'true'
+
 if USE_MONGODB:
-    import mongoengine
-    # MongoEngine connection
-    mongoengine.connect(
-        db=config('MONGODB_NAME', 'portfolio_db'),
-        host=config('MONGODB_URI', 'mongodb://localhost:27017'),
-        username=config('MONGODB_USERNAME', None),
-        password=config('MONGODB_PASSWORD', None),
-        authentication_source=config('MONGODB_AUTH_SOURCE', 'admin'),
-    )
-    print("✅ MongoDB connection configured")
-    
     # For serverless environments, we need a simple database configuration
     # Use PostgreSQL if available, otherwise in-memory SQLite
     database_url = config('DATABASE_URL', None)
     if database_url:
         DATABASES = {
-            'default': dj_database_url.config(default=database_url)
+            'default': database_from_url(database_url)
         }
     else:
         # For Vercel/serverless - use in-memory SQLite
@@ -140,17 +175,143 @@ if USE_MONGODB:
                 },
             }
         }
-    print(f"✅ Django database configured: {DATABASES['default']['ENGINE']}")
 else:
     # PostgreSQL Configuration (default)
     DATABASES = {
-        'default': dj_database_url.config(
-            default=config('DATABASE_URL', 'sqlite:///db.sqlite3'),
-            conn_max_age=600,
-            conn_health_checks=True,
+        'default': database_from_url(
+            config('DATABASE_URL', 'sqlite:///db.sqlite3'),
         )
     }
 
+# Async public reads (api/async_views.py) for the ASGI deployment: with
+# ASYNC_READS=True gunicorn.conf.py runs uvicorn workers on backend.asgi.
+ASYNC_READS = {
+    'ENABLED': config('ASYNC_READS', False, cast=bool),
+    # A resume's child collections loaded at once, each on its own pooled
+    # connection (only with DB_POOL_MODE=pool; one after another otherwise)
+    'PARALLEL_QUERIES': config('ASYNC_READ_PARALLEL_QUERIES', 4, cast=int),
+}
+
+# Connection reuse for every deployment shape (see backend/database.py):
+# "off", "persistent" (CONN_MAX_AGE) or "pool" (psycopg 3 native pool).
+# Pool size is DB_POOL_MAX_CONNECTIONS split across WEB_CONCURRENCY workers.
+# The default is "persistent", or "off" with ASYNC_READS: under ASGI the ORM
+# runs on a new thread per request, so per-thread persistent connections
+# would never be reused. Asking for "persistent" with ASYNC_READS is an error;
+# prefer "pool" there.
+DB_POOL_MODE = config('DB_POOL_MODE', 'off' if ASYNC_READS['ENABLED'] else 'persistent')
+if ASYNC_READS['ENABLED'] and DB_POOL_MODE == 'persistent':
+    raise ImproperlyConfigured(
+        "DB_POOL_MODE=persistent does not reuse connections with ASYNC_READS; use 'pool' or 'off'"
+    )
+# What "pool" falls back to without PostgreSQL + psycopg_pool
+DB_POOL_FALLBACK = 'off' if ASYNC_READS['ENABLED'] else 'persistent'
+DB_POOL_MAX_CONNECTIONS = config('DB_POOL_MAX_CONNECTIONS', 20, cast=int)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', 1, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', 10, cast=int)
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', 600, cast=int)
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', 1, cast=int)
+GUNICORN_THREADS = config('GUNICORN_THREADS', 1, cast=int)
+
+configure_pooling(
+    DATABASES['default'],
+    DB_POOL_MODE,
+    max_connections=DB_POOL_MAX_CONNECTIONS,
+    workers=WEB_CONCURRENCY,
+    threads=GUNICORN_THREADS,
+    min_size=DB_POOL_MIN_SIZE,
+    timeout=DB_POOL_TIMEOUT,
+    max_age=DB_CONN_MAX_AGE,
+    fallback=DB_POOL_FALLBACK,
+)
+
+# Page-view counters (api/analytics.py): buffered in memory, flushed in one
+# upsert per interval. Off for the in-memory SQLite of the serverless deploy,
+# which every thread sees as a different, empty database. Vercel (VERCEL=1)
+# freezes the function between requests, so the flusher thread would not run:
+# there each view is flushed inline.
+PAGE_VIEWS = {
+    'ENABLED': config('PAGE_VIEWS', DATABASES['default'].get('NAME') != ':memory:', cast=bool),
+    'FLUSH_INTERVAL': config('PAGE_VIEWS_FLUSH_INTERVAL', 10.0, cast=float),
+    'BACKGROUND': config('PAGE_VIEWS_BACKGROUND', not config('VERCEL', ''), cast=bool),
+}
+
+# CDN caching (api/edge.py): Cache-Control + Surrogate-Key on public GETs.
+# With a purge backend (e.g. api.edge.FastlyPurger) writes purge by key and
+# the edge keeps responses for a day; without one, only for a minute.
+EDGE_CACHE = {
+    'ENABLED': config('EDGE_CACHE', True, cast=bool),
+    'PURGE_BACKEND': config('EDGE_PURGE_BACKEND', '') or None,
+    'PURGE_OPTIONS': {
+        'service_id': config('FASTLY_SERVICE_ID', ''),
+        'api_token': config('FASTLY_API_TOKEN', ''),
+    },
+}
+
+# Purged uploads (api/purge.py) are deleted from storage after the response, on
+# a background thread. Vercel (which sets VERCEL=1) freezes the function once it
+# responds, so there the purge request deletes them before responding.
+PURGE = {
+    'BACKGROUND_MEDIA': config('PURGE_BACKGROUND_MEDIA', not config('VERCEL', ''), cast=bool),
+}
+
+# Precomputed related posts (api/related.py); rebuild_related_posts after changing these
+RELATED_POSTS = {
+    'TOP_K': config('RELATED_POSTS_TOP_K', 5, cast=int),
+    'CATEGORY_WEIGHT': config('RELATED_POSTS_CATEGORY_WEIGHT', 0.25, cast=float),
+}
+
+# Read-only snapshot (manage.py export_snapshot). Public reads are served from
+# the bundled SQLite file; writes and auth still go to 'default'.
+# SNAPSHOT_READS: "auto" = only for the USE_MONGODB deploy without DATABASE_URL
+# (which otherwise starts from an empty in-memory DB), "true" or "false".
+SNAPSHOT_DATABASE_PATH = config('SNAPSHOT_DATABASE_PATH', str(BASE_DIR / 'snapshot.sqlite3'))
+SNAPSHOT_READS = config('SNAPSHOT_READS', 'auto').lower()
+if SNAPSHOT_READS == 'auto':
+    snapshot_reads_enabled = USE_MONGODB and not config('DATABASE_URL', None)
+else:
+    snapshot_reads_enabled = SNAPSHOT_READS == 'true'
+
+DATABASE_ROUTERS = []
+if snapshot_reads_enabled and os.path.exists(SNAPSHOT_DATABASE_PATH):
+    DATABASES['snapshot'] = snapshot_database(SNAPSHOT_DATABASE_PATH)
+    DATABASE_ROUTERS.append('api.routers.SnapshotRouter')
+# No real primary behind the snapshot (the unmigrated in-memory SQLite of the
+# serverless deploy): writes, registration and logins would fail on missing
+# tables, so api.middleware.ReadOnlyMiddleware answers them with 503.
+SNAPSHOT_READ_ONLY = 'snapshot' in DATABASES and DATABASES['default'].get('NAME') == ':memory:'
+
+# Read replicas of 'default' (comma-separated URLs, aliases replica_1, replica_2, ...).
+# Public content GETs go to a healthy replica; lagging/down replicas, unsafe
+# requests and an editor's reads right after their own write use the primary.
+# Read-your-writes across several workers needs a shared CACHES backend.
+DATABASE_REPLICAS = []
+for index, replica_url in enumerate(config('DATABASE_REPLICA_URLS', '').split(','), start=1):
+    if not replica_url.strip():
+        continue
+    alias = f'replica_{index}'
+    DATABASES[alias] = configure_pooling(
+        replica_database(replica_url.strip()),
+        DB_POOL_MODE,
+        max_connections=DB_POOL_MAX_CONNECTIONS,
+        workers=WEB_CONCURRENCY,
+        threads=GUNICORN_THREADS,
+        min_size=DB_POOL_MIN_SIZE,
+        timeout=DB_POOL_TIMEOUT,
+        max_age=DB_CONN_MAX_AGE,
+        fallback=DB_POOL_FALLBACK,
+    )
+    DATABASE_REPLICAS.append(alias)
+
+REPLICA_READS = {
+    'MAX_LAG_SECONDS': config('REPLICA_MAX_LAG_SECONDS', 5.0, cast=float),
+    'CHECK_INTERVAL': config('REPLICA_CHECK_INTERVAL', 5.0, cast=float),
+    'STICKY_SECONDS': config('REPLICA_STICKY_SECONDS', 15, cast=int),
+    'PROBE_TIMEOUT': config('REPLICA_PROBE_TIMEOUT', 2.0, cast=float),
+}
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS.append('api.routers.ReplicaRouter')
+
 
 
 # Password validation
@@ -196,11 +357,11 @@ CLOUDINARY_STORAGE = {
         'API_KEY': config('CLOUDINARY_API_KEY'),
         'API_SECRET': config('CLOUDINARY_API_SECRET'),
 }
-print(CLOUDINARY_STORAGE,config('CLOUDINARY_CLOUD_NAME'),config('CLOUDINARY_API_KEY'))
 # MEDIA_URL = "/media/"
 STORAGES = {
     'default': {
-        'BACKEND': 'cloudinary_storage.storage.MediaCloudinaryStorage',
+        # MediaCloudinaryStorage with uploads/deletes reported in Server-Timing
+        'BACKEND': 'api.storage.TimedMediaCloudinaryStorage',
     },
     'staticfiles': {
         'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
@@ -222,5 +383,71 @@ STORAGES = {
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Deep health (/api/health/?deep=1) probes DB + storage; results are cached for TTL seconds
+HEALTH_CHECK = {
+    "DEEP": config('HEALTH_CHECK_DEEP', 'false').lower() == 'true',
+    "TTL": config('HEALTH_CHECK_TTL', 30, cast=int),
+}
+
+# gzip/brotli for JSON responses; compressed variants are cached in-process
+COMPRESSION = {
+    "MIN_SIZE": config('COMPRESSION_MIN_SIZE', 512, cast=int),
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 5,
+    "CACHE_BYTES": config('COMPRESSION_CACHE_BYTES', 8 * 1024 * 1024, cast=int),
+}
+
+# Server-Timing header + logfmt line per sampled request (query count, DB time,
+# serialize/storage/compress phases). Requests sending `X-Server-Timing: <TOKEN>`
+# are always instrumented, so one curl shows the numbers in production.
+SERVER_TIMING = {
+    "SAMPLE_RATE": config('SERVER_TIMING_SAMPLE_RATE', 1.0 if DEBUG else 0.01, cast=float),
+    "HEADER": config('SERVER_TIMING_HEADER', 'true').lower() == 'true',
+    "LOG": config('SERVER_TIMING_LOG', 'true').lower() == 'true',
+    "TOKEN": config('SERVER_TIMING_TOKEN', ''),
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api": {"handlers": ["console"], "level": config('API_LOG_LEVEL', 'INFO')},
+    },
+}
+
+# Shared cache for rendered payloads, content versions and replica stickiness.
+# Without REDIS_URL each worker process has its own in-memory cache, so other
+# workers see a change only after PORTFOLIO_BUNDLE["TTL"] (pip install redis).
+REDIS_URL = config('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 1000},
+        }
+    }
+
+# /api/portfolio/<id>/ first-paint bundle
+PORTFOLIO_BUNDLE = {
+    "TTL": config('PORTFOLIO_CACHE_TTL', 300, cast=int),
+    "POSTS": config('PORTFOLIO_POSTS', 6, cast=int),
+    "MAX_POSTS": 50,
+    # Public origin for absolute media URLs in the cached bundle (not the Host header)
+    "BASE_URL": config('PUBLIC_BASE_URL', ''),
+}
+
+# Cold-start budget checked by `manage.py profile_imports`
+IMPORT_TIME_BUDGET_MS = config('IMPORT_TIME_BUDGET_MS', 1500, cast=int)
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOWS_CREDENTIALS = True
\ No newline at end of file
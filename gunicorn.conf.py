@@ -0,0 +1,16 @@
+"""
+Gunicorn settings, read automatically from the working directory (Procfile).
+
+ASYNC_READS=True serves backend.asgi with uvicorn workers, so the public read
+endpoints run as async views (api/async_views.py). Otherwise backend.wsgi is
+served by sync workers with GUNICORN_THREADS threads each.
+"""
+# Not `from decouple import config`: module-level names are read as gunicorn settings
+import decouple
+
+if decouple.config("ASYNC_READS", default=False, cast=bool):
+    wsgi_app = "backend.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "backend.wsgi:application"
+    threads = decouple.config("GUNICORN_THREADS", default=1, cast=int)